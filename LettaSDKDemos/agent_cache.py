@@ -0,0 +1,256 @@
+"""
+This module is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/agent_cache.py
+
+Shared stale-while-revalidate cache for Letta listings.
+
+Callers always get an answer straight from the cache once a key has been
+loaded. When an entry is older than its resource TTL the cached value is
+still returned and a background refresher thread re-fetches it. Entries
+that are read regularly are also refreshed shortly before they expire, so
+hot keys rarely go stale at all.
+
+Keys are tuples whose first element names the resource, e.g. ('agents',)
+or ('agent_tools', agent_id); the TTL is picked per resource. Mutations
+should call the matching invalidate_* helper so only the affected keys are
+dropped.
+
+Related scripts:
+- list_agents.py, delete_agent.py, create_agent.py, manage_agent_tools.py
+
+Usage:
+   from agent_cache import list_agents, invalidate_agent
+   agents = list_agents(client)
+   ...
+   invalidate_agent(agent_id)   # after deleting/updating the agent
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds before an entry is considered stale, per resource
+DEFAULT_TTLS = {
+    'agents': 30,
+    'agent': 60,
+    'agent_tools': 60,
+    'agent_sources': 60,
+    'agent_config': 30,
+    'recent_messages': 15,
+    'sources': 60,
+    'llm_models': 300,
+    'embedding_models': 300,
+}
+FALLBACK_TTL = 30
+
+# Entries read within this window are refreshed before they go stale
+KEEP_WARM_WINDOW = 120
+# Fraction of the TTL after which a warm entry is refreshed ahead of time
+EARLY_REFRESH_FRACTION = 0.8
+SCHEDULER_INTERVAL = 1.0
+
+class _Entry:
+    __slots__ = ('value', 'loader', 'fetched_at', 'last_read')
+
+    def __init__(self, value, loader):
+        self.value = value
+        self.loader = loader
+        self.fetched_at = time.monotonic()
+        # Only a get() that finds the entry counts as a read, so a value that was
+        # loaded (or prefetched) and never used again isn't kept warm
+        self.last_read = None
+
+class ResourceCache:
+    def __init__(self, ttls=None, scheduler_interval=SCHEDULER_INTERVAL):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.scheduler_interval = scheduler_interval
+        self._entries = {}
+        self._versions = {}       # key -> bumped on every invalidation
+        self._key_locks = {}      # key -> lock held while a miss is loaded
+        self._queued = set()      # keys waiting for a background refresh
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._metrics = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'invalidations': 0,
+        }
+
+    def ttl_for(self, key):
+        return self.ttls.get(key[0], FALLBACK_TTL)
+
+    def get(self, key, loader):
+        """Return the cached value for key, loading it with loader() on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_read = time.monotonic()
+                if entry.last_read - entry.fetched_at < self.ttl_for(key):
+                    self._metrics['hits'] += 1
+                else:
+                    self._metrics['stale_hits'] += 1
+                    self._schedule_refresh(key)
+                return entry.value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Single-flight: concurrent misses on one key share a single load
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._metrics['hits'] += 1
+                    return entry.value
+                self._metrics['misses'] += 1
+                version = self._versions.get(key, 0)
+
+            value = loader()
+
+            with self._lock:
+                if self._versions.get(key, 0) == version:
+                    self._entries[key] = _Entry(value, loader)
+            return value
+
+    def prime(self, key, value, loader, age=0):
+        """
+        Seed key with a value obtained elsewhere (e.g. a disk copy) that is
+        already `age` seconds old. Nothing happens if key is already loaded;
+        an entry older than its TTL is refreshed in the background on first read.
+        """
+        with self._lock:
+            if key in self._entries:
+                return
+            entry = _Entry(value, loader)
+            entry.fetched_at -= age
+            self._entries[key] = entry
+
+    def invalidate(self, *keys):
+        """Drop exactly the given keys"""
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+                if self._entries.pop(key, None) is not None:
+                    self._metrics['invalidations'] += 1
+                self._queued.discard(key)
+
+    def invalidate_resource(self, resource):
+        """Drop every key belonging to one resource, e.g. 'agent_tools'"""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == resource]
+        self.invalidate(*keys)
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._entries)
+        self.invalidate(*keys)
+
+    def stats(self):
+        """Return hit/miss counters plus the overall hit rate"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['entries'] = len(self._entries)
+        lookups = metrics['hits'] + metrics['stale_hits'] + metrics['misses']
+        metrics['hit_rate'] = (metrics['hits'] + metrics['stale_hits']) / lookups if lookups else 0.0
+        return metrics
+
+    # Background refresh
+
+    def _schedule_refresh(self, key):
+        # Caller holds self._lock
+        self._queued.add(key)
+        self._ensure_thread()
+        self._wakeup.notify()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run_refresher, name='agent-cache-refresher', daemon=True
+            )
+            self._thread.start()
+
+    def _due_for_early_refresh(self, now):
+        # Caller holds self._lock
+        due = []
+        for key, entry in self._entries.items():
+            warm = entry.last_read is not None and now - entry.last_read < KEEP_WARM_WINDOW
+            age = now - entry.fetched_at
+            if warm and age >= self.ttl_for(key) * EARLY_REFRESH_FRACTION:
+                due.append(key)
+        return due
+
+    def _run_refresher(self):
+        while True:
+            with self._lock:
+                if not self._queued:
+                    self._wakeup.wait(self.scheduler_interval)
+                self._queued.update(self._due_for_early_refresh(time.monotonic()))
+                keys = list(self._queued)
+                self._queued.clear()
+            for key in keys:
+                self._refresh(key)
+
+    def _refresh(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            loader, version = entry.loader, self._versions.get(key, 0)
+
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._metrics['refresh_errors'] += 1
+                # Keep serving the old value, but don't retry every tick
+                if key in self._entries:
+                    self._entries[key].fetched_at = time.monotonic()
+            logger.warning(f"Background refresh of {key} failed: {str(e)}")
+            return
+
+        with self._lock:
+            # An invalidation during the fetch wins over the refreshed value
+            if self._versions.get(key, 0) == version and key in self._entries:
+                last_read = self._entries[key].last_read
+                self._entries[key] = _Entry(value, loader)
+                self._entries[key].last_read = last_read
+                self._metrics['refreshes'] += 1
+
+    def describe_stats(self):
+        """One-line summary of stats() for CLI output"""
+        stats = self.stats()
+        return (
+            f"{stats['hits']} hits, {stats['stale_hits']} stale hits, "
+            f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), "
+            f"{stats['refreshes']} background refreshes"
+        )
+
+# Shared instance used by the demos and the desktop app
+cache = ResourceCache()
+
+def list_agents(client):
+    """Cached client.list_agents()"""
+    return cache.get(('agents',), client.list_agents)
+
+def get_agent(client, agent_id):
+    """Cached client.get_agent()"""
+    return cache.get(('agent', agent_id), lambda: client.get_agent(agent_id))
+
+def invalidate_agents():
+    """Call after creating an agent: only the listing changes"""
+    cache.invalidate(('agents',))
+
+def invalidate_agent(agent_id):
+    """Call after updating or deleting an agent"""
+    cache.invalidate(
+        ('agents',),
+        ('agent', agent_id),
+        ('agent_tools', agent_id),
+        ('agent_sources', agent_id),
+        ('agent_config', agent_id),
+        ('recent_messages', agent_id),
+    )
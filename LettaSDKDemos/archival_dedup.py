@@ -0,0 +1,324 @@
+"""
+This script is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/archival_dedup.py
+
+This script demonstrates how to keep duplicate facts out of an agent's
+archival memory and how to find the ones already in it.
+
+Every passage gets two fingerprints:
+- a hash of its normalized text (lowercase, punctuation and extra spaces
+  removed), which catches exact duplicates
+- a MinHash signature of its word 3-grams, which estimates how similar two
+  passages are (Jaccard similarity of their 3-gram sets)
+
+Signatures are split into LSH bands; two passages that agree on a whole
+band land in the same bucket and are compared. Checking a new text is a
+hash lookup plus BANDS bucket lookups, well under a millisecond, however
+large the archive is. The index is saved per agent under
+.cache/archival_dedup/<agent_id>.* and synced incrementally from the
+archival listing (archival_store.py): only new passages are fingerprinted.
+
+Inserts made by the agent itself (the archival_memory_insert tool) run on
+the server and cannot be filtered from here; `report` finds the clusters
+they left behind.
+
+Related scripts:
+- bulk_archival.py: Skips duplicates before inserting (--no-dedup to disable)
+- archival_ingest.py: Same, for chunked documents (--dedup)
+- manage_archival_memory.py: Warns before adding a duplicate memory
+
+Usage:
+   python archival_dedup.py <agent_id> report
+   python archival_dedup.py <agent_id> report --threshold 0.9 --ids-out extra_ids.jsonl
+   python archival_dedup.py <agent_id> check "The user's name is Travis"
+
+   python bulk_archival.py delete <agent_id> extra_ids.jsonl    # remove the extra copies
+"""
+
+from letta import create_client
+from colorama import init, Fore, Style
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+from pathlib import Path
+import numpy as np
+from archival_store import DEFAULT_PAGE_SIZE, iter_passage_pages
+
+# Initialize colorama
+init(autoreset=True)
+
+INDEX_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'archival_dedup'
+DEFAULT_THRESHOLD = 0.8     # estimated Jaccard similarity that counts as a duplicate
+NUM_PERM = 128              # MinHash functions per signature
+BANDS = 32                  # LSH bands of NUM_PERM // BANDS rows; J=0.8 pairs collide >99% of the time
+SHINGLE_WORDS = 3
+PRIME = 4294967291          # largest prime below 2**32, so signatures fit in uint32
+SEED = 1
+
+_rng = np.random.default_rng(SEED)
+# Fixed coefficients: signatures saved by earlier runs stay comparable
+_A = _rng.integers(1, PRIME, NUM_PERM, dtype=np.uint64)[:, None]
+_B = _rng.integers(0, PRIME, NUM_PERM, dtype=np.uint64)[:, None]
+_ROWS = NUM_PERM // BANDS
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+def normalize(text):
+    return ' '.join(_PUNCTUATION_RE.sub(' ', text.lower()).split())
+
+def text_hash(normalized):
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+def signature(normalized):
+    """MinHash signature (NUM_PERM uint32) of the word 3-grams of normalized text"""
+    words = normalized.split()
+    if len(words) <= SHINGLE_WORDS:
+        shingles = [normalized]
+    else:
+        shingles = {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64)
+    # (a*x + b) mod p for every hash function and shingle; < 2**64, so no overflow
+    return ((_A * hashes + _B) % PRIME).min(axis=1).astype(np.uint32)
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+def _band_keys(sig):
+    data = sig.tobytes()
+    width = _ROWS * sig.itemsize
+    return [(band, data[band * width:(band + 1) * width]) for band in range(BANDS)]
+
+class DedupIndex:
+    """Exact hashes and MinHash/LSH signatures of one agent's passages"""
+
+    def __init__(self, agent_id, threshold=DEFAULT_THRESHOLD):
+        self.agent_id = agent_id
+        self.threshold = threshold
+        self.hashes = {}            # passage id -> normalized text hash
+        self.by_hash = {}           # normalized text hash -> set of passage ids
+        self.signatures = {}        # passage id -> signature
+        self.buckets = {}           # (band, band bytes) -> set of passage ids
+        self.synced_at = None       # time of the last sync(); None if never synced
+        self._pending = 0
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @classmethod
+    def load(cls, agent_id, threshold=DEFAULT_THRESHOLD):
+        """The saved index of an agent, or an empty, never synced one"""
+        index = cls(agent_id, threshold)
+        try:
+            with open(INDEX_DIR / f"{agent_id}.json", encoding='utf-8') as f:
+                meta = json.load(f)
+            signatures = np.load(INDEX_DIR / f"{agent_id}.npy")
+        except (OSError, ValueError):
+            return index
+        if len(signatures) != len(meta['ids']) or meta.get('num_perm') != NUM_PERM:
+            return index
+        for passage_id, digest, sig in zip(meta['ids'], meta['hashes'], signatures):
+            index._add(passage_id, digest, sig)
+        index.synced_at = meta.get('synced_at')
+        return index
+
+    def save(self):
+        # Texts inserted in this run are only known by placeholder ids; sync() picks up their real ids
+        ids = [passage_id for passage_id in self.hashes if not passage_id.startswith('pending:')]
+        INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        base = INDEX_DIR / self.agent_id
+        with open(f"{base}.npy.tmp", 'wb') as f:
+            np.save(f, np.array([self.signatures[passage_id] for passage_id in ids],
+                                dtype=np.uint32).reshape(len(ids), NUM_PERM))
+        with open(f"{base}.json.tmp", 'w', encoding='utf-8') as f:
+            json.dump({'num_perm': NUM_PERM, 'synced_at': self.synced_at, 'ids': ids,
+                       'hashes': [self.hashes[passage_id] for passage_id in ids]}, f)
+        os.replace(f"{base}.npy.tmp", f"{base}.npy")
+        os.replace(f"{base}.json.tmp", f"{base}.json")
+
+    def _add(self, passage_id, digest, sig):
+        self.hashes[passage_id] = digest
+        self.by_hash.setdefault(digest, set()).add(passage_id)
+        self.signatures[passage_id] = sig
+        for key in _band_keys(sig):
+            self.buckets.setdefault(key, set()).add(passage_id)
+
+    def add(self, passage_id, text):
+        normalized = normalize(text)
+        self._add(passage_id, text_hash(normalized), signature(normalized))
+
+    def remove(self, passage_id):
+        digest = self.hashes.pop(passage_id, None)
+        if digest is None:
+            return
+        copies = self.by_hash[digest]
+        copies.discard(passage_id)
+        if not copies:
+            del self.by_hash[digest]
+        for key in _band_keys(self.signatures.pop(passage_id)):
+            bucket = self.buckets[key]
+            bucket.discard(passage_id)
+            if not bucket:
+                del self.buckets[key]
+
+    def _candidates(self, sig):
+        candidates = set()
+        for key in _band_keys(sig):
+            candidates.update(self.buckets.get(key, ()))
+        return candidates
+
+    def _match(self, normalized):
+        digest = text_hash(normalized)
+        if digest in self.by_hash:
+            return ('exact', min(self.by_hash[digest]), 1.0), digest, None
+        sig = signature(normalized)
+        best = None
+        for passage_id in self._candidates(sig):
+            score = similarity(sig, self.signatures[passage_id])
+            if score >= self.threshold and (best is None or score > best[2]):
+                best = ('near', passage_id, score)
+        return best, digest, sig
+
+    def check(self, text):
+        """('exact' | 'near', passage id, similarity) for the closest duplicate, or None"""
+        return self._match(normalize(text))[0]
+
+    def check_and_add(self, text):
+        """
+        check(), and remember the text if it is new so later texts in the
+        same batch are compared against it too.
+        """
+        match, digest, sig = self._match(normalize(text))
+        if match is None:
+            self._pending += 1
+            self._add(f"pending:{self._pending}", digest, sig)
+        return match
+
+    def sync(self, client, page_size=DEFAULT_PAGE_SIZE, save=True, on_passage=None):
+        """
+        Bring the index up to date with the server's archival memory.
+
+        on_passage(passage) sees every listed passage. Returns {'added',
+        'removed', 'total', 'elapsed'}.
+        """
+        started = time.monotonic()
+        seen, added = set(), 0
+        for page in iter_passage_pages(client, self.agent_id, page_size=page_size):
+            for passage in page:
+                if on_passage:
+                    on_passage(passage)
+                seen.add(passage.id)
+                if passage.id not in self.hashes:
+                    self.add(passage.id, passage.text or '')
+                    added += 1
+        stale = [passage_id for passage_id in self.hashes if passage_id not in seen]
+        for passage_id in stale:
+            self.remove(passage_id)
+        self.synced_at = time.time()
+        if save:
+            self.save()
+        return {'added': added, 'removed': len(stale), 'total': len(self), 'elapsed': time.monotonic() - started}
+
+    def clusters(self):
+        """Groups of passage ids that are exact or near duplicates, largest first"""
+        parent = {}
+
+        def find(x):
+            while parent.get(x, x) != x:
+                parent[x] = parent.get(parent[x], parent[x])
+                x = parent[x]
+            return x
+
+        def union(a, b):
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        for copies in self.by_hash.values():
+            first = min(copies)
+            for passage_id in copies:
+                union(first, passage_id)
+        for bucket in self.buckets.values():
+            if len(bucket) < 2:
+                continue
+            # One member per cluster found so far; copies of one text are already merged by hash
+            members = list({find(passage_id): passage_id for passage_id in sorted(bucket)}.values())
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    if find(a) != find(b) and similarity(self.signatures[a], self.signatures[b]) >= self.threshold:
+                        union(a, b)
+
+        groups = {}
+        for passage_id in self.hashes:
+            groups.setdefault(find(passage_id), []).append(passage_id)
+        return sorted((sorted(group) for group in groups.values() if len(group) > 1), key=len, reverse=True)
+
+def load_synced(client, agent_id, threshold=DEFAULT_THRESHOLD, on_passage=None):
+    """The agent's index, synced with the server"""
+    index = DedupIndex.load(agent_id, threshold)
+    index.sync(client, on_passage=on_passage)
+    return index
+
+def run_report(client, agent_id, threshold, ids_out=None):
+    texts = {}
+    index = load_synced(client, agent_id, threshold,
+                        on_passage=lambda passage: texts.__setitem__(passage.id, passage.text))
+    # Listing order: the first passage of every cluster is kept, the rest are the extra copies
+    position = {passage_id: number for number, passage_id in enumerate(texts)}
+    clusters = [sorted(cluster, key=lambda passage_id: position.get(passage_id, 0)) for cluster in index.clusters()]
+    extra = [passage_id for cluster in clusters for passage_id in cluster[1:]]
+
+    print(f"\n{Fore.BLUE}Found {len(clusters)} duplicate clusters "
+          f"({len(extra)} extra passages of {len(index)}):{Style.RESET_ALL}")
+    for number, cluster in enumerate(clusters, 1):
+        print(f"\n{Fore.GREEN}Cluster {number} ({len(cluster)} passages):{Style.RESET_ALL}")
+        for passage_id in cluster:
+            score = similarity(index.signatures[cluster[0]], index.signatures[passage_id])
+            print(f"  {passage_id} {score:.2f} {(texts.get(passage_id) or '')[:100]}")
+
+    if ids_out:
+        with open(ids_out, 'w', encoding='utf-8') as f:
+            for passage_id in extra:
+                f.write(json.dumps({'id': passage_id}) + '\n')
+        print(f"\n{Fore.GREEN}Wrote {len(extra)} ids to {ids_out}{Style.RESET_ALL} "
+              f"(python bulk_archival.py delete {agent_id} {ids_out})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate passages in an agent's archival memory")
+    parser.add_argument("agent_id", help="Agent whose archival memory is checked")
+    parser.add_argument("command", choices=["report", "check"])
+    parser.add_argument("text", nargs="?", help="Text to check (check)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated similarity that counts as a duplicate (0-1)")
+    parser.add_argument("--ids-out", default=None, help="Write the extra copies' ids as JSONL (report)")
+    args = parser.parse_args()
+
+    try:
+        # Connect to the Letta server
+        client = create_client(base_url="http://localhost:8283")
+        if args.command == "report":
+            run_report(client, args.agent_id, args.threshold, args.ids_out)
+        elif not args.text:
+            print(f"{Fore.RED}Error: check needs a text{Style.RESET_ALL}")
+        else:
+            index = load_synced(client, args.agent_id, args.threshold)
+            started = time.perf_counter()
+            match = index.check(args.text)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if match:
+                kind, passage_id, score = match
+                print(f"{Fore.YELLOW}{kind.capitalize()} duplicate of {passage_id} "
+                      f"(similarity {score:.2f}){Style.RESET_ALL}")
+            else:
+                print(f"{Fore.GREEN}No duplicate among {len(index)} passages{Style.RESET_ALL}")
+            print(f"Checked in {elapsed_ms:.2f} ms")
+
+    except Exception as e:
+        print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
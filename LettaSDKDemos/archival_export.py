@@ -0,0 +1,294 @@
+"""
+This script is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/archival_export.py
+
+This script demonstrates how to snapshot an agent's archival memory to a
+file and restore it into another (or the same) agent.
+
+File format (.lam), written and read one chunk at a time so memory use
+does not depend on the number of passages:
+
+   b"LETTA-ARCHIVAL\\n"                    magic line
+   [u32 length][zlib(JSON header)]          agent id, embedding config, dim
+   [u32 length][zlib(chunk)] ...            up to CHUNK_PASSAGES passages each
+   [u32 0][u32 length][zlib(JSON footer)]   passage count, to detect truncation
+
+A chunk is [u32 length][JSON list of passages] followed, when embeddings are
+exported, by their vectors as little-endian float32 (passages x dim). The
+vectors are trimmed to the model's embedding_dim (the server pads them to
+4096), so they cost 4 bytes per dimension and are not inflated by JSON.
+All lengths are big-endian.
+
+Export reads the archival listing page by page (archival_store.py, next
+page prefetched while the current one is compressed). Import streams the
+passages into the concurrent, retrying, checkpointed inserts from
+archival_store.py; the server embeds the texts again with the target
+agent's model, so exported embeddings are for offline use
+(archival_index.py can load them) and are not required for a restore.
+
+Related scripts:
+- manage_archival_memory.py: Export/import from the interactive menu
+- archival_store.py: Archival listing and bulk inserts
+- bulk_archival.py: Bulk insert/delete from JSONL instead
+
+Usage:
+   python archival_export.py export <agent_id> memory.lam
+   python archival_export.py export <agent_id> memory.lam --no-embeddings
+   python archival_export.py import <agent_id> memory.lam --workers 16
+   python archival_export.py info memory.lam
+"""
+
+from letta import create_client
+from colorama import init, Fore, Style
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from datetime import datetime
+from archival_store import DEFAULT_WORKERS, BulkCheckpoint, insert_passages, iter_passage_pages
+
+# Initialize colorama
+init(autoreset=True)
+
+MAGIC = b"LETTA-ARCHIVAL\n"
+FORMAT_VERSION = 1
+CHUNK_PASSAGES = 1000       # passages per compressed chunk (and per listing page)
+COMPRESSION_LEVEL = 6
+
+_LENGTH = struct.Struct('>I')
+
+def _field(passage, name):
+    return passage.get(name) if isinstance(passage, dict) else getattr(passage, name, None)
+
+def _jsonable(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    return value
+
+def _pack_floats(values):
+    floats = array('f', values)
+    if sys.byteorder == 'big':
+        floats.byteswap()
+    return floats.tobytes()
+
+def _unpack_floats(data):
+    floats = array('f')
+    floats.frombytes(data)
+    if sys.byteorder == 'big':
+        floats.byteswap()
+    return floats
+
+def _write_block(f, data, level):
+    compressed = zlib.compress(data, level)
+    f.write(_LENGTH.pack(len(compressed)))
+    f.write(compressed)
+    return len(compressed)
+
+def _read_block(f):
+    """Decompressed bytes of the next block, or None at the end marker"""
+    head = f.read(_LENGTH.size)
+    if len(head) < _LENGTH.size:
+        raise ValueError("File is truncated")
+    (length,) = _LENGTH.unpack(head)
+    if length == 0:
+        return None
+    data = f.read(length)
+    if len(data) < length:
+        raise ValueError("File is truncated")
+    return zlib.decompress(data)
+
+def _chain(first, pages):
+    # The first page was read early for the header
+    if first:
+        yield first
+    yield from pages
+
+def export_passages(pages, path, agent_id=None, embeddings=True, level=COMPRESSION_LEVEL, on_progress=None):
+    """
+    Write pages of passages (lists of SDK objects or dicts) to a .lam file.
+
+    Returns {'passages', 'chunks', 'bytes', 'elapsed', 'per_second'}.
+    """
+    started = time.monotonic()
+    pages = iter(pages)
+    first = next(pages, [])
+    config = _jsonable(_field(first[0], 'embedding_config')) if first else None
+    dim = (config or {}).get('embedding_dim') if embeddings else None
+    summary = {'passages': 0, 'chunks': 0}
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        header = {'version': FORMAT_VERSION, 'agent_id': agent_id, 'embedding_config': config,
+                  'embedding_dim': dim, 'exported_at': datetime.now().isoformat()}
+        _write_block(f, json.dumps(header).encode('utf-8'), level)
+
+        for page in _chain(first, pages):
+            records, vectors = [], []
+            for passage in page:
+                records.append({
+                    'id': _field(passage, 'id'),
+                    'text': _field(passage, 'text'),
+                    'created_at': _jsonable(_field(passage, 'created_at')),
+                    'source_id': _field(passage, 'source_id'),
+                    'file_id': _field(passage, 'file_id'),
+                    'metadata': _field(passage, 'metadata_'),
+                })
+                if dim:
+                    embedding = _field(passage, 'embedding') or []
+                    # Missing embeddings are stored as zeros to keep the rows aligned
+                    vectors.append(_pack_floats(list(embedding[:dim]) + [0.0] * (dim - len(embedding[:dim]))))
+            body = json.dumps(records).encode('utf-8')
+            _write_block(f, _LENGTH.pack(len(body)) + body + b''.join(vectors), level)
+            summary['passages'] += len(records)
+            summary['chunks'] += 1
+            if on_progress:
+                on_progress(summary['passages'])
+
+        f.write(_LENGTH.pack(0))
+        _write_block(f, json.dumps({'passages': summary['passages']}).encode('utf-8'), level)
+    os.replace(tmp_path, path)
+
+    elapsed = time.monotonic() - started
+    summary.update(bytes=os.path.getsize(path), elapsed=elapsed,
+                   per_second=summary['passages'] / elapsed if elapsed else 0.0)
+    return summary
+
+def export_archival(client, agent_id, path, embeddings=True, page_size=CHUNK_PASSAGES, **kwargs):
+    """Export an agent's whole archival memory, oldest passage first"""
+    pages = iter_passage_pages(client, agent_id, page_size=page_size)
+    return export_passages(pages, path, agent_id=agent_id, embeddings=embeddings, **kwargs)
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        return _read_header(f)
+
+def _read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not an archival export file")
+    header = json.loads(_read_block(f))
+    if header['version'] > FORMAT_VERSION:
+        raise ValueError(f"Export format version {header['version']} is newer than this script")
+    return header
+
+def iter_export(path, embeddings=True):
+    """
+    Yield the passages of a .lam file as dicts, one chunk in memory at a time.
+
+    With embeddings=True and vectors in the file, every dict carries an
+    'embedding' list. Raises ValueError if the file is damaged or truncated.
+    """
+    with open(path, 'rb') as f:
+        header = _read_header(f)
+        dim = header.get('embedding_dim')
+        count = 0
+        while True:
+            chunk = _read_block(f)
+            if chunk is None:
+                break
+            (length,) = _LENGTH.unpack_from(chunk)
+            records = json.loads(chunk[_LENGTH.size:_LENGTH.size + length])
+            vectors = _unpack_floats(chunk[_LENGTH.size + length:]) if dim and embeddings else None
+            for row, record in enumerate(records):
+                if vectors is not None:
+                    record['embedding'] = vectors[row * dim:(row + 1) * dim].tolist()
+                    record['embedding_config'] = header['embedding_config']
+                count += 1
+                yield record
+        footer = json.loads(_read_block(f))
+        if footer['passages'] != count:
+            raise ValueError(f"File holds {count} passages, expected {footer['passages']}")
+
+def import_archival(base_url, agent_id, path, workers=DEFAULT_WORKERS, checkpoint=None, on_progress=None):
+    """Insert every passage of a .lam file into the agent; same summary as insert_passages"""
+    texts = (record['text'] for record in iter_export(path, embeddings=False))
+    return insert_passages(base_url, agent_id, texts, workers=workers, on_progress=on_progress, checkpoint=checkpoint)
+
+def default_checkpoint_path(path, agent_id):
+    # One checkpoint per target agent, so a file can be restored into several agents
+    return f"{path}.{agent_id}.checkpoint.json"
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import an agent's archival memory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Write the archival memory to a file")
+    export_parser.add_argument("agent_id")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--no-embeddings", action="store_true", help="Leave the embedding vectors out")
+    import_parser = subparsers.add_parser("import", help="Insert the passages of a file into an agent")
+    import_parser.add_argument("agent_id")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent insert requests")
+    import_parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    info_parser = subparsers.add_parser("info", help="Describe an export file")
+    info_parser.add_argument("path")
+    args = parser.parse_args()
+
+    base_url = "http://localhost:8283"
+    try:
+        last_report = [0.0]
+
+        def report(message):
+            now = time.monotonic()
+            if now - last_report[0] >= 1.0:
+                last_report[0] = now
+                print(message)
+
+        if args.command == "export":
+            # Connect to the Letta server
+            client = create_client(base_url=base_url)
+            summary = export_archival(
+                client, args.agent_id, args.path, embeddings=not args.no_embeddings,
+                on_progress=lambda count: report(f"Exported {count} passages")
+            )
+            print(f"{Fore.GREEN}Exported {summary['passages']} passages to {args.path}{Style.RESET_ALL} "
+                  f"({summary['bytes'] / 1024 / 1024:.1f} MB, {summary['elapsed']:.1f}s, "
+                  f"{summary['per_second']:.0f} passages/sec)")
+
+        elif args.command == "import":
+            if not os.path.isfile(args.path):
+                print(f"{Fore.RED}Error: File not found: {args.path}{Style.RESET_ALL}")
+                return
+            read_header(args.path)
+            checkpoint_path = default_checkpoint_path(args.path, args.agent_id)
+            if args.restart and os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+            summary = import_archival(
+                base_url, args.agent_id, args.path, workers=args.workers,
+                checkpoint=BulkCheckpoint(checkpoint_path),
+                on_progress=lambda inserted, failed, rate: report(
+                    f"Inserted {inserted} passages ({failed} failed), {rate:.1f} passages/sec")
+            )
+            print(f"\n{Fore.BLUE}Import Summary:{Style.RESET_ALL}")
+            print(f"{Fore.GREEN}Inserted: {Style.RESET_ALL}{summary['inserted']}")
+            print(f"{Fore.GREEN}Skipped (checkpoint): {Style.RESET_ALL}{summary['skipped']}")
+            print(f"{Fore.GREEN}Failed: {Style.RESET_ALL}{summary['failed']}")
+            print(f"{Fore.GREEN}Time: {Style.RESET_ALL}{summary['elapsed']:.1f}s "
+                  f"({summary['per_second']:.1f} passages/sec)")
+            for error in summary['errors']:
+                print(f"{Fore.RED}{error}{Style.RESET_ALL}")
+            if summary['failed']:
+                print(f"{Fore.YELLOW}Run the same command again to retry the failed passages{Style.RESET_ALL}")
+
+        else:
+            header = read_header(args.path)
+            count = sum(1 for _ in iter_export(args.path, embeddings=False))
+            print(f"{Fore.GREEN}Agent: {Style.RESET_ALL}{header['agent_id']}")
+            print(f"{Fore.GREEN}Exported at: {Style.RESET_ALL}{header['exported_at']}")
+            print(f"{Fore.GREEN}Passages: {Style.RESET_ALL}{count}")
+            print(f"{Fore.GREEN}Embeddings: {Style.RESET_ALL}"
+                  f"{header['embedding_dim'] or 'none'}"
+                  f"{' (' + header['embedding_config']['embedding_model'] + ')' if header['embedding_dim'] else ''}")
+            print(f"{Fore.GREEN}Size: {Style.RESET_ALL}{os.path.getsize(args.path) / 1024 / 1024:.1f} MB")
+
+    except Exception as e:
+        print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
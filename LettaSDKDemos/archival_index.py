@@ -0,0 +1,278 @@
+"""
+This script is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/archival_index.py
+
+This script demonstrates how to mirror an agent's archival memory locally
+and run similarity searches against the mirror instead of the server.
+
+The archival listing already carries every passage's embedding. The mirror
+keeps them as one float32 matrix of unit-length rows (trimmed to the
+model's embedding_dim; the server pads them to 4096 dimensions), so a
+cosine top-k search is a single matrix product and a batch of queries is
+one matrix multiply per block. It is saved under
+.cache/archival_index/<agent_id>.npy (+ .json for ids and texts).
+
+A sync walks the archival listing (archival_store.py, next page prefetched)
+and applies only the difference: embeddings of new passages are appended,
+rows of deleted passages are dropped, everything else is left as it is.
+
+Query text is embedded with the agent's own embedding model through
+letta.embeddings, so results match what the agent would retrieve. Searching
+by an existing passage ("what is close to this?") needs no embedding call.
+
+Related scripts:
+- manage_archival_memory.py: View and manage the passages
+- archival_store.py: Cursor-paged archival listing
+
+Usage:
+   python archival_index.py <agent_id> sync
+   python archival_index.py <agent_id> search "where does the user live" -k 5
+   python archival_index.py <agent_id> similar passage-xxxx
+   python archival_index.py <agent_id> bench --queries 10000    # random queries per second
+
+   from archival_index import ArchivalIndex
+   index = ArchivalIndex.load(agent_id)
+   index.sync(client)
+   for passage_id, score, text in index.search_text("where does the user live", k=5):
+       print(f"{score:.3f} {text[:80]}")
+"""
+
+from letta import create_client
+from colorama import init, Fore, Style
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+import numpy as np
+from archival_store import DEFAULT_PAGE_SIZE, iter_passage_pages
+
+# Initialize colorama
+init(autoreset=True)
+
+INDEX_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'archival_index'
+QUERY_BLOCK = 256       # queries per matrix multiply in search_many, bounds the score matrix
+
+def _field(passage, name):
+    # Passages come as SDK objects from the listing and as dicts from archival_store inserts
+    return passage.get(name) if isinstance(passage, dict) else getattr(passage, name, None)
+
+def _config_dict(config):
+    if config is None or isinstance(config, dict):
+        return config
+    return config.model_dump() if hasattr(config, 'model_dump') else config.dict()
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class ArchivalIndex:
+    """Local mirror of one agent's archival passages and embeddings"""
+
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+        self.ids = []               # row -> passage id
+        self.texts = []             # row -> passage text
+        self.rows = {}              # passage id -> row
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.embedding_config = None
+        self.synced_at = None
+        self._embedder = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1]
+
+    @classmethod
+    def load(cls, agent_id):
+        """The saved mirror of an agent, or an empty one"""
+        index = cls(agent_id)
+        try:
+            with open(INDEX_DIR / f"{agent_id}.json", encoding='utf-8') as f:
+                meta = json.load(f)
+            vectors = np.load(INDEX_DIR / f"{agent_id}.npy")
+        except (OSError, ValueError):
+            return index
+        if len(vectors) != len(meta['ids']):
+            # Half-written pair from an interrupted save: start over
+            return index
+        index.ids, index.texts = meta['ids'], meta['texts']
+        index.rows = {passage_id: row for row, passage_id in enumerate(index.ids)}
+        index.vectors = vectors
+        index.embedding_config = meta['embedding_config']
+        index.synced_at = meta['synced_at']
+        return index
+
+    def save(self):
+        INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        base = INDEX_DIR / self.agent_id
+        with open(f"{base}.npy.tmp", 'wb') as f:
+            np.save(f, self.vectors)
+        with open(f"{base}.json.tmp", 'w', encoding='utf-8') as f:
+            json.dump({
+                'ids': self.ids,
+                'texts': self.texts,
+                'embedding_config': self.embedding_config,
+                'synced_at': self.synced_at,
+            }, f)
+        os.replace(f"{base}.npy.tmp", f"{base}.npy")
+        os.replace(f"{base}.json.tmp", f"{base}.json")
+
+    def add_passages(self, passages):
+        """Append passages not in the mirror yet; returns how many were added"""
+        ids, texts, vectors = [], [], []
+        for passage in passages:
+            passage_id, embedding = _field(passage, 'id'), _field(passage, 'embedding')
+            if passage_id in self.rows or not embedding:
+                continue
+            if self.embedding_config is None:
+                self.embedding_config = _config_dict(_field(passage, 'embedding_config'))
+            dim = (self.embedding_config or {}).get('embedding_dim') or len(embedding)
+            ids.append(passage_id)
+            texts.append(_field(passage, 'text') or '')
+            vectors.append(embedding[:dim])
+        if not ids:
+            return 0
+
+        new = _normalize(np.asarray(vectors, dtype=np.float32))
+        if len(self) and new.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension changed from {self.dim} to {new.shape[1]}; rebuild the index")
+        self.vectors = np.concatenate([self.vectors, new]) if len(self) else new
+        for passage_id in ids:
+            self.rows[passage_id] = len(self.ids)
+            self.ids.append(passage_id)
+        self.texts.extend(texts)
+        return len(ids)
+
+    def remove_passages(self, passage_ids):
+        """Drop passages from the mirror; returns how many were removed"""
+        drop = {self.rows[passage_id] for passage_id in passage_ids if passage_id in self.rows}
+        if not drop:
+            return 0
+        keep = np.ones(len(self), dtype=bool)
+        keep[list(drop)] = False
+        self.vectors = self.vectors[keep]
+        self.ids = [passage_id for row, passage_id in enumerate(self.ids) if keep[row]]
+        self.texts = [text for row, text in enumerate(self.texts) if keep[row]]
+        self.rows = {passage_id: row for row, passage_id in enumerate(self.ids)}
+        return len(drop)
+
+    def sync(self, client, page_size=DEFAULT_PAGE_SIZE, save=True):
+        """
+        Bring the mirror up to date with the server's archival memory.
+
+        Returns {'added', 'removed', 'total', 'elapsed'}.
+        """
+        started = time.monotonic()
+        seen, added = set(), 0
+        for page in iter_passage_pages(client, self.agent_id, page_size=page_size):
+            seen.update(passage.id for passage in page)
+            added += self.add_passages(page)
+        removed = self.remove_passages([passage_id for passage_id in self.ids if passage_id not in seen])
+        self.synced_at = time.time()
+        if save:
+            self.save()
+        return {'added': added, 'removed': removed, 'total': len(self), 'elapsed': time.monotonic() - started}
+
+    def search(self, query_vector, k=5):
+        """Top-k passages by cosine similarity: [(passage id, score, text)], best first"""
+        ids, scores = self.search_many([query_vector], k)
+        return [(passage_id, float(score), self.texts[self.rows[passage_id]])
+                for passage_id, score in zip(ids[0], scores[0])]
+
+    def search_many(self, query_vectors, k=5):
+        """
+        Top-k for a batch of query vectors.
+
+        Returns (ids, scores): one list of passage ids and one array of
+        scores per query, best first.
+        """
+        if not len(self):
+            return [[] for _ in query_vectors], np.zeros((len(query_vectors), 0), dtype=np.float32)
+        queries = _normalize(np.asarray(query_vectors, dtype=np.float32)[:, :self.dim])
+        k = min(k, len(self))
+        all_ids, all_scores = [], []
+        for start in range(0, len(queries), QUERY_BLOCK):
+            scores = queries[start:start + QUERY_BLOCK] @ self.vectors.T
+            # argpartition finds the k best in linear time; only those k get sorted
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top, top_scores = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+            all_ids.extend([self.ids[row] for row in rows] for rows in top)
+            all_scores.append(top_scores)
+        return all_ids, np.concatenate(all_scores)
+
+    def similar(self, passage_id, k=5):
+        """Passages closest to an existing one, itself excluded"""
+        matches = self.search(self.vectors[self.rows[passage_id]], k + 1)
+        return [match for match in matches if match[0] != passage_id][:k]
+
+    def embed(self, text):
+        """Embed query text with the agent's embedding model"""
+        if self._embedder is None:
+            if not self.embedding_config:
+                raise ValueError("Index is empty; run a sync first")
+            from letta.embeddings import embedding_model
+            from letta.schemas.embedding_config import EmbeddingConfig
+            self._embedder = embedding_model(EmbeddingConfig(**self.embedding_config))
+        return self._embedder.get_text_embedding(text)
+
+    def search_text(self, text, k=5):
+        return self.search(self.embed(text), k)
+
+def print_matches(matches):
+    if not matches:
+        print(f"{Fore.YELLOW}No passages in the index{Style.RESET_ALL}")
+    for rank, (passage_id, score, text) in enumerate(matches, 1):
+        print(f"\n{Fore.GREEN}{rank}. {score:.3f} {Style.RESET_ALL}{passage_id}")
+        print(f"   {text[:200]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Local similarity search over an agent's archival memory")
+    parser.add_argument("agent_id", help="Agent whose archival memory is mirrored")
+    parser.add_argument("command", choices=["sync", "search", "similar", "bench"])
+    parser.add_argument("query", nargs="?", help="Query text (search) or passage id (similar)")
+    parser.add_argument("-k", type=int, default=5, help="Number of results")
+    parser.add_argument("--queries", type=int, default=10000, help="Random queries to run (bench)")
+    parser.add_argument("--no-sync", action="store_true", help="Search the saved mirror without syncing first")
+    args = parser.parse_args()
+
+    try:
+        index = ArchivalIndex.load(args.agent_id)
+        if args.command == "sync" or not args.no_sync:
+            # Connect to the Letta server
+            client = create_client(base_url="http://localhost:8283")
+            stats = index.sync(client)
+            print(f"{Fore.BLUE}Synced {stats['total']} passages{Style.RESET_ALL} "
+                  f"(+{stats['added']} / -{stats['removed']}) in {stats['elapsed']:.1f}s")
+
+        if args.command in ("search", "similar") and not args.query:
+            print(f"{Fore.RED}Error: {args.command} needs a query{Style.RESET_ALL}")
+        elif args.command == "search":
+            print_matches(index.search_text(args.query, args.k))
+        elif args.command == "similar":
+            if args.query not in index.rows:
+                print(f"{Fore.RED}Error: Passage {args.query} is not in the index{Style.RESET_ALL}")
+                return
+            print_matches(index.similar(args.query, args.k))
+        elif args.command == "bench":
+            if not len(index):
+                print(f"{Fore.YELLOW}No passages in the index{Style.RESET_ALL}")
+                return
+            queries = np.random.default_rng().standard_normal((args.queries, index.dim), dtype=np.float32)
+            started = time.monotonic()
+            index.search_many(queries, args.k)
+            elapsed = time.monotonic() - started
+            print(f"{Fore.GREEN}{args.queries} top-{args.k} queries over {len(index)} passages "
+                  f"in {elapsed:.2f}s ({args.queries / elapsed:.0f} queries/sec){Style.RESET_ALL}")
+
+    except Exception as e:
+        print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
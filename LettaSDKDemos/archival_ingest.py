@@ -0,0 +1,251 @@
+"""
+This script is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/archival_ingest.py
+
+This script demonstrates how to load documents into an agent's archival
+memory with the chunking done locally, in parallel.
+
+Uploading a file leaves all parsing and chunking to a single server-side
+job. Here the documents are cut into segments, the segments are chunked by
+a pool of processes (one per core), and the chunks stream straight into
+concurrent archival inserts (archival_store.py) while the rest is still
+being chunked.
+
+Chunks are sized to the agent's embedding_chunk_size (300 tokens for the
+agents create_agent.py makes). The server splits every inserted text into
+chunks of that size itself, so a chunk that already fits is stored as
+exactly one passage and the server does no splitting at all. Tokens are
+counted with tiktoken when it is installed (it comes with letta), otherwise
+estimated conservatively from the character count.
+
+Related scripts:
+- manage_archival_memory.py: View and manage the inserted passages
+- archival_store.py: Concurrent archival inserts
+- source_upload.py: Server-side ingestion into a data source instead
+- archival_dedup.py: Duplicate filter used with --dedup
+
+Supported files: plain text (.txt, .md, .csv, .log, ...) read as UTF-8.
+
+Usage:
+   python archival_ingest.py <agent_id> notes.md docs/*.txt
+   python archival_ingest.py <agent_id> big_corpus.txt --processes 8 --workers 16
+   python archival_ingest.py <agent_id> big_corpus.txt --dry-run     # only chunk and count
+   python archival_ingest.py <agent_id> notes.md --dedup             # skip chunks the agent already has
+"""
+
+from colorama import init, Fore, Style
+import argparse
+import math
+import os
+import re
+import time
+import requests
+from concurrent.futures import ProcessPoolExecutor
+from archival_store import DEFAULT_WORKERS, insert_passages
+
+# Initialize colorama
+init(autoreset=True)
+
+DEFAULT_CHUNK_SIZE = 300            # tokens, the embedding_chunk_size create_agent.py uses
+SEGMENT_BYTES = 1024 * 1024         # work unit handed to one process
+CHUNK_BUDGET = 0.95                 # fill chunks to 95% to absorb token count drift
+CHARS_PER_TOKEN_ESTIMATE = 3        # fallback without tiktoken, errs towards small chunks
+MAX_SEGMENTS_IN_FLIGHT = 4          # per process, keeps memory flat on huge inputs
+
+_PARAGRAPH_RE = re.compile(r'\n\s*\n')
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+_encoder = None
+
+def count_tokens(text):
+    """Token count with tiktoken's cl100k_base, or a conservative estimate"""
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoder = False
+    if _encoder:
+        return len(_encoder.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE)
+
+def _split_to_fit(text, budget):
+    """Split text into pieces of at most budget tokens: sentences, then words"""
+    if count_tokens(text) <= budget:
+        return [text]
+    sentences = _SENTENCE_RE.split(text)
+    if len(sentences) == 1:
+        words = text.split()
+        if len(words) == 1:
+            # One enormous "word" (e.g. base64): cut it by characters
+            step = max(budget * CHARS_PER_TOKEN_ESTIMATE // 2, 1)
+            return [text[i:i + step] for i in range(0, len(text), step)]
+        sentences = words
+    return _pack(sentences, budget, ' ', [])
+
+def _pack(parts, budget, separator, chunks):
+    """Greedily join parts into chunks of at most budget tokens"""
+    current, current_tokens = [], 0
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        tokens = count_tokens(part)
+        if tokens > budget:
+            if current:
+                chunks.append(separator.join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_to_fit(part, budget))
+            continue
+        # +1 for the separator between parts
+        if current and current_tokens + tokens + 1 > budget:
+            chunks.append(separator.join(current))
+            current, current_tokens = [], 0
+        current.append(part)
+        current_tokens += tokens + 1
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+def chunk_text(text, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Split text into chunks of at most chunk_size tokens, on paragraph/sentence boundaries"""
+    budget = max(int(chunk_size * CHUNK_BUDGET), 1)
+    return _pack(_PARAGRAPH_RE.split(text), budget, '\n\n', [])
+
+def chunk_segment(task):
+    """Process pool entry point: chunk one (path, start, end, chunk_size) segment"""
+    path, start, end, chunk_size = task
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return chunk_text(data.decode('utf-8', errors='replace'), chunk_size)
+
+def iter_segments(path, segment_bytes=SEGMENT_BYTES):
+    """Yield (start, end) byte ranges of about segment_bytes, cut after a blank line when possible"""
+    size = os.path.getsize(path)
+    start = 0
+    with open(path, 'rb') as f:
+        while start < size:
+            end = min(start + segment_bytes, size)
+            if end < size:
+                f.seek(end)
+                # Look ahead a little for a paragraph break, else settle for a line break
+                window = f.read(64 * 1024)
+                cut = window.find(b'\n\n')
+                if cut < 0:
+                    cut = window.find(b'\n')
+                end = end + cut + 1 if cut >= 0 else min(end + len(window), size)
+            yield start, end
+            start = end
+
+def iter_chunks(paths, chunk_size=DEFAULT_CHUNK_SIZE, processes=None):
+    """
+    Yield chunks of every file, in order, chunked by a process pool.
+
+    Only a few segments per process are queued at a time, so memory stays
+    flat however large the input is.
+    """
+    processes = processes or os.cpu_count() or 1
+    tasks = ((path, start, end, chunk_size) for path in paths for start, end in iter_segments(path))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        window = []
+        for task in tasks:
+            window.append(pool.submit(chunk_segment, task))
+            if len(window) >= processes * MAX_SEGMENTS_IN_FLIGHT:
+                yield from window.pop(0).result()
+        for future in window:
+            yield from future.result()
+
+def get_chunk_size(base_url, agent_id):
+    """The agent's embedding_chunk_size, so local chunks match what the server stores"""
+    response = requests.get(f"{base_url}/v1/agents/{agent_id}", timeout=30)
+    if response.status_code != 200:
+        raise ValueError(f"Server returned {response.status_code} for agent {agent_id}")
+    embedding_config = response.json().get('embedding_config') or {}
+    return embedding_config.get('embedding_chunk_size') or DEFAULT_CHUNK_SIZE
+
+def ingest_files(base_url, agent_id, paths, chunk_size=None, processes=None,
+                 workers=DEFAULT_WORKERS, on_progress=None, dedup=None):
+    """
+    Chunk files locally and stream the chunks into the agent's archival memory.
+
+    With a DedupIndex (archival_dedup.py), chunks the agent already has are skipped.
+    """
+    chunk_size = chunk_size or get_chunk_size(base_url, agent_id)
+    summary = insert_passages(
+        base_url, agent_id, iter_chunks(paths, chunk_size, processes), workers=workers, on_progress=on_progress,
+        dedup=dedup
+    )
+    summary['chunk_size'] = chunk_size
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunk documents locally and insert them into archival memory")
+    parser.add_argument("agent_id", help="Agent whose archival memory receives the passages")
+    parser.add_argument("files", nargs="+", help="Text files to ingest")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Tokens per chunk (default: the agent's embedding_chunk_size)")
+    parser.add_argument("--processes", type=int, default=None, help="Chunking processes (default: all cores)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent insert requests")
+    parser.add_argument("--dry-run", action="store_true", help="Only chunk the files and report the counts")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Skip chunks that duplicate a stored passage or an earlier chunk")
+    args = parser.parse_args()
+
+    base_url = "http://localhost:8283"
+    try:
+        missing = [path for path in args.files if not os.path.isfile(path)]
+        if missing:
+            print(f"{Fore.RED}Error: File(s) not found: {', '.join(missing)}{Style.RESET_ALL}")
+            return
+
+        started = time.monotonic()
+        if args.dry_run:
+            chunk_size = args.chunk_size or DEFAULT_CHUNK_SIZE
+            count = sum(1 for _ in iter_chunks(args.files, chunk_size, args.processes))
+            elapsed = time.monotonic() - started
+            print(f"{Fore.GREEN}{count} chunks of up to {chunk_size} tokens in {elapsed:.1f}s{Style.RESET_ALL}")
+            return
+
+        dedup = None
+        if args.dedup:
+            # Imported here so the chunking processes, which import this module, don't load letta
+            from letta import create_client
+            from archival_dedup import load_synced
+            dedup = load_synced(create_client(base_url=base_url), args.agent_id)
+
+        last_report = [0.0]
+
+        def on_progress(inserted, failed, rate):
+            now = time.monotonic()
+            if now - last_report[0] >= 1.0:
+                last_report[0] = now
+                print(f"Inserted {inserted} passages ({failed} failed), {rate:.1f} passages/sec")
+
+        summary = ingest_files(
+            base_url,
+            args.agent_id,
+            args.files,
+            chunk_size=args.chunk_size,
+            processes=args.processes,
+            workers=args.workers,
+            on_progress=on_progress,
+            dedup=dedup
+        )
+
+        print(f"\n{Fore.BLUE}Ingestion Summary:{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}Chunk size: {Style.RESET_ALL}{summary['chunk_size']} tokens")
+        print(f"{Fore.GREEN}Inserted: {Style.RESET_ALL}{summary['inserted']}")
+        if 'duplicates' in summary:
+            print(f"{Fore.GREEN}Duplicates skipped: {Style.RESET_ALL}{summary['duplicates']}")
+        print(f"{Fore.GREEN}Failed: {Style.RESET_ALL}{summary['failed']}")
+        print(f"{Fore.GREEN}Time: {Style.RESET_ALL}{summary['elapsed']:.1f}s ({summary['per_second']:.1f} passages/sec)")
+        for error in summary['errors']:
+            print(f"{Fore.RED}{error}{Style.RESET_ALL}")
+
+    except Exception as e:
+        print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
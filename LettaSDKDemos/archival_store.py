@@ -0,0 +1,310 @@
+"""
+This module is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/archival_store.py
+
+Reading and bulk-writing an agent's archival memory.
+
+iter_passages() walks an agent's whole archival memory with the server's
+`after` cursor, oldest first, one page at a time. While a page is being
+consumed the next one is already being fetched, and only those two pages
+are ever held in memory. find_passage() uses it to look a passage up by id.
+
+The server has no batch endpoint: every passage is one
+POST /v1/agents/{id}/archival (or DELETE .../archival/{passage_id}).
+insert_passages() and delete_passages() keep a bounded number of those
+requests in flight on keep-alive connections, retry busy-server errors
+with backoff, and consume their input lazily so an iterator or JSONL file
+of any length streams through with flat memory. A BulkCheckpoint records
+finished items so an interrupted run picks up where it stopped.
+
+Related scripts:
+- manage_archival_memory.py: Interactive archival memory management
+- archival_ingest.py: Chunks documents locally and inserts them here
+- bulk_archival.py: Command line bulk insert/delete from JSONL
+- archival_index.py: Local vector index synced from the listing
+- archival_export.py: Snapshot export/import built on the listing and bulk inserts
+- archival_dedup.py: Duplicate filter for insert_passages(dedup=...)
+
+Usage:
+   from archival_store import iter_passages, find_passage, insert_passages
+   for passage in iter_passages(client, agent_id):
+       print(passage.id, passage.text[:80])
+   passage = find_passage(client, agent_id, "passage-xxxx")
+   summary = insert_passages(base_url, agent_id, texts, workers=8)
+   print(summary['inserted'], summary['per_second'])
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from pathlib import Path
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_RETRIES = 3
+BACKOFF_BASE = 0.5      # seconds, doubled after every failed attempt
+BACKOFF_MAX = 10.0
+REQUEST_TIMEOUT = 60
+CHECKPOINT_EVERY = 100  # finished items between checkpoint saves
+
+# Responses worth retrying: the server was busy or a proxy gave up on it
+RETRY_STATUSES = {429, 502, 503, 504}
+# The subset that means the server turned the request away without acting on it
+REFUSED_STATUSES = {429, 503}
+
+def get_passage_page(client, agent_id, after=None, limit=DEFAULT_PAGE_SIZE):
+    """Return (passages oldest first, cursor) for the page after the passage id `after`"""
+    passages = client.get_archival_memory(agent_id=agent_id, after=after, limit=limit)
+    cursor = passages[-1].id if len(passages) == limit else None
+    logger.debug(f"Fetched {len(passages)} passages for {agent_id} after {after}")
+    return passages, cursor
+
+def iter_passage_pages(client, agent_id, page_size=DEFAULT_PAGE_SIZE, after=None, prefetch=True):
+    """Yield pages of passages, oldest first, fetching the next page in the background"""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        fetch = lambda cursor: get_passage_page(client, agent_id, after=cursor, limit=page_size)
+        pending = pool.submit(fetch, after)
+        while pending is not None:
+            passages, cursor = pending.result()
+            # A server that ignores the cursor would hand back the same page forever
+            if cursor is not None and cursor == after:
+                raise ValueError("Archival memory cursor did not advance")
+            pending = pool.submit(fetch, cursor) if cursor is not None and prefetch else None
+            if passages:
+                yield passages
+            if cursor is not None and pending is None:
+                pending = pool.submit(fetch, cursor)
+            after = cursor
+
+def iter_passages(client, agent_id, page_size=DEFAULT_PAGE_SIZE, after=None, prefetch=True):
+    """Yield every archival passage of an agent, oldest first"""
+    for page in iter_passage_pages(client, agent_id, page_size=page_size, after=after, prefetch=prefetch):
+        yield from page
+
+def find_passage(client, agent_id, passage_id, page_size=DEFAULT_PAGE_SIZE):
+    """Return the passage with this id, or None; stops reading at the match"""
+    return next((passage for passage in iter_passages(client, agent_id, page_size) if passage.id == passage_id), None)
+
+_local = threading.local()
+
+def _session():
+    # One keep-alive connection per worker thread
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+def _backoff(attempt, response=None):
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_MAX)
+    # Full jitter keeps the workers from retrying in lockstep
+    return random.uniform(0, min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX))
+
+def _never_sent(error):
+    """True if the request failed before a connection to the server was made"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
+def _request(method, url, ok_statuses=(200,), retries=DEFAULT_RETRIES, idempotent=True, **kwargs):
+    """
+    Send one request, retrying connection errors and busy-server responses.
+
+    A request that isn't idempotent is only retried when it never reached
+    the server (no connection could be made, 429, 503). After a read
+    timeout, a dropped connection or a 502/504 the server may already have
+    acted on it, and a retry would do it twice.
+    """
+    for attempt in range(retries + 1):
+        response = None
+        try:
+            response = _session().request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+            if response.status_code in ok_statuses:
+                return response
+            error = ValueError(f"Server returned {response.status_code} - {response.text}")
+            retryable = response.status_code in (RETRY_STATUSES if idempotent else REFUSED_STATUSES)
+        except requests.RequestException as e:
+            error, retryable = e, idempotent or _never_sent(e)
+        if not retryable or attempt == retries:
+            raise error
+        time.sleep(_backoff(attempt, response))
+
+def insert_passage(base_url, agent_id, text, retries=DEFAULT_RETRIES):
+    """Insert one passage; returns the created passage dicts"""
+    response = _request('POST', f"{base_url}/v1/agents/{agent_id}/archival", json={"text": text},
+                        retries=retries, idempotent=False)
+    return response.json()
+
+def delete_passage(base_url, agent_id, passage_id, retries=DEFAULT_RETRIES):
+    """Delete one passage; one that is already gone counts as deleted"""
+    _request('DELETE', f"{base_url}/v1/agents/{agent_id}/archival/{passage_id}",
+             ok_statuses=(200, 204, 404), retries=retries)
+
+class BulkCheckpoint:
+    """
+    Which items of an input stream are done, saved to a JSON file.
+
+    Items finish out of order, so it keeps the index below which everything
+    is done plus the finished indexes above it. Failed items are never
+    marked, so running the same input again retries exactly those.
+    """
+
+    def __init__(self, path, save_every=CHECKPOINT_EVERY):
+        self.path = Path(path)
+        self.save_every = save_every
+        self.unsaved = 0
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.done_below, self.done = data['done_below'], set(data['done'])
+        except (OSError, ValueError, KeyError):
+            self.done_below, self.done = 0, set()
+
+    def is_done(self, index):
+        return index < self.done_below or index in self.done
+
+    def mark(self, index):
+        self.done.add(index)
+        while self.done_below in self.done:
+            self.done.remove(self.done_below)
+            self.done_below += 1
+        self.unsaved += 1
+        if self.unsaved >= self.save_every:
+            self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'done_below': self.done_below, 'done': sorted(self.done)}, f)
+        os.replace(tmp_path, self.path)
+        self.unsaved = 0
+
+def _run_bulk(items, operation, label, workers, on_progress, checkpoint, description, is_duplicate=None,
+              on_done=None):
+    """
+    Run operation(item) for every item, `workers` at a time.
+
+    Items are pulled from the iterable only as slots free up, so streams of
+    any length run with flat memory. Items for which is_duplicate(item) is
+    true are dropped (and checkpointed) without a request. on_done(item) is
+    called, on this thread, for every item whose operation succeeded.
+    """
+    started = time.monotonic()
+    summary = {label: 0, 'failed': 0, 'skipped': 0, 'errors': []}
+    if is_duplicate:
+        summary['duplicates'] = 0
+
+    def done(future, index, item):
+        try:
+            future.result()
+            summary[label] += 1
+            if checkpoint:
+                checkpoint.mark(index)
+            if on_done:
+                on_done(item)
+        except Exception as e:
+            summary['failed'] += 1
+            # Keep a few samples, not one error per failed passage
+            if len(summary['errors']) < 10:
+                summary['errors'].append(str(e))
+            logger.warning(f"{description} failed: {str(e)}")
+        if on_progress:
+            elapsed = time.monotonic() - started
+            on_progress(summary[label], summary['failed'], summary[label] / elapsed if elapsed else 0.0)
+
+    in_flight = {}      # future -> (input index, item)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                for index, item in enumerate(items):
+                    if checkpoint and checkpoint.is_done(index):
+                        summary['skipped'] += 1
+                        continue
+                    # Checked after the checkpoint, so line numbers mean the same thing on every run
+                    if is_duplicate and is_duplicate(item):
+                        summary['duplicates'] += 1
+                        if checkpoint:
+                            checkpoint.mark(index)
+                        continue
+                    if len(in_flight) >= workers * 2:
+                        finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            done(future, *in_flight.pop(future))
+                    in_flight[pool.submit(operation, item)] = (index, item)
+            except BaseException:
+                # Aborted (bad input line, Ctrl+C): don't start queued requests...
+                for future in in_flight:
+                    future.cancel()
+                raise
+            finally:
+                # ...but record the ones already sent, so a resume doesn't repeat them
+                for future in as_completed(list(in_flight)):
+                    if not future.cancelled():
+                        done(future, *in_flight[future])
+    finally:
+        if checkpoint:
+            checkpoint.save()
+
+    elapsed = time.monotonic() - started
+    summary['elapsed'] = elapsed
+    summary['per_second'] = summary[label] / elapsed if elapsed else 0.0
+    return summary
+
+def insert_passages(base_url, agent_id, texts, workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES,
+                    on_progress=None, checkpoint=None, dedup=None):
+    """
+    Insert every text of an iterable as its own passage, `workers` at a time.
+
+    on_progress(inserted, failed, passages_per_sec) is called after each one.
+    With a BulkCheckpoint, texts already inserted by an earlier run over the
+    same input are skipped. With a DedupIndex (archival_dedup.py), texts
+    that duplicate a stored passage or an earlier text are not inserted.
+    Returns {'inserted', 'failed', 'skipped', 'errors', 'elapsed',
+    'per_second'}, plus 'duplicates' with dedup.
+    """
+    return _run_bulk(
+        texts, lambda text: insert_passage(base_url, agent_id, text, retries=retries),
+        'inserted', workers, on_progress, checkpoint, f"Archival insert for {agent_id}",
+        is_duplicate=(lambda text: dedup.check_and_add(text) is not None) if dedup else None
+    )
+
+def delete_passages(base_url, agent_id, passage_ids, workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES,
+                    on_progress=None, checkpoint=None, on_deleted=None):
+    """
+    Delete every passage id of an iterable, `workers` at a time; same
+    summary as insert_passages. on_deleted(passage_id) is called for every
+    id that is gone, e.g. DedupIndex.remove to keep a saved index current.
+    """
+    return _run_bulk(
+        passage_ids, lambda passage_id: delete_passage(base_url, agent_id, passage_id, retries=retries),
+        'deleted', workers, on_progress, checkpoint, f"Archival delete for {agent_id}", on_done=on_deleted
+    )
+
+def read_jsonl(path, field):
+    """
+    Yield one value per line of a JSONL file, streamed.
+
+    A line is either a JSON string or an object holding `field`
+    ("text" for inserts, "id" for deletes). Blank lines are skipped.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            value = json.loads(line)
+            if isinstance(value, dict):
+                value = value.get(field)
+            if not isinstance(value, str) or not value:
+                raise ValueError(f"line {line_no}: expected a string or an object with \"{field}\"")
+            yield value
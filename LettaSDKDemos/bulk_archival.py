@@ -0,0 +1,138 @@
+"""
+This script is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/bulk_archival.py
+
+This script demonstrates how to insert or delete many archival memory
+passages at once.
+
+manage_archival_memory.py handles one passage per prompt. Here a JSONL
+file is streamed through a bounded pool of workers (archival_store.py),
+with retries and backoff for transient server errors. Finished lines are
+recorded in a checkpoint file next to the input, so an interrupted run
+simply continues when started again; lines that failed are retried.
+
+Inserts first pass a duplicate filter (archival_dedup.py): lines that
+repeat, exactly or nearly, a passage the agent already has or an earlier
+line are skipped.
+
+Related scripts:
+- manage_archival_memory.py: Interactive archival memory management
+- archival_store.py: Concurrent inserts/deletes and the checkpoint
+- archival_ingest.py: Chunk whole documents into archival memory instead
+- archival_dedup.py: The duplicate filter and a duplicate report
+
+Input formats (JSONL, one passage per line):
+   insert: {"text": "The user prefers metric units."}  or  "The user prefers metric units."
+   delete: {"id": "passage-xxxx"}  or  "passage-xxxx"
+
+Usage:
+   python bulk_archival.py insert <agent_id> facts.jsonl
+   python bulk_archival.py delete <agent_id> ids.jsonl --workers 16
+   python bulk_archival.py insert <agent_id> facts.jsonl --restart    # ignore the checkpoint
+   python bulk_archival.py insert <agent_id> facts.jsonl --no-dedup   # insert duplicates too
+"""
+
+from letta import create_client
+from colorama import init, Fore, Style
+import argparse
+import os
+import time
+from archival_store import (
+    DEFAULT_RETRIES,
+    DEFAULT_WORKERS,
+    BulkCheckpoint,
+    delete_passages,
+    insert_passages,
+    read_jsonl,
+)
+from archival_dedup import DEFAULT_THRESHOLD, DedupIndex, load_synced
+
+# Initialize colorama
+init(autoreset=True)
+
+OPERATIONS = {
+    # operation: (JSONL field, bulk function, summary key)
+    'insert': ('text', insert_passages, 'inserted'),
+    'delete': ('id', delete_passages, 'deleted'),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Insert or delete archival memory passages in bulk from JSONL")
+    parser.add_argument("operation", choices=sorted(OPERATIONS), help="What to do with every line")
+    parser.add_argument("agent_id", help="Agent whose archival memory is changed")
+    parser.add_argument("input", help="JSONL file with one passage text (insert) or passage id (delete) per line")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent requests")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per passage on transient errors")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <input>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    parser.add_argument("--no-dedup", action="store_true", help="Insert lines even if they duplicate a passage")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated similarity that counts as a duplicate (0-1)")
+    args = parser.parse_args()
+
+    base_url = "http://localhost:8283"
+    try:
+        if not os.path.isfile(args.input):
+            print(f"{Fore.RED}Error: File not found: {args.input}{Style.RESET_ALL}")
+            return
+
+        field, run, label = OPERATIONS[args.operation]
+        checkpoint_path = args.checkpoint or f"{args.input}.checkpoint.json"
+        if args.restart and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        checkpoint = BulkCheckpoint(checkpoint_path)
+        if checkpoint.done_below or checkpoint.done:
+            print(f"{Fore.YELLOW}Resuming: {checkpoint.done_below + len(checkpoint.done)} line(s) "
+                  f"already done according to {checkpoint_path}{Style.RESET_ALL}")
+
+        extra = {}
+        if args.operation == 'insert' and not args.no_dedup:
+            # Connect to the Letta server to fingerprint the passages the agent already has
+            client = create_client(base_url=base_url)
+            extra['dedup'] = load_synced(client, args.agent_id, args.threshold)
+            print(f"Duplicate filter ready: {len(extra['dedup'])} existing passages")
+        saved_index = None
+        if args.operation == 'delete':
+            # Drop deleted passages from the saved duplicate index, so it doesn't report them
+            saved_index = DedupIndex.load(args.agent_id, args.threshold)
+            extra['on_deleted'] = saved_index.remove
+
+        last_report = [0.0]
+
+        def on_progress(succeeded, failed, rate):
+            now = time.monotonic()
+            if now - last_report[0] >= 1.0:
+                last_report[0] = now
+                print(f"{label.capitalize()} {succeeded} passages ({failed} failed), {rate:.1f} passages/sec")
+
+        summary = run(
+            base_url,
+            args.agent_id,
+            read_jsonl(args.input, field),
+            workers=args.workers,
+            retries=args.retries,
+            on_progress=on_progress,
+            checkpoint=checkpoint,
+            **extra
+        )
+        if saved_index is not None and saved_index.synced_at is not None:
+            saved_index.save()
+
+        print(f"\n{Fore.BLUE}Bulk {args.operation.capitalize()} Summary:{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}{label.capitalize()}: {Style.RESET_ALL}{summary[label]}")
+        print(f"{Fore.GREEN}Skipped (checkpoint): {Style.RESET_ALL}{summary['skipped']}")
+        if 'duplicates' in summary:
+            print(f"{Fore.GREEN}Duplicates skipped: {Style.RESET_ALL}{summary['duplicates']}")
+        print(f"{Fore.GREEN}Failed: {Style.RESET_ALL}{summary['failed']}")
+        print(f"{Fore.GREEN}Time: {Style.RESET_ALL}{summary['elapsed']:.1f}s ({summary['per_second']:.1f} passages/sec)")
+        print(f"{Fore.GREEN}Checkpoint: {Style.RESET_ALL}{checkpoint_path}")
+        for error in summary['errors']:
+            print(f"{Fore.RED}{error}{Style.RESET_ALL}")
+        if summary['failed']:
+            print(f"{Fore.YELLOW}Run the same command again to retry the failed lines{Style.RESET_ALL}")
+
+    except Exception as e:
+        print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+This script is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/bulk_create_agents.py
+
+This script demonstrates how to provision many agents at once from a
+manifest file.
+
+The whole manifest is validated before anything is created. Agents are
+then created by a bounded pool of workers, with retries and backoff for
+transient server errors and an optional cap on requests per second.
+Every row's outcome is appended to a results file as soon as it is known,
+so an interrupted run can simply be started again: agents whose name
+already exists are skipped.
+
+Related scripts:
+- create_agent.py: Model/embedding presets and the agent payload
+- agent_cache.py: Agent listing used to skip existing agents
+
+Manifest formats:
+1. JSONL, one agent per line:
+   {"name": "support-1", "model": "letta-free", "tools": ["send_message"], "persona": "..."}
+
+2. CSV with a header row; tools are separated by '|':
+   name,description,model,embedding,tools,system,persona,human
+   support-1,,letta-free,letta-free,send_message|conversation_search,,...
+
+Only "name" is required; the other fields default like create_basic_agent.
+
+Usage:
+   python bulk_create_agents.py agents.jsonl
+   python bulk_create_agents.py agents.csv --workers 8 --rate 20 --results out.jsonl
+   python bulk_create_agents.py agents.csv --dry-run
+"""
+
+from letta import create_client
+from colorama import init, Fore, Style
+import argparse
+import csv
+import json
+import random
+import threading
+import time
+import requests
+from urllib3.exceptions import NewConnectionError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from agent_cache import list_agents, invalidate_agents
+from create_agent import (
+    BLOCK_LIMIT,
+    EMBEDDING_PRESETS,
+    LLM_PRESETS,
+    VALID_TOOLS,
+    build_agent_payload,
+)
+
+# Initialize colorama
+init(autoreset=True)
+
+MANIFEST_FIELDS = ("name", "description", "model", "embedding", "tools", "system", "persona", "human")
+
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 3
+BACKOFF_BASE = 0.5      # seconds, doubled after every failed attempt
+BACKOFF_MAX = 10.0
+REQUEST_TIMEOUT = 60
+
+# Responses worth retrying: the server refused the request before creating anything
+RETRY_STATUSES = {429, 503}
+# A proxy gave up waiting; the agent may or may not have been created
+AMBIGUOUS_STATUSES = {502, 504}
+
+def read_manifest(path):
+    """Return [(line number, row dict)] from a .jsonl or .csv manifest"""
+    path = Path(path)
+    rows = []
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.suffix.lower() == '.csv':
+            for line_no, row in enumerate(csv.DictReader(f), 2):
+                row = {key: (value or '').strip() or None for key, value in row.items() if key}
+                if row.get('tools'):
+                    row['tools'] = [tool.strip() for tool in row['tools'].split('|') if tool.strip()]
+                rows.append((line_no, row))
+        else:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    rows.append((line_no, json.loads(line)))
+                except json.JSONDecodeError as e:
+                    rows.append((line_no, {'_error': f"invalid JSON: {e.msg}"}))
+    return rows
+
+def validate_manifest(rows):
+    """Return a list of 'line N: problem' strings; empty when the manifest is valid"""
+    problems = []
+    seen = {}
+    for line_no, row in rows:
+        if not isinstance(row, dict):
+            problems.append(f"line {line_no}: expected a JSON object, got {type(row).__name__}")
+            continue
+        if '_error' in row:
+            problems.append(f"line {line_no}: {row['_error']}")
+            continue
+        unknown = set(row) - set(MANIFEST_FIELDS)
+        if unknown:
+            problems.append(f"line {line_no}: unknown field(s) {', '.join(sorted(unknown))}")
+
+        # Everything but tools is a string; other types would crash the checks below
+        for field in MANIFEST_FIELDS:
+            if field != 'tools' and row.get(field) is not None and not isinstance(row[field], str):
+                problems.append(f"line {line_no}: {field} must be a string")
+
+        name = row.get('name')
+        if not name:
+            problems.append(f"line {line_no}: name is required")
+        elif isinstance(name, str):
+            if name in seen:
+                problems.append(f"line {line_no}: duplicate name '{name}' (also on line {seen[name]})")
+            else:
+                seen[name] = line_no
+
+        model, embedding = row.get('model') or 'letta-free', row.get('embedding') or 'letta-free'
+        if isinstance(model, str) and model not in LLM_PRESETS:
+            problems.append(f"line {line_no}: unknown model '{model}' (use {', '.join(LLM_PRESETS)})")
+        if isinstance(embedding, str) and embedding not in EMBEDDING_PRESETS:
+            problems.append(
+                f"line {line_no}: unknown embedding '{embedding}' (use {', '.join(EMBEDDING_PRESETS)})"
+            )
+
+        tools = row.get('tools')
+        if tools is not None:
+            if not isinstance(tools, list) or not all(isinstance(tool, str) for tool in tools):
+                problems.append(f"line {line_no}: tools must be a list of tool names")
+            elif set(tools) - VALID_TOOLS:
+                problems.append(f"line {line_no}: unknown tool(s) {', '.join(sorted(set(tools) - VALID_TOOLS))}")
+
+        for block in ('persona', 'human'):
+            if isinstance(row.get(block), str) and len(row[block]) > BLOCK_LIMIT:
+                problems.append(f"line {line_no}: {block} is longer than {BLOCK_LIMIT} characters")
+    return problems
+
+class RateLimiter:
+    """Spaces requests out so no more than `rate` start per second"""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        time.sleep(max(slot - now, 0))
+
+_local = threading.local()
+
+def _session():
+    # One keep-alive connection per worker thread
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+def _backoff(attempt, response=None):
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_MAX)
+    # Full jitter keeps the workers from retrying in lockstep
+    return random.uniform(0, min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX))
+
+def _never_sent(error):
+    """True if the request failed before a connection to the server was made"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
+def _find_agent(base_url, name):
+    """The server's agent dict with this name, or None"""
+    response = _session().get(f"{base_url}/v1/agents/", timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        raise ValueError(f"{response.status_code} - {response.text}")
+    return next((agent for agent in response.json() if agent['name'] == name), None)
+
+def create_agent_with_retries(base_url, payload, retries=DEFAULT_RETRIES, limiter=None):
+    """
+    POST one agent, retrying transient failures; returns (agent dict, attempts).
+
+    Creating an agent is not idempotent. Failures where the request never
+    reached the server (no connection, 429, 503) are retried as they are;
+    after one where it may have been processed (read timeout, dropped
+    connection, 502, 504)
+    the agent is looked up by name first and only posted again if missing.
+    Raised errors carry the number of attempts made as `attempts`.
+    """
+    for attempt in range(retries + 1):
+        if limiter:
+            limiter.wait()
+        response = None
+        ambiguous = False
+        try:
+            response = _session().post(f"{base_url}/v1/agents/", json=payload, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 200:
+                return response.json(), attempt + 1
+            error = ValueError(f"{response.status_code} - {response.text}")
+            retryable = response.status_code in RETRY_STATUSES
+            ambiguous = response.status_code in AMBIGUOUS_STATUSES
+        except requests.RequestException as e:
+            retryable = _never_sent(e)
+            error, ambiguous = e, not retryable
+        if ambiguous and attempt < retries:
+            try:
+                agent = _find_agent(base_url, payload['name'])
+            except (requests.RequestException, ValueError):
+                # Can't tell whether it was created, so don't risk a duplicate
+                agent = None
+            else:
+                if agent is not None:
+                    return agent, attempt + 1
+                retryable = True
+        if not retryable or attempt == retries:
+            error.attempts = attempt + 1
+            raise error
+        time.sleep(_backoff(attempt, response))
+
+def provision_agents(client, rows, workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES,
+                     rate=None, results_path=None, on_result=None):
+    """
+    Create every agent in rows (as returned by read_manifest) concurrently.
+
+    Rows whose name already exists on the server are skipped. Each outcome
+    is appended to results_path as a JSON line and passed to on_result().
+    Returns a summary dict with created/skipped/failed counts and timing.
+    """
+    existing = {agent.name for agent in list_agents(client)}
+    limiter = RateLimiter(rate)
+    results_file = open(results_path, 'a', encoding='utf-8') if results_path else None
+    write_lock = threading.Lock()
+    counts = {'created': 0, 'skipped': 0, 'failed': 0}
+    started = time.monotonic()
+
+    def record(result):
+        with write_lock:
+            counts[result['status']] += 1
+            if results_file:
+                results_file.write(json.dumps(result) + '\n')
+                results_file.flush()
+        if on_result:
+            on_result(result)
+
+    def provision(line_no, row):
+        result = {'line': line_no, 'name': row['name'], 'agent_id': None, 'attempts': 0, 'error': None}
+        if row['name'] in existing:
+            result['status'] = 'skipped'
+            return result
+        row_started = time.monotonic()
+        try:
+            payload = build_agent_payload(
+                row['name'],
+                row.get('description'),
+                model=row.get('model') or 'letta-free',
+                embedding=row.get('embedding') or 'letta-free',
+                tools=row.get('tools'),
+                system=row.get('system'),
+                persona=row.get('persona'),
+                human=row.get('human')
+            )
+            agent, result['attempts'] = create_agent_with_retries(
+                client.base_url, payload, retries=retries, limiter=limiter
+            )
+            result['status'] = 'created'
+            result['agent_id'] = agent.get('id')
+        except Exception as e:
+            result['status'] = 'failed'
+            result['attempts'] = getattr(e, 'attempts', 0)
+            result['error'] = str(e)
+        result['elapsed_ms'] = round((time.monotonic() - row_started) * 1000)
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(provision, line_no, row) for line_no, row in rows]
+            for future in as_completed(futures):
+                record(future.result())
+    finally:
+        if results_file:
+            results_file.close()
+        if counts['created']:
+            invalidate_agents()
+
+    elapsed = time.monotonic() - started
+    return {
+        **counts,
+        'elapsed': elapsed,
+        'per_second': counts['created'] / elapsed if elapsed else 0.0,
+    }
+
+def print_result(result):
+    """Print one provisioning outcome"""
+    if result['status'] == 'created':
+        print(f"{Fore.GREEN}Created {result['name']} ({result['agent_id']}) "
+              f"in {result['elapsed_ms']}ms, {result['attempts']} attempt(s){Style.RESET_ALL}")
+    elif result['status'] == 'skipped':
+        print(f"{Fore.YELLOW}Skipped {result['name']}: already exists{Style.RESET_ALL}")
+    else:
+        print(f"{Fore.RED}Failed {result['name']} (line {result['line']}): {result['error']}{Style.RESET_ALL}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Create agents in bulk from a JSONL or CSV manifest")
+    parser.add_argument("manifest", help="Path to a .jsonl or .csv manifest")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent create requests")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per agent on transient errors")
+    parser.add_argument("--rate", type=float, default=None, help="Maximum create requests per second")
+    parser.add_argument("--results", default=None, help="Results file (default: <manifest>.results.jsonl)")
+    parser.add_argument("--dry-run", action="store_true", help="Only validate the manifest")
+    args = parser.parse_args()
+
+    try:
+        rows = read_manifest(args.manifest)
+        problems = validate_manifest(rows)
+        if problems:
+            print(f"{Fore.RED}Manifest has {len(problems)} problem(s), nothing was created:{Style.RESET_ALL}")
+            for problem in problems:
+                print(f"- {problem}")
+            return
+        print(f"{Fore.GREEN}Manifest OK: {len(rows)} agents{Style.RESET_ALL}")
+        if args.dry_run:
+            return
+
+        # Connect to the Letta server
+        client = create_client(base_url="http://localhost:8283")
+        results_path = args.results or f"{args.manifest}.results.jsonl"
+        summary = provision_agents(
+            client,
+            rows,
+            workers=args.workers,
+            retries=args.retries,
+            rate=args.rate,
+            results_path=results_path,
+            on_result=print_result
+        )
+
+        print(f"\n{Fore.BLUE}Provisioning Summary:{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}Created: {Style.RESET_ALL}{summary['created']}")
+        print(f"{Fore.GREEN}Skipped: {Style.RESET_ALL}{summary['skipped']}")
+        print(f"{Fore.GREEN}Failed: {Style.RESET_ALL}{summary['failed']}")
+        print(f"{Fore.GREEN}Time: {Style.RESET_ALL}{summary['elapsed']:.1f}s "
+              f"({summary['per_second']:.1f} agents/sec)")
+        print(f"{Fore.GREEN}Results: {Style.RESET_ALL}{results_path}")
+
+    except Exception as e:
+        print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
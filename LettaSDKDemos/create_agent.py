@@ -9,6 +9,7 @@ Related scripts:
 - manage_embedding_models.py: For managing agent embedding models
 - manage_agent_tools.py: For managing agent tools
 - update_system_prompt.py: For updating system prompts
+- model_catalog.py: Models and embeddings offered by the server
 
 Configuration Options:
 1. LLM Models:
@@ -34,59 +35,134 @@ from colorama import init, Fore, Style
 import json
 import requests
 from pathlib import Path
+from agent_cache import invalidate_agents
+from model_catalog import get_llm_models, get_embedding_models
 
 # Initialize colorama
 init(autoreset=True)
 
-def create_basic_agent(client, name, description=None):
-    """Create a basic agent with minimal configuration"""
-    try:
-        print(f"\n{Fore.YELLOW}Creating basic agent '{name}'...{Style.RESET_ALL}")
-        
-        # Create default LLM config
-        llm_config = LLMConfig(
-            model="letta-free",
-            model_endpoint_type="openai",
-            model_endpoint="https://inference.memgpt.ai",
-            context_window=16384,
-            put_inner_thoughts_in_kwargs=True
-        ).dict(exclude_none=True)
-        
-        # Create default embedding config
-        embedding_config = EmbeddingConfig(
-            embedding_endpoint_type="hugging-face",
-            embedding_endpoint="https://embeddings.memgpt.ai",
-            embedding_model="letta-free",
-            embedding_dim=1024,
-            embedding_chunk_size=300
-        ).dict(exclude_none=True)
-        
-        # Create default memory config with blocks
-        memory_config = {
+# Model presets accepted in bulk manifests, and offered by the advanced menu
+# when the server's model catalog can't be loaded
+LLM_PRESETS = {
+    "gpt-4": dict(
+        model="gpt-4",
+        model_endpoint_type="openai",
+        model_endpoint="https://api.openai.com/v1",
+        context_window=8192,
+        put_inner_thoughts_in_kwargs=False
+    ),
+    "claude-3": dict(
+        model="claude-3-opus-20240229",
+        model_endpoint_type="anthropic",
+        model_endpoint="https://api.anthropic.com/v1",
+        context_window=200000,
+        put_inner_thoughts_in_kwargs=True
+    ),
+    "letta-free": dict(
+        model="letta-free",
+        model_endpoint_type="openai",
+        model_endpoint="https://inference.memgpt.ai",
+        context_window=16384,
+        put_inner_thoughts_in_kwargs=True
+    ),
+}
+
+EMBEDDING_PRESETS = {
+    "openai": dict(
+        embedding_endpoint_type="openai",
+        embedding_endpoint="https://api.openai.com/v1",
+        embedding_model="text-embedding-ada-002",
+        embedding_dim=1536,
+        embedding_chunk_size=300
+    ),
+    "letta-free": dict(
+        embedding_endpoint_type="hugging-face",
+        embedding_endpoint="https://embeddings.memgpt.ai",
+        embedding_model="letta-free",
+        embedding_dim=1024,
+        embedding_chunk_size=300
+    ),
+}
+
+VALID_TOOLS = {
+    "send_message",
+    "conversation_search",
+    "archival_memory_insert",
+    "archival_memory_search",
+    "core_memory_append",
+    "core_memory_replace"
+}
+
+DEFAULT_TOOLS = ["send_message", "conversation_search"]
+DEFAULT_SYSTEM = "You are a helpful AI assistant."
+DEFAULT_PERSONA = "I am a helpful AI assistant."
+DEFAULT_HUMAN = "The human I am talking to."
+BLOCK_LIMIT = 2000
+
+def build_agent_payload(name, description=None, model="letta-free", embedding="letta-free",
+                        tools=None, system=None, persona=None, human=None,
+                        llm_config=None, embedding_config=None):
+    """Build the POST /v1/agents/ payload from preset names (or ready config dicts)"""
+    return {
+        "name": name,
+        "description": description,
+        "llm_config": llm_config or LLMConfig(**LLM_PRESETS[model]).dict(exclude_none=True),
+        "embedding_config": embedding_config or EmbeddingConfig(**EMBEDDING_PRESETS[embedding]).dict(exclude_none=True),
+        "tools": DEFAULT_TOOLS if tools is None else tools,
+        "system": system or DEFAULT_SYSTEM,
+        "memory": {
             "memory": {
                 "persona": {
                     "label": "persona",
-                    "value": "I am a helpful AI assistant.",
-                    "limit": 2000
+                    "value": persona or DEFAULT_PERSONA,
+                    "limit": BLOCK_LIMIT
                 },
                 "human": {
-                    "label": "human", 
-                    "value": "The human I am talking to.",
-                    "limit": 2000
+                    "label": "human",
+                    "value": human or DEFAULT_HUMAN,
+                    "limit": BLOCK_LIMIT
                 }
             }
         }
+    }
+
+def load_model_options(base_url):
+    """Return (llm configs, embedding configs) from the server catalog, or the presets"""
+    catalogs = []
+    for kind, fetch, config_class, presets in (
+        ("LLM", get_llm_models, LLMConfig, LLM_PRESETS),
+        ("embedding", get_embedding_models, EmbeddingConfig, EMBEDDING_PRESETS),
+    ):
+        try:
+            options = fetch(base_url)
+            problem = "lists no usable models"
+        except Exception as e:
+            options, problem = [], f"unavailable ({str(e)})"
+        # An empty catalog would leave nothing to choose from
+        if not options:
+            print(f"{Fore.YELLOW}{kind} model catalog {problem}, using built-in presets{Style.RESET_ALL}")
+            options = [config_class(**preset).dict(exclude_none=True) for preset in presets.values()]
+        catalogs.append(options)
+    return tuple(catalogs)
+
+def choose_config(kind, options):
+    """Let the user pick one config from a catalog list (defaults to the first)"""
+    label_key = "model" if kind == "LLM model" else "embedding_model"
+    print(f"\nSelect {kind}:")
+    for i, config in enumerate(options, 1):
+        print(f"{i}. {config[label_key]}")
+    choice = input(f"Enter choice (1-{len(options)}): ")
+    if choice.isdigit() and 1 <= int(choice) <= len(options):
+        return options[int(choice) - 1]
+    return options[0]
+
+def create_basic_agent(client, name, description=None):
+    """Create a basic agent with minimal configuration"""
+    try:
+        print(f"\n{Fore.YELLOW}Creating basic agent '{name}'...{Style.RESET_ALL}")
         
-        # Create minimal agent payload
-        agent_payload = {
-            "name": name,
-            "description": description,
-            "llm_config": llm_config,
-            "embedding_config": embedding_config,
-            "tools": ["send_message", "conversation_search"],
-            "system": "You are a helpful AI assistant.",
-            "memory": memory_config
-        }
+        # Default model, embedding, tools and memory blocks
+        agent_payload = build_agent_payload(name, description)
         
         # Create the agent directly with the payload
         response = requests.post(
@@ -95,6 +171,7 @@ def create_basic_agent(client, name, description=None):
         )
         
         if response.status_code == 200:
+            invalidate_agents()
             print(f"{Fore.GREEN}Agent created successfully!{Style.RESET_ALL}")
             return response.json()
         else:
@@ -110,60 +187,12 @@ def create_advanced_agent(client, name, description=None):
     try:
         print(f"\n{Fore.YELLOW}Creating advanced agent '{name}'...{Style.RESET_ALL}")
         
-        # Get LLM config
-        print("\nSelect LLM model:")
-        print("1. GPT-4")
-        print("2. Claude-3")
-        print("3. Letta-free")
-        
-        model_choice = input("Enter choice (1-3): ")
-        if model_choice == "1":
-            llm_config = LLMConfig(
-                model="gpt-4",
-                model_endpoint_type="openai",
-                model_endpoint="https://api.openai.com/v1",
-                context_window=8192,
-                put_inner_thoughts_in_kwargs=False
-            ).dict(exclude_none=True)
-        elif model_choice == "2":
-            llm_config = LLMConfig(
-                model="claude-3-opus-20240229",
-                model_endpoint_type="anthropic",
-                model_endpoint="https://api.anthropic.com/v1",
-                context_window=200000,
-                put_inner_thoughts_in_kwargs=True
-            ).dict(exclude_none=True)
-        else:
-            llm_config = LLMConfig(
-                model="letta-free",
-                model_endpoint_type="openai",
-                model_endpoint="https://inference.memgpt.ai",
-                context_window=16384,
-                put_inner_thoughts_in_kwargs=True
-            ).dict(exclude_none=True)
+        # Get LLM config from the server's catalog (cached in memory and on disk)
+        llm_options, embedding_options = load_model_options(client.base_url)
+        llm_config = choose_config("LLM model", llm_options)
             
         # Get embedding config
-        print("\nSelect embedding model:")
-        print("1. OpenAI")
-        print("2. Letta-free")
-        
-        embed_choice = input("Enter choice (1-2): ")
-        if embed_choice == "1":
-            embedding_config = EmbeddingConfig(
-                embedding_endpoint_type="openai",
-                embedding_endpoint="https://api.openai.com/v1",
-                embedding_model="text-embedding-ada-002",
-                embedding_dim=1536,
-                embedding_chunk_size=300
-            ).dict(exclude_none=True)
-        else:
-            embedding_config = EmbeddingConfig(
-                embedding_endpoint_type="hugging-face",
-                embedding_endpoint="https://embeddings.memgpt.ai",
-                embedding_model="letta-free",
-                embedding_dim=1024,
-                embedding_chunk_size=300
-            ).dict(exclude_none=True)
+        embedding_config = choose_config("embedding model", embedding_options)
             
         # Get tools
         print("\nSelect tools (comma-separated):")
@@ -179,48 +208,22 @@ def create_advanced_agent(client, name, description=None):
         tools = [t.strip() for t in tools_input.split(",") if t.strip()]
         
         # Validate tool names
-        valid_tools = {
-            "send_message",
-            "conversation_search",
-            "archival_memory_insert",
-            "archival_memory_search",
-            "core_memory_append",
-            "core_memory_replace"
-        }
-        
-        if not all(tool in valid_tools for tool in tools):
+        if not all(tool in VALID_TOOLS for tool in tools):
             raise ValueError("Invalid tool name(s). Please check spelling.")
         
         # Get system prompt
         print("\nEnter system prompt (or press Enter for default):")
-        system = input() or "You are a helpful AI assistant."
-        
-        # Create memory config with blocks
-        memory_config = {
-            "memory": {
-                "persona": {
-                    "label": "persona",
-                    "value": "I am a helpful AI assistant.",
-                    "limit": 2000
-                },
-                "human": {
-                    "label": "human", 
-                    "value": "The human I am talking to.",
-                    "limit": 2000
-                }
-            }
-        }
+        system = input() or DEFAULT_SYSTEM
         
         # Create agent payload
-        agent_payload = {
-            "name": name,
-            "description": description,
-            "llm_config": llm_config,
-            "embedding_config": embedding_config,
-            "tools": tools,
-            "system": system,
-            "memory": memory_config
-        }
+        agent_payload = build_agent_payload(
+            name,
+            description,
+            tools=tools,
+            system=system,
+            llm_config=llm_config,
+            embedding_config=embedding_config
+        )
         
         # Create the agent directly with the payload
         response = requests.post(
@@ -229,6 +232,7 @@ def create_advanced_agent(client, name, description=None):
         )
         
         if response.status_code == 200:
+            invalidate_agents()
             print(f"{Fore.GREEN}Agent created successfully!{Style.RESET_ALL}")
             return response.json()
         else:
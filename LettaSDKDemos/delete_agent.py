@@ -18,6 +18,8 @@ from letta import create_client
 from colorama import init, Fore, Style
 import requests
 from pathlib import Path
+from agent_cache import cache, list_agents, invalidate_agent
+from source_index import get_source_index
 
 # Initialize colorama
 init(autoreset=True)
@@ -28,6 +30,8 @@ def delete_agent(base_url, agent_id):
         response = requests.delete(f"{base_url}/v1/agents/{agent_id}")
         
         if response.status_code in [200, 204]:
+            invalidate_agent(agent_id)
+            get_source_index(base_url).forget_agent(agent_id)
             print(f"{Fore.GREEN}Agent deleted successfully!{Style.RESET_ALL}")
             return True
         else:
@@ -47,8 +51,8 @@ def main():
     
     try:
         while True:
-            # List available agents
-            agents = client.list_agents()
+            # List available agents (cached, refreshed in the background)
+            agents = list_agents(client)
             
             if not agents:
                 print(f"{Fore.YELLOW}No agents found.{Style.RESET_ALL}")
@@ -90,6 +94,7 @@ def main():
     except Exception as e:
         print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
         
+    print(f"\nAgent cache: {cache.describe_stats()}")
     print("\nGoodbye!")
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+"""
+This module is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/job_tracker.py
+
+Follows server-side jobs (file ingestion after an upload) to completion.
+
+Uploading a file only queues a job; parsing, chunking and embedding happen
+afterwards on the server. A JobTracker polls GET /v1/jobs/{id} for any
+number of outstanding jobs from one background thread. Each job is polled
+quickly at first and then less and less often while its status doesn't
+change (adaptive backoff), and the interval resets as soon as it does.
+
+Every status change is pushed to the registered listeners as an event:
+    {'type': 'status' | 'completed' | 'failed' | 'error', 'job_id', 'label',
+     'status', 'elapsed', 'stages', 'metadata', 'error'}
+`stages` is how long the job spent in each stage, in seconds: 'upload'
+(when the caller passes it), then every server status the job was seen in
+('created', 'pending', 'running', ...). That shows whether the time goes
+into the upload, into waiting for a worker, or into the ingestion itself.
+
+Related scripts:
+- source_upload.py: --wait follows the jobs of an upload
+- manage_data_sources.py: Menu option 7 waits for ingestion
+
+Usage:
+   from job_tracker import JobTracker
+   tracker = JobTracker(base_url, on_event=print)
+   tracker.track(job_id, label="notes.txt", upload_seconds=3.2)
+   tracker.wait()
+"""
+
+import logging
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+MIN_POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 10.0
+BACKOFF_FACTOR = 1.5
+MAX_POLL_ERRORS = 5
+REQUEST_TIMEOUT = 10
+
+FINAL_STATUSES = {'completed': 'completed', 'failed': 'failed'}
+
+class _TrackedJob:
+    __slots__ = ('job_id', 'label', 'status', 'stages', 'started', 'entered', 'interval',
+                 'next_poll', 'errors', 'metadata', 'done')
+
+    def __init__(self, job_id, label, upload_seconds):
+        now = time.monotonic()
+        self.job_id = job_id
+        self.label = label
+        self.status = None
+        self.stages = {'upload': round(upload_seconds, 3)} if upload_seconds is not None else {}
+        self.started = now
+        self.entered = now
+        self.interval = MIN_POLL_INTERVAL
+        self.next_poll = now
+        self.errors = 0
+        self.metadata = {}
+        self.done = False
+
+class JobTracker:
+    """Polls many jobs from one thread and emits events on every change"""
+
+    def __init__(self, base_url, on_event=None, headers=None,
+                 min_interval=MIN_POLL_INTERVAL, max_interval=MAX_POLL_INTERVAL):
+        self.base_url = base_url
+        self.headers = headers or {}
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.listeners = [on_event] if on_event else []
+        self.jobs = {}
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._thread = None
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def track(self, job_id, label=None, upload_seconds=None):
+        """Start following a job; a job already followed is left alone"""
+        with self._lock:
+            if job_id not in self.jobs:
+                self.jobs[job_id] = _TrackedJob(job_id, label or job_id, upload_seconds)
+            self._ensure_thread()
+            self._changed.notify_all()
+
+    def wait(self, job_ids=None, timeout=None):
+        """Block until the given (default: all) jobs finished; returns True if they did"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            while True:
+                ids = job_ids if job_ids is not None else list(self.jobs)
+                if all(self.jobs[job_id].done for job_id in ids if job_id in self.jobs):
+                    return True
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+
+    def summary(self, job_id):
+        """Current status and stage timings of a tracked job"""
+        with self._lock:
+            return self._event(self.jobs[job_id], 'status')
+
+    def _ensure_thread(self):
+        # Caller holds self._lock
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='job-tracker', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                pending = [job for job in self.jobs.values() if not job.done]
+                if not pending:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                due = [job for job in pending if job.next_poll <= now]
+                if not due:
+                    self._changed.wait(min(job.next_poll for job in pending) - now)
+                    continue
+            for job in due:
+                self._poll(job)
+
+    def _fetch(self, job_id):
+        response = self.session.get(
+            f"{self.base_url}/v1/jobs/{job_id}", headers=self.headers, timeout=REQUEST_TIMEOUT
+        )
+        if response.status_code != 200:
+            raise ValueError(f"Server returned {response.status_code} for job {job_id}")
+        return response.json()
+
+    def _poll(self, job):
+        try:
+            data = self._fetch(job.job_id)
+        except Exception as e:
+            with self._lock:
+                job.errors += 1
+                lost = job.errors >= MAX_POLL_ERRORS
+                job.done = lost
+                job.interval = min(job.interval * BACKOFF_FACTOR, self.max_interval)
+                job.next_poll = time.monotonic() + job.interval
+                # Give up on a job the server keeps failing to report
+                event = self._event(job, 'failed' if lost else 'error', error=str(e))
+                self._changed.notify_all()
+            logger.warning(f"Polling job {job.job_id} failed ({job.errors}x): {str(e)}")
+            self._emit(event)
+            return
+
+        status = data.get('status')
+        with self._lock:
+            job.errors = 0
+            job.metadata = data.get('metadata_') or data.get('metadata') or {}
+            now = time.monotonic()
+            if status == job.status:
+                # Nothing new: back off
+                job.interval = min(job.interval * BACKOFF_FACTOR, self.max_interval)
+                job.next_poll = now + job.interval
+                return
+            self._close_stage(job, now)
+            job.status = status
+            job.interval = self.min_interval
+            job.next_poll = now + job.interval
+            event_type = FINAL_STATUSES.get(status, 'status')
+            job.done = event_type != 'status'
+            event = self._event(job, event_type)
+            self._changed.notify_all()
+        self._emit(event)
+
+    def _close_stage(self, job, now):
+        # Caller holds self._lock; adds the time since the last change to the current stage
+        if job.status is not None:
+            job.stages[job.status] = round(job.stages.get(job.status, 0) + now - job.entered, 3)
+        job.entered = now
+
+    def _event(self, job, event_type, error=None):
+        # Caller holds self._lock
+        return {
+            'type': event_type,
+            'job_id': job.job_id,
+            'label': job.label,
+            'status': job.status,
+            'elapsed': round(time.monotonic() - job.started + job.stages.get('upload', 0), 3),
+            'stages': dict(job.stages),
+            'metadata': dict(job.metadata),
+            'error': error,
+        }
+
+    def _emit(self, event):
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Job event listener failed: {str(e)}")
+
+def describe_event(event):
+    """One line for CLI output"""
+    if event['error']:
+        gave_up = ", giving up" if event['type'] == 'failed' else ""
+        return f"{event['label']}: could not check status ({event['error']}){gave_up}"
+    stages = ', '.join(f"{stage} {seconds:.1f}s" for stage, seconds in event['stages'].items())
+    line = f"{event['label']}: {event['status']}"
+    if event['type'] == 'completed':
+        passages = event['metadata'].get('num_passages')
+        if passages is not None:
+            line += f", {passages} passages"
+        line += f" after {event['elapsed']:.1f}s"
+    return f"{line} ({stages})" if stages else line
@@ -23,34 +23,41 @@ from letta import create_client
 from colorama import init, Fore, Style
 import requests
 from pathlib import Path
+from agent_cache import cache, list_agents, invalidate_agent
 
 # Initialize colorama
 init(autoreset=True)
 
+def fetch_agent_tools(base_url, agent_id):
+    """Fetch an agent's tools from the server, raising on HTTP errors"""
+    response = requests.get(f"{base_url}/v1/agents/{agent_id}/tools")
+    if response.status_code != 200:
+        raise ValueError(f"Server returned {response.status_code}")
+    return response.json()
+
 def list_agent_tools(base_url, agent_id):
     """List all tools attached to an agent"""
     try:
-        response = requests.get(f"{base_url}/v1/agents/{agent_id}/tools")
+        # Cached per agent; add/remove below invalidate the entry
+        tools = cache.get(
+            ('agent_tools', agent_id),
+            lambda: fetch_agent_tools(base_url, agent_id)
+        )
         
-        if response.status_code == 200:
-            tools = response.json()
-            if tools:
-                print(f"\n{Fore.BLUE}Found {len(tools)} tools:{Style.RESET_ALL}")
-                for i, tool in enumerate(tools, 1):
-                    print(f"\n{Fore.YELLOW}Tool {i}:{Style.RESET_ALL}")
-                    print(f"{Fore.GREEN}ID: {Style.RESET_ALL}{tool.get('id')}")
-                    print(f"{Fore.GREEN}Name: {Style.RESET_ALL}{tool.get('name')}")
-                    print(f"{Fore.GREEN}Type: {Style.RESET_ALL}{tool.get('type')}")
-                    if 'configuration' in tool:
-                        print(f"{Fore.GREEN}Configuration:{Style.RESET_ALL}")
-                        for key, value in tool['configuration'].items():
-                            print(f"  - {key}: {value}")
-            else:
-                print(f"{Fore.YELLOW}No tools found for this agent{Style.RESET_ALL}")
-            return tools
+        if tools:
+            print(f"\n{Fore.BLUE}Found {len(tools)} tools:{Style.RESET_ALL}")
+            for i, tool in enumerate(tools, 1):
+                print(f"\n{Fore.YELLOW}Tool {i}:{Style.RESET_ALL}")
+                print(f"{Fore.GREEN}ID: {Style.RESET_ALL}{tool.get('id')}")
+                print(f"{Fore.GREEN}Name: {Style.RESET_ALL}{tool.get('name')}")
+                print(f"{Fore.GREEN}Type: {Style.RESET_ALL}{tool.get('type')}")
+                if 'configuration' in tool:
+                    print(f"{Fore.GREEN}Configuration:{Style.RESET_ALL}")
+                    for key, value in tool['configuration'].items():
+                        print(f"  - {key}: {value}")
         else:
-            print(f"{Fore.RED}Error: Server returned {response.status_code}{Style.RESET_ALL}")
-            return []
+            print(f"{Fore.YELLOW}No tools found for this agent{Style.RESET_ALL}")
+        return tools
             
     except Exception as e:
         print(f"{Fore.RED}Error listing tools: {str(e)}{Style.RESET_ALL}")
@@ -78,6 +85,7 @@ def add_tool_to_agent(base_url, agent_id, tool_name):
                 agent_id=agent_id,
                 tools=current_tools
             )
+            invalidate_agent(agent_id)
             
             print(f"{Fore.GREEN}Tool added successfully!{Style.RESET_ALL}")
             return True
@@ -111,6 +119,7 @@ def remove_tool_from_agent(base_url, agent_id, tool_name):
                 agent_id=agent_id,
                 tools=current_tools
             )
+            invalidate_agent(agent_id)
             
             print(f"{Fore.GREEN}Tool '{tool_name}' removed successfully!{Style.RESET_ALL}")
             return True
@@ -142,7 +151,7 @@ def main():
                 # List agent tools
                 try:
                     # Get agents
-                    agents = client.list_agents()
+                    agents = list_agents(client)
                     print("\nAvailable agents:")
                     for i, agent in enumerate(agents, 1):
                         print(f"{i}. {agent.name} (ID: {agent.id})")
@@ -164,7 +173,7 @@ def main():
                 # Add tool to agent
                 try:
                     # Get agents
-                    agents = client.list_agents()
+                    agents = list_agents(client)
                     print("\nAvailable agents:")
                     for i, agent in enumerate(agents, 1):
                         print(f"{i}. {agent.name} (ID: {agent.id})")
@@ -188,7 +197,7 @@ def main():
                 # Remove tool from agent
                 try:
                     # Get agents
-                    agents = client.list_agents()
+                    agents = list_agents(client)
                     print("\nAvailable agents:")
                     for i, agent in enumerate(agents, 1):
                         print(f"{i}. {agent.name} (ID: {agent.id})")
@@ -219,6 +228,7 @@ def main():
                     print(f"{Fore.RED}Error removing tool: {str(e)}{Style.RESET_ALL}")
             
             elif choice == "4":
+                print(f"\nAgent cache: {cache.describe_stats()}")
                 print("\nExiting...")
                 break
                 
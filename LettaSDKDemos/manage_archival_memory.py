@@ -7,12 +7,21 @@ This script demonstrates how to manage an agent's archival memory.
 Related scripts:
 - manage_data_sources.py: For managing data sources
 - update_core_memory.py: For managing core memory
+- archival_ingest.py: For loading whole documents into archival memory
+- archival_store.py: Cursor-paged reading of the full archival memory
+- bulk_archival.py: Bulk insert/delete from JSONL files
+- archival_index.py: Local similarity search over a mirror of the passages
+- archival_export.py: Snapshot files for moving archival memory between agents
+- archival_dedup.py: Duplicate detection used when adding memories
 
 Memory Operations:
 1. List all memories
 2. View specific memory details
-3. Add new memories
-4. Delete memories
+3. Add new memories (warns if the memory duplicates an existing one)
+4. Delete memories (several IDs at once are deleted concurrently)
+5. Bulk load memories from a JSONL file
+6. Export all memories to a snapshot file
+7. Import a snapshot file
 
 Note: Archival memories are stored with unique IDs in the format 'passage-xxxx'.
 These IDs must be used when viewing or deleting specific memories.
@@ -21,6 +30,10 @@ These IDs must be used when viewing or deleting specific memories.
 from letta import create_client
 from colorama import init, Fore, Style
 from pathlib import Path
+import time
+from archival_store import iter_passage_pages, find_passage, insert_passages, delete_passages, read_jsonl, BulkCheckpoint
+from archival_export import export_archival, import_archival, default_checkpoint_path
+from archival_dedup import DedupIndex, load_synced
 
 # Initialize colorama
 init(autoreset=True)
@@ -32,10 +45,10 @@ def display_memory(memory, title="Memory Contents"):
     print(f"{Fore.GREEN}Content: {Style.RESET_ALL}{memory.text}")
     print(f"{Fore.GREEN}Created At: {Style.RESET_ALL}{memory.created_at}")
 
-def display_memory_list(memories):
+def display_memory_list(memories, start=1):
     """Display a list of memories with nice formatting"""
     print(f"\n{Fore.BLUE}Found {len(memories)} memories:{Style.RESET_ALL}")
-    for i, memory in enumerate(memories, 1):
+    for i, memory in enumerate(memories, start):
         print(f"\n{Fore.YELLOW}Memory {i}:{Style.RESET_ALL}")
         print(f"{Fore.GREEN}ID: {Style.RESET_ALL}{memory.id}")
         print(f"{Fore.GREEN}Content: {Style.RESET_ALL}{memory.text[:100]}...")
@@ -65,6 +78,11 @@ def main():
                 print("Please enter a valid number.")
         
         selected_agent = agents[selection]
+        # Duplicate index, loaded the first time a memory is added or deleted.
+        # A saved index is used as is, so adding a memory stays a single request;
+        # adds and deletes made here are saved into it, bulk loads and the
+        # duplicate report resync it. An agent without one is synced once.
+        dedup = None
         
         while True:
             # Display menu
@@ -73,22 +91,30 @@ def main():
             print("2. View specific memory")
             print("3. Add new memory")
             print("4. Delete memory")
-            print("5. Exit")
+            print("5. Bulk load from JSONL file")
+            print("6. Export to snapshot file")
+            print("7. Import snapshot file")
+            print("8. Exit")
             
-            choice = input("\nEnter your choice (1-5): ")
+            choice = input("\nEnter your choice (1-8): ")
             
             if choice == "1":
-                # List all memories
+                # List all memories, one page at a time (the next page is fetched in the background)
                 print("\nRetrieving archival memories...")
-                memories = client.get_archival_memory(agent_id=selected_agent.id, limit=50)
-                display_memory_list(memories)
+                shown = 0
+                for memories in iter_passage_pages(client, selected_agent.id, page_size=50):
+                    display_memory_list(memories, start=shown + 1)
+                    shown += len(memories)
+                    if len(memories) < 50 or input("\nPress Enter for more, 'q' to stop: ").lower() == 'q':
+                        break
+                if not shown:
+                    print(f"{Fore.YELLOW}No archival memories{Style.RESET_ALL}")
                 
             elif choice == "2":
                 # View specific memory
                 memory_id = input("\nEnter full memory ID (e.g. passage-xxxx): ")
                 try:
-                    memories = client.get_archival_memory(agent_id=selected_agent.id, limit=50)
-                    memory = next((m for m in memories if m.id == memory_id), None)
+                    memory = find_passage(client, selected_agent.id, memory_id)
                     if memory:
                         display_memory(memory)
                     else:
@@ -100,22 +126,56 @@ def main():
                 # Add new memory
                 content = input("\nEnter memory content: ")
                 try:
+                    if dedup is None or dedup.synced_at is None:
+                        index = DedupIndex.load(selected_agent.id)
+                        if index.synced_at is None:
+                            print("Indexing existing memories for the duplicate check...")
+                            index.sync(client)
+                        else:
+                            print(f"Duplicate check uses the index synced "
+                                  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(index.synced_at))} "
+                                  f"(option 5 resyncs it)")
+                        dedup = index
+                    match = dedup.check(content)
+                    if match:
+                        kind, passage_id, score = match
+                        print(f"{Fore.YELLOW}{kind.capitalize()} duplicate of {passage_id} "
+                              f"(similarity {score:.2f}){Style.RESET_ALL}")
+                        if input("Add anyway? (y/N): ").lower() != 'y':
+                            continue
+                    elif not len(dedup):
+                        print(f"{Fore.YELLOW}No memories indexed, so nothing to check for duplicates{Style.RESET_ALL}")
                     # Use memory parameter
-                    client.insert_archival_memory(
+                    passages = client.insert_archival_memory(
                         agent_id=selected_agent.id,
                         memory=content
                     )
+                    for passage in passages or []:
+                        dedup.add(passage.id, passage.text)
+                    dedup.save()
                     print(f"{Fore.GREEN}Memory added successfully!{Style.RESET_ALL}")
                 except Exception as e:
                     print(f"{Fore.RED}Error adding memory: {str(e)}{Style.RESET_ALL}")
                 
             elif choice == "4":
                 # Delete memory
-                memory_id = input("\nEnter full memory ID (e.g. passage-xxxx): ")
+                memory_ids = input("\nEnter full memory ID(s) (e.g. passage-xxxx, separate several with spaces): ").split()
+                if dedup is None:
+                    dedup = DedupIndex.load(selected_agent.id)
+                if len(memory_ids) > 1:
+                    # Several IDs: delete them concurrently; IDs that don't exist count as deleted
+                    summary = delete_passages(client.base_url, selected_agent.id, memory_ids,
+                                              on_deleted=dedup.remove)
+                    dedup.save()
+                    print(f"{Fore.GREEN}Deleted {summary['deleted']} memories "
+                          f"({summary['per_second']:.1f}/sec){Style.RESET_ALL}")
+                    for error in summary['errors']:
+                        print(f"{Fore.RED}Error deleting memory: {error}{Style.RESET_ALL}")
+                    continue
+                memory_id = memory_ids[0] if memory_ids else ""
                 try:
                     # First verify the memory exists
-                    memories = client.get_archival_memory(agent_id=selected_agent.id, limit=50)
-                    if not any(m.id == memory_id for m in memories):
+                    if find_passage(client, selected_agent.id, memory_id) is None:
                         print(f"{Fore.RED}Error: Memory not found{Style.RESET_ALL}")
                         continue
                         
@@ -123,11 +183,68 @@ def main():
                         agent_id=selected_agent.id,
                         memory_id=memory_id
                     )
+                    dedup.remove(memory_id)
+                    dedup.save()
                     print(f"{Fore.GREEN}Memory deleted successfully!{Style.RESET_ALL}")
                 except Exception as e:
                     print(f"{Fore.RED}Error deleting memory: {str(e)}{Style.RESET_ALL}")
                 
             elif choice == "5":
+                # Bulk load: one {"text": ...} object or string per line
+                path = input("\nEnter path to JSONL file: ").strip()
+                if not Path(path).is_file():
+                    print(f"{Fore.RED}Error: File not found{Style.RESET_ALL}")
+                    continue
+                try:
+                    def on_progress(inserted, failed, rate):
+                        if (inserted + failed) % 100 == 0:
+                            print(f"Inserted {inserted} ({failed} failed), {rate:.1f} passages/sec")
+
+                    # Lines that duplicate an existing memory or an earlier line are skipped
+                    summary = insert_passages(client.base_url, selected_agent.id, read_jsonl(path, 'text'),
+                                              on_progress=on_progress, dedup=load_synced(client, selected_agent.id))
+                    dedup = None
+                    print(f"{Fore.GREEN}Inserted {summary['inserted']} memories in {summary['elapsed']:.1f}s "
+                          f"({summary['per_second']:.1f}/sec, {summary['duplicates']} duplicates skipped){Style.RESET_ALL}")
+                    for error in summary['errors']:
+                        print(f"{Fore.RED}Error adding memory: {error}{Style.RESET_ALL}")
+                except Exception as e:
+                    print(f"{Fore.RED}Error loading file: {str(e)}{Style.RESET_ALL}")
+                
+            elif choice == "6":
+                # Export: streamed page by page into a compressed .lam file
+                path = input("\nEnter path for the snapshot file (e.g. memory.lam): ").strip()
+                try:
+                    summary = export_archival(client, selected_agent.id, path)
+                    print(f"{Fore.GREEN}Exported {summary['passages']} memories to {path} "
+                          f"({summary['bytes'] / 1024 / 1024:.1f} MB){Style.RESET_ALL}")
+                except Exception as e:
+                    print(f"{Fore.RED}Error exporting memories: {str(e)}{Style.RESET_ALL}")
+                
+            elif choice == "7":
+                # Import: the snapshot's passages are inserted concurrently, checkpointed
+                # per agent as archival_export.py does, so a re-run resumes instead of repeating
+                path = input("\nEnter path to snapshot file: ").strip()
+                if not Path(path).is_file():
+                    print(f"{Fore.RED}Error: File not found{Style.RESET_ALL}")
+                    continue
+                try:
+                    checkpoint = BulkCheckpoint(default_checkpoint_path(path, selected_agent.id))
+                    if checkpoint.done_below or checkpoint.done:
+                        print(f"{Fore.YELLOW}Resuming: {checkpoint.done_below + len(checkpoint.done)} memories "
+                              f"already imported according to {checkpoint.path}{Style.RESET_ALL}")
+                    summary = import_archival(client.base_url, selected_agent.id, path, checkpoint=checkpoint)
+                    print(f"{Fore.GREEN}Imported {summary['inserted']} memories in {summary['elapsed']:.1f}s "
+                          f"({summary['per_second']:.1f}/sec, {summary['skipped']} already imported){Style.RESET_ALL}")
+                    for error in summary['errors']:
+                        print(f"{Fore.RED}Error adding memory: {error}{Style.RESET_ALL}")
+                    if summary['failed']:
+                        print(f"{Fore.YELLOW}Import the same file again to retry the failed memories; "
+                              f"the ones already imported are skipped{Style.RESET_ALL}")
+                except Exception as e:
+                    print(f"{Fore.RED}Error importing memories: {str(e)}{Style.RESET_ALL}")
+                
+            elif choice == "8":
                 print("\nExiting...")
                 break
                 
@@ -7,6 +7,10 @@ This script demonstrates how to manage data sources and their files.
 Related scripts:
 - manage_archival_memory.py: For managing archival memories
 - manage_embedding_models.py: For managing embedding models
+- source_index.py: Source <-> agent index behind "View attached agents"
+- source_upload.py: Streamed, resumable uploads for large files
+- job_tracker.py: Waits for the server to process uploaded files
+- source_sync.py: Incremental directory sync behind the sync command
 
 Key Features:
 1. Source Management:
@@ -24,14 +28,25 @@ Key Features:
    - Attach sources to agents
    - Detach sources from agents
    - View attached agents
+
+4. Directory Sync (command line):
+   python manage_data_sources.py sync <dir> <source name or id> [--dry-run] [--keep-deleted]
+   Uploads only new or changed files and deletes files removed from the directory
 """
 
 from letta import create_client, RESTClient
 from colorama import init, Fore, Style
+import argparse
 import json
 import requests
 import os
+import sys
 from pathlib import Path
+from agent_cache import cache
+from source_index import get_source_index
+from source_upload import UploadCheckpoint, ProgressPrinter, upload_file, track_upload_jobs
+from job_tracker import JobTracker, describe_event
+from source_sync import sync_directory
 
 # Initialize colorama
 init(autoreset=True)
@@ -49,24 +64,9 @@ def display_source(source, title="Source Details"):
         print(f"{Fore.RED}Error displaying source: {str(e)}{Style.RESET_ALL}")
 
 def get_attached_agents(base_url, source_id):
-    """Get list of agents attached to a source using raw requests"""
+    """Get list of agents attached to a source from the source index"""
     try:
-        # Get all agents
-        response = requests.get(f"{base_url}/v1/agents/")
-        if response.status_code != 200:
-            print(f"{Fore.RED}Error getting agents: {response.status_code}{Style.RESET_ALL}")
-            return []
-            
-        agents = response.json()
-        attached_agents = []
-        
-        # Check each agent's sources
-        for agent in agents:
-            response = requests.get(f"{base_url}/v1/agents/{agent['id']}/sources")
-            if response.status_code == 200:
-                agent_sources = response.json()
-                if any(s['id'] == source_id for s in agent_sources):
-                    attached_agents.append(agent)
+        attached_agents = get_source_index(base_url).agents_for_source(source_id)
         
         if attached_agents:
             print(f"\n{Fore.YELLOW}Attached Agents:{Style.RESET_ALL}")
@@ -80,41 +80,49 @@ def get_attached_agents(base_url, source_id):
         print(f"{Fore.RED}Error listing attached agents: {str(e)}{Style.RESET_ALL}")
         return []
 
-def upload_file_to_source(base_url, source_id, file_path):
-    """Upload a file to a source"""
+def upload_file_to_source(base_url, source_id, file_path, wait=True):
+    """Upload a file to a source, streamed and resumable (see source_upload.py)"""
     try:
         # First verify the file exists
         if not os.path.exists(file_path):
             print(f"{Fore.RED}Error: File not found at {file_path}{Style.RESET_ALL}")
             return False
             
-        # Try direct file upload using requests
-        print(f"\n{Fore.YELLOW}Uploading file...{Style.RESET_ALL}")
+        # An unfinished earlier upload of the same file picks up where it stopped;
+        # a finished one is uploaded again since that's what was asked for
+        checkpoint = UploadCheckpoint()
+        entry = checkpoint.get(source_id, file_path)
+        resume = entry is not None and not entry['done']
+        if resume:
+            print(f"\n{Fore.YELLOW}Resuming previous upload ({len(entry['jobs'])} of {len(entry['parts'])} parts done)...{Style.RESET_ALL}")
+        else:
+            print(f"\n{Fore.YELLOW}Uploading file...{Style.RESET_ALL}")
         
-        # Open file in binary mode
-        with open(file_path, 'rb') as file:
-            files = {'file': file}
-            
-            # Make the request to the correct endpoint
-            response = requests.post(
-                f"{base_url}/v1/sources/{source_id}/upload",
-                files=files
-            )
-            
-            if response.status_code == 200:
-                print(f"{Fore.GREEN}File uploaded successfully!{Style.RESET_ALL}")
-                job = response.json()
-                if 'id' in job:
-                    print(f"Job ID: {job['id']}")
-                return True
-            else:
-                print(f"{Fore.RED}Upload failed - Server returned {response.status_code}{Style.RESET_ALL}")
-                if response.text:
-                    print(f"Error: {response.text}")
-                return False
+        result = upload_file(
+            base_url,
+            source_id,
+            file_path,
+            checkpoint=checkpoint,
+            resume=resume,
+            on_progress=ProgressPrinter()
+        )
+        print(f"{Fore.GREEN}File uploaded successfully!{Style.RESET_ALL}")
+        for job_id in result['jobs']:
+            print(f"Job ID: {job_id}")
+
+        if wait:
+            print(f"\n{Fore.YELLOW}Processing file (Ctrl+C to stop waiting)...{Style.RESET_ALL}")
+            tracker = JobTracker(base_url, on_event=lambda event: print(describe_event(event)))
+            track_upload_jobs(tracker, result)
+            try:
+                tracker.wait()
+            except KeyboardInterrupt:
+                print(f"\n{Fore.YELLOW}Stopped waiting; processing continues on the server{Style.RESET_ALL}")
+        return True
             
     except Exception as e:
         print(f"{Fore.RED}Error uploading file: {str(e)}{Style.RESET_ALL}")
+        print("Choose the same file again to resume the upload.")
         return False
 
 def list_files_in_source(base_url, source_id):
@@ -166,7 +174,79 @@ def delete_file_from_source(base_url, source_id, file_id):
         print(f"{Fore.RED}Error deleting file: {str(e)}{Style.RESET_ALL}")
         return False
 
+def find_source(base_url, name_or_id):
+    """Return the source with this id or name, or None"""
+    response = requests.get(f"{base_url}/v1/sources/")
+    if response.status_code != 200:
+        raise ValueError(f"Server returned {response.status_code}")
+    return next((source for source in response.json() if name_or_id in (source['id'], source['name'])), None)
+
+def print_sync_event(kind, relpath, detail=None):
+    """Print one file touched by a sync"""
+    if kind == 'upload':
+        print(f"{Fore.GREEN}Uploaded {relpath}{Style.RESET_ALL}")
+    elif kind == 'delete':
+        print(f"{Fore.YELLOW}Deleted {relpath}{Style.RESET_ALL}")
+    elif kind == 'job':
+        if detail['type'] != 'status':
+            print(describe_event(detail))
+    else:
+        print(f"{Fore.RED}Error with {relpath}: {detail}{Style.RESET_ALL}")
+
+def run_sync(argv):
+    """python manage_data_sources.py sync <dir> <source> [options]"""
+    parser = argparse.ArgumentParser(prog="manage_data_sources.py sync",
+                                     description="Sync a directory into a data source")
+    parser.add_argument("directory", help="Directory to sync")
+    parser.add_argument("source", help="Source name or id")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would change")
+    parser.add_argument("--keep-deleted", action="store_true", help="Don't delete files removed locally")
+    parser.add_argument("--workers", type=int, default=2, help="Files uploaded at the same time")
+    args = parser.parse_args(argv)
+
+    base_url = "http://localhost:8283"
+    try:
+        if not os.path.isdir(args.directory):
+            print(f"{Fore.RED}Error: Directory not found at {args.directory}{Style.RESET_ALL}")
+            return
+        source = find_source(base_url, args.source)
+        if source is None:
+            print(f"{Fore.RED}Error: No source named or with id '{args.source}'{Style.RESET_ALL}")
+            return
+
+        print(f"\n{Fore.BLUE}Syncing {args.directory} into {source['name']}...{Style.RESET_ALL}")
+        summary = sync_directory(
+            base_url,
+            source['id'],
+            args.directory,
+            delete=not args.keep_deleted,
+            dry_run=args.dry_run,
+            workers=args.workers,
+            on_event=print_sync_event
+        )
+
+        if args.dry_run:
+            for relpath in summary['to_upload']:
+                print(f"Would upload {relpath}")
+            for relpath in summary['to_delete']:
+                print(f"Would delete {relpath}")
+        print(f"\n{Fore.BLUE}Sync Summary:{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}Uploaded: {Style.RESET_ALL}{summary['uploaded'] if not args.dry_run else len(summary['to_upload'])}")
+        print(f"{Fore.GREEN}Deleted: {Style.RESET_ALL}{summary['deleted'] if not args.dry_run else len(summary['to_delete'])}")
+        print(f"{Fore.GREEN}Unchanged: {Style.RESET_ALL}{summary['unchanged']}")
+        print(f"{Fore.GREEN}Failed: {Style.RESET_ALL}{summary['failed']}")
+        print(f"{Fore.GREEN}Time: {Style.RESET_ALL}{summary['elapsed']:.1f}s")
+
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}Sync interrupted; run it again to finish{Style.RESET_ALL}")
+    except Exception as e:
+        print(f"{Fore.RED}Error syncing directory: {str(e)}{Style.RESET_ALL}")
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "sync":
+        run_sync(sys.argv[2:])
+        return
+
     # Connect to the Letta server
     base_url = "http://localhost:8283"
     client = create_client(base_url=base_url)
@@ -239,6 +319,8 @@ def main():
                         if confirm.lower() == 'y':
                             response = requests.delete(f"{base_url}/v1/sources/{source['id']}")
                             if response.status_code == 200:
+                                get_source_index(base_url).forget_source(source['id'])
+                                cache.invalidate_resource('agent_sources')
                                 print(f"{Fore.GREEN}Source deleted successfully!{Style.RESET_ALL}")
                             else:
                                 print(f"{Fore.RED}Error: Server returned {response.status_code}{Style.RESET_ALL}")
@@ -309,6 +391,8 @@ def main():
                             params={"agent_id": agents[agent_sel]['id']}
                         )
                         if response.status_code == 200:
+                            get_source_index(base_url).record_attach(sources[source_sel]['id'], agents[agent_sel])
+                            cache.invalidate(('agent_sources', agents[agent_sel]['id']))
                             print(f"{Fore.GREEN}Source attached successfully!{Style.RESET_ALL}")
                         else:
                             print(f"{Fore.RED}Error: Server returned {response.status_code}{Style.RESET_ALL}")
@@ -352,23 +436,22 @@ def main():
                     agent_sel = int(input("Enter number of agent: ")) - 1
                     
                     if 0 <= source_sel < len(sources) and 0 <= agent_sel < len(agents):
-                        # First verify the source is attached
-                        response = requests.get(f"{base_url}/v1/agents/{agents[agent_sel]['id']}/sources")
-                        if response.status_code != 200:
-                            print(f"{Fore.RED}Error: Server returned {response.status_code}{Style.RESET_ALL}")
-                            continue
-                            
-                        agent_sources = response.json()
-                        if not any(s['id'] == sources[source_sel]['id'] for s in agent_sources):
+                        # First verify the source is attached: one request for this agent's
+                        # sources, which also updates the shared index if it is built
+                        index = get_source_index(base_url)
+                        source_id, agent_id = sources[source_sel]['id'], agents[agent_sel]['id']
+                        if source_id not in index.refresh_agent(agent_id):
                             print(f"{Fore.RED}Error: Source not attached to agent{Style.RESET_ALL}")
                             continue
                         
                         # Try POST to /detach endpoint instead of DELETE
                         response = requests.post(
-                            f"{base_url}/v1/sources/{sources[source_sel]['id']}/detach",
-                            params={"agent_id": agents[agent_sel]['id']}
+                            f"{base_url}/v1/sources/{source_id}/detach",
+                            params={"agent_id": agent_id}
                         )
                         if response.status_code == 200:
+                            index.record_detach(source_id, agent_id)
+                            cache.invalidate(('agent_sources', agent_id))
                             print(f"{Fore.GREEN}Source detached successfully!{Style.RESET_ALL}")
                         else:
                             print(f"{Fore.RED}Error: Server returned {response.status_code}{Style.RESET_ALL}")
@@ -7,6 +7,7 @@ This script demonstrates how to manage and update embedding models for agents.
 Related scripts:
 - create_agent.py: For creating agents with specific embedding models
 - manage_data_sources.py: For managing data sources that use embeddings
+- model_catalog.py: Cached list of the embedding models the server offers
 
 Available Models:
 1. Letta-free:
@@ -25,8 +26,9 @@ Available Models:
 
 from letta import create_client, EmbeddingConfig
 from colorama import init, Fore, Style
-import requests
 from pathlib import Path
+from agent_cache import list_agents, invalidate_agent
+from model_catalog import get_embedding_models
 
 # Initialize colorama
 init(autoreset=True)
@@ -41,19 +43,14 @@ def display_embedding_config(config, title="Embedding Configuration"):
     print(f"{Fore.GREEN}Chunk Size: {Style.RESET_ALL}{config.embedding_chunk_size}")
 
 def list_available_models(base_url):
-    """List all available embedding models using direct API call"""
+    """List all available embedding models from the cached server catalog"""
     try:
-        response = requests.get(f"{base_url}/v1/models/embedding")
-        if response.status_code == 200:
-            models = response.json()
-            print(f"\n{Fore.BLUE}Available Embedding Models:{Style.RESET_ALL}")
-            for i, model in enumerate(models, 1):
-                print(f"\n{Fore.YELLOW}Model {i}:{Style.RESET_ALL}")
-                display_embedding_config(EmbeddingConfig(**model))
-            return models
-        else:
-            print(f"{Fore.RED}Error: Server returned {response.status_code}{Style.RESET_ALL}")
-            return []
+        models = get_embedding_models(base_url)
+        print(f"\n{Fore.BLUE}Available Embedding Models:{Style.RESET_ALL}")
+        for i, model in enumerate(models, 1):
+            print(f"\n{Fore.YELLOW}Model {i}:{Style.RESET_ALL}")
+            display_embedding_config(EmbeddingConfig(**model))
+        return models
     except Exception as e:
         print(f"{Fore.RED}Error listing models: {str(e)}{Style.RESET_ALL}")
         return []
@@ -65,6 +62,7 @@ def update_agent_embedding(client, agent_id, new_config):
             agent_id=agent_id,
             embedding_config=new_config
         )
+        invalidate_agent(agent_id)
         print(f"{Fore.GREEN}Embedding configuration updated successfully!{Style.RESET_ALL}")
         return updated_agent
     except Exception as e:
@@ -95,7 +93,7 @@ def main():
                 # View agent's current config
                 try:
                     # Get list of agents
-                    agents = client.list_agents()
+                    agents = list_agents(client)
                     print("\nAvailable agents:")
                     for i, agent in enumerate(agents, 1):
                         print(f"{i}. {agent.name} (ID: {agent.id})")
@@ -121,7 +119,7 @@ def main():
                 # Update agent's config
                 try:
                     # Get list of agents
-                    agents = client.list_agents()
+                    agents = list_agents(client)
                     print("\nAvailable agents:")
                     for i, agent in enumerate(agents, 1):
                         print(f"{i}. {agent.name} (ID: {agent.id})")
@@ -0,0 +1,53 @@
+"""
+This module is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/message_history.py
+
+Cursor-based paging through an agent's full message history.
+
+client.get_messages() returns the newest `limit` messages older than the
+`before` message id, newest first. These helpers hand pages back oldest
+first (display order) together with the cursor for the next older page, so
+callers can walk backward through any amount of history while only ever
+holding one page.
+
+Related scripts:
+- view_messages.py, view_colored_messages.py
+- message_model.py: Decodes the fetched messages for display
+
+Usage:
+   from message_history import get_message_page, iter_message_pages
+   messages, older = get_message_page(client, agent_id)            # latest page
+   messages, older = get_message_page(client, agent_id, before=older)
+   for page in iter_message_pages(client, agent_id):               # whole history
+       ...
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+def get_message_page(client, agent_id, before=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return (messages oldest first, cursor) for the page ending just before `before`.
+
+    The cursor is the id to pass as `before` for the next older page, or None
+    when this page reaches the start of the conversation.
+    """
+    limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+    messages = client.get_messages(agent_id=agent_id, before=before, limit=limit)
+    messages = sorted(messages, key=lambda message: message.created_at)
+    cursor = messages[0].id if len(messages) == limit else None
+    logger.debug(f"Fetched {len(messages)} messages for {agent_id} before {before}")
+    return messages, cursor
+
+def iter_message_pages(client, agent_id, page_size=DEFAULT_PAGE_SIZE, before=None):
+    """Yield pages (each oldest first) from the newest page back to the first message"""
+    while True:
+        messages, before = get_message_page(client, agent_id, before=before, limit=page_size)
+        if messages:
+            yield messages
+        if before is None:
+            return
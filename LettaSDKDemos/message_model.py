@@ -0,0 +1,176 @@
+"""
+This module is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/message_model.py
+
+A decoded, typed view of Letta messages, parsed once per message.
+
+A raw Message keeps its interesting parts as strings: a user message's
+text is a JSON payload ({"type", "message", "time"}), a tool message's
+text is a JSON result ({"status", "message", "time"}), and the agent's
+reply is a JSON argument string inside its send_message tool call.
+parse_message() decodes all of that into a ParsedMessage and memoizes it
+by message id, so re-rendering a page (or paging back and forth) does not
+run json.loads or role matching again. Messages are immutable once
+stored; an entry is still re-parsed if the text under its id changes.
+
+Related scripts:
+- view_colored_messages.py, view_messages.py: CLI viewers
+- components/chat_config_logic.py: Chat history entries in the desktop app
+
+Usage:
+   from message_model import Role, parse_message, parse_messages
+   for record in parse_messages(messages):
+       if record.role is Role.ASSISTANT and record.reply:
+           print(record.reply)
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+
+SEND_MESSAGE_TOOL = 'send_message'
+SEND_MESSAGE_KWARG = 'message'
+MAX_CACHED_MESSAGES = 10000
+
+class Role(str, Enum):
+    USER = 'user'
+    ASSISTANT = 'assistant'
+    TOOL = 'tool'
+    SYSTEM = 'system'
+    UNKNOWN = 'unknown'
+
+    @classmethod
+    def of(cls, raw):
+        """Role for a MessageRole, 'MessageRole.user' or 'user'"""
+        value = getattr(raw, 'value', None) or str(raw).replace("MessageRole.", "")
+        try:
+            return cls(value.lower())
+        except ValueError:
+            return cls.UNKNOWN
+
+@dataclass(frozen=True)
+class ToolCall:
+    id: str
+    name: str
+    arguments: str          # raw JSON string, as sent by the model
+    args: dict              # decoded arguments ({} if they aren't valid JSON)
+    decoded: bool = True    # False if the arguments aren't valid JSON
+
+@dataclass(frozen=True)
+class ParsedMessage:
+    id: str
+    role: Role
+    created_at: object      # datetime, or None
+    text: str               # raw text ('' if the message had none)
+    payload: dict           # decoded JSON text, or None
+    name: str = None        # tool messages: the tool that produced the result
+    tool_call_id: str = None
+    tool_calls: tuple = ()
+
+    # Fields of user messages' payload
+    @property
+    def user_type(self):
+        return self.payload.get('type') if self.payload else None
+
+    @property
+    def user_text(self):
+        return self.payload.get('message') if self.payload else None
+
+    @property
+    def local_time(self):
+        """The client-side time recorded in user and tool payloads"""
+        return self.payload.get('time') if self.payload else None
+
+    # Fields of tool results
+    @property
+    def tool_status(self):
+        return self.payload.get('status') if self.payload else None
+
+    @property
+    def tool_failed(self):
+        return self.tool_status == 'Failed'
+
+    @property
+    def tool_message(self):
+        return self.payload.get('message') if self.payload else None
+
+    # Assistant messages: the text is the inner monologue, send_message carries the reply
+    @property
+    def thought(self):
+        return self.text if self.role is Role.ASSISTANT else None
+
+    @property
+    def reply_call(self):
+        """The send_message tool call, or None"""
+        for call in self.tool_calls:
+            if call.name == SEND_MESSAGE_TOOL:
+                return call
+        return None
+
+    @property
+    def reply(self):
+        """The send_message text; None without a send_message call or if its arguments don't decode"""
+        call = self.reply_call
+        if call is None or not call.decoded:
+            return None
+        return call.args.get(SEND_MESSAGE_KWARG) or ''
+
+def _decode(text):
+    if not text or text[0] != '{':
+        return None
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def _parse_tool_call(tool_call):
+    function = tool_call.function
+    args = _decode(function.arguments)
+    return ToolCall(id=tool_call.id, name=function.name, arguments=function.arguments,
+                    args=args or {}, decoded=args is not None)
+
+def _parse(message):
+    role = Role.of(message.role)
+    text = message.text or ''
+    return ParsedMessage(
+        id=message.id,
+        role=role,
+        created_at=message.created_at,
+        text=text,
+        # Assistant text is free-form inner monologue, never a payload
+        payload=_decode(text) if role in (Role.USER, Role.TOOL) else None,
+        name=getattr(message, 'name', None),
+        tool_call_id=getattr(message, 'tool_call_id', None),
+        tool_calls=tuple(_parse_tool_call(call) for call in getattr(message, 'tool_calls', None) or ()),
+    )
+
+_cache = OrderedDict()      # message id -> ParsedMessage, least recently used first
+_cache_lock = threading.Lock()
+
+def parse_message(message):
+    """The ParsedMessage for a raw Message, decoded on first use and memoized by id"""
+    with _cache_lock:
+        record = _cache.get(message.id)
+        if record is not None and record.text == (message.text or ''):
+            _cache.move_to_end(message.id)
+            return record
+    record = _parse(message)
+    with _cache_lock:
+        _cache[message.id] = record
+        if len(_cache) > MAX_CACHED_MESSAGES:
+            _cache.popitem(last=False)
+    return record
+
+def parse_messages(messages):
+    return [parse_message(message) for message in messages]
+
+def forget_messages(message_ids=None):
+    """Drop memoized messages (all of them without ids)"""
+    with _cache_lock:
+        if message_ids is None:
+            _cache.clear()
+        for message_id in message_ids or ():
+            _cache.pop(message_id, None)
@@ -0,0 +1,130 @@
+"""
+This module is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/model_catalog.py
+
+Model and embedding catalogs loaded from the Letta server.
+
+The server lists the LLM configs it can run at /v1/models/ and the
+embedding configs at /v1/models/embedding. Each list is fetched once,
+every entry is validated through LLMConfig/EmbeddingConfig, and the
+resulting config dicts are kept in the shared agent cache (5 minute TTL,
+refreshed in the background) and in a JSON file on disk.
+
+On a cold start the disk copy is served immediately, and refreshed in
+the background if it is out of date. Only a machine that has never seen
+the server waits on the network.
+
+Related scripts:
+- create_agent.py: Model selection for new agents
+- manage_embedding_models.py: Embedding model selection
+
+Usage:
+   from model_catalog import get_llm_models, get_embedding_models, find_llm_config
+   for config in get_llm_models(base_url):
+       print(config['model'])
+   llm_config = find_llm_config(base_url, "gpt-4o-mini")
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from letta import LLMConfig, EmbeddingConfig
+
+try:
+    from agent_cache import cache
+except ImportError:
+    # Imported from the desktop app as LettaSDKDemos.model_catalog
+    from LettaSDKDemos.agent_cache import cache
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CACHE_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'model_catalog.json'
+REQUEST_TIMEOUT = 10
+
+_primed = set()  # cache keys already seeded from disk this run
+_disk_lock = threading.Lock()
+
+CATALOGS = {
+    'llm_models': ('/v1/models/', LLMConfig),
+    'embedding_models': ('/v1/models/embedding', EmbeddingConfig),
+}
+
+def _read_disk(path=CATALOG_CACHE_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_disk(resource, base_url, configs, path=CATALOG_CACHE_PATH):
+    """Store one catalog in the disk cache next to the others"""
+    try:
+        # Both catalogs share the file, so read-modify-write one at a time
+        with _disk_lock:
+            data = _read_disk(path)
+            data.setdefault(base_url, {})[resource] = {'saved_at': time.time(), 'configs': configs}
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write model catalog cache: {str(e)}")
+
+def fetch_catalog(base_url, resource):
+    """Fetch one catalog from the server and return its validated config dicts"""
+    endpoint, schema = CATALOGS[resource]
+    response = requests.get(f"{base_url}{endpoint}", timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        raise ValueError(f"Server returned {response.status_code} for {endpoint}")
+
+    configs = []
+    for entry in response.json():
+        try:
+            configs.append(schema(**entry).dict(exclude_none=True))
+        except Exception as e:
+            # One bad entry shouldn't hide the rest of the catalog
+            logger.warning(f"Skipping invalid {resource} entry {entry!r}: {str(e)}")
+    _write_disk(resource, base_url, configs)
+    logger.info(f"Fetched {len(configs)} {resource} from {base_url}")
+    return configs
+
+def _get_catalog(base_url, resource):
+    key = (resource, base_url)
+    loader = lambda: fetch_catalog(base_url, resource)
+    if key not in _primed:
+        # First read this run: start from the disk copy, an outdated one is
+        # served right away and refreshed in the background
+        _primed.add(key)
+        saved = _read_disk().get(base_url, {}).get(resource)
+        if saved:
+            cache.prime(key, saved['configs'], loader, age=max(time.time() - saved['saved_at'], 0))
+    return cache.get(key, loader)
+
+def get_llm_models(base_url):
+    """Validated LLMConfig dicts the server offers"""
+    return _get_catalog(base_url, 'llm_models')
+
+def get_embedding_models(base_url):
+    """Validated EmbeddingConfig dicts the server offers"""
+    return _get_catalog(base_url, 'embedding_models')
+
+def find_llm_config(base_url, model):
+    """Return the catalog config for a model name, or None"""
+    return next((config for config in get_llm_models(base_url) if config['model'] == model), None)
+
+def find_embedding_config(base_url, embedding_model):
+    """Return the catalog config for an embedding model name, or None"""
+    return next(
+        (config for config in get_embedding_models(base_url) if config['embedding_model'] == embedding_model),
+        None
+    )
+
+def invalidate_catalogs(base_url):
+    """Drop both in-memory catalogs so the next read goes back to the server"""
+    cache.invalidate(('llm_models', base_url), ('embedding_models', base_url))
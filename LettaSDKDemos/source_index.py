@@ -0,0 +1,193 @@
+"""
+This module is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/source_index.py
+
+Two-way index between data sources and the agents they are attached to.
+
+The server can only answer "which sources does this agent use"
+(GET /v1/agents/{id}/sources). Answering the reverse question used to mean
+one request per agent, one after another. The index asks every agent once,
+concurrently, the first time it is needed, and from then on is kept up to
+date by recording attach/detach/delete calls as they are made, so looking
+up the agents of a source is a dictionary lookup.
+
+Changes made by other clients are picked up when the index is rebuilt,
+which happens after MAX_INDEX_AGE seconds or on invalidate().
+
+Related scripts:
+- manage_data_sources.py: Attach/detach sources and view attached agents
+- delete_agent.py: Drops deleted agents from the index
+
+Usage:
+   from source_index import get_source_index
+   index = get_source_index(base_url)
+   for agent in index.agents_for_source(source_id):
+       print(agent['name'])
+   index.record_attach(source_id, agent)    # after POST /v1/sources/{id}/attach
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+REQUEST_TIMEOUT = 30
+# Rebuild from the server after this many seconds to catch outside changes
+MAX_INDEX_AGE = 300
+
+class SourceIndex:
+    """source id -> agent ids and agent id -> source ids for one server"""
+
+    def __init__(self, base_url, workers=DEFAULT_WORKERS, max_age=MAX_INDEX_AGE):
+        self.base_url = base_url
+        self.workers = workers
+        self.max_age = max_age
+        self.agents = {}            # agent id -> {'id', 'name'}
+        self.agent_sources = {}     # agent id -> set of source ids
+        self.source_agents = {}     # source id -> set of agent ids
+        self.failed = set()         # agent ids whose sources couldn't be fetched
+        self.built_at = None
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+
+    def _get_json(self, path):
+        response = requests.get(f"{self.base_url}/v1/{path}", timeout=REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            raise ValueError(f"Server returned {response.status_code} for /v1/{path}")
+        return response.json()
+
+    def _fetch_agent_sources(self, agent):
+        try:
+            return agent, self._get_json(f"agents/{agent['id']}/sources")
+        except Exception as e:
+            # One broken agent shouldn't hide every other agent's sources;
+            # it is fetched again on the next lookup
+            logger.warning(f"Could not get sources of agent {agent['id']}: {str(e)}")
+            return agent, None
+
+    def build(self):
+        """Fetch every agent's sources concurrently and replace the index"""
+        started = time.monotonic()
+        agents = self._get_json("agents/")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            fetched = list(pool.map(self._fetch_agent_sources, agents))
+
+        agent_sources, source_agents, failed = {}, {}, set()
+        for agent, sources in fetched:
+            if sources is None:
+                failed.add(agent['id'])
+                sources = []
+            agent_sources[agent['id']] = {source['id'] for source in sources}
+            for source in sources:
+                source_agents.setdefault(source['id'], set()).add(agent['id'])
+
+        with self._lock:
+            self.agents = {agent['id']: {'id': agent['id'], 'name': agent['name']} for agent in agents}
+            self.agent_sources = agent_sources
+            self.source_agents = source_agents
+            self.failed = failed
+            self.built_at = time.monotonic()
+        logger.info(f"Indexed sources of {len(agents)} agents in {time.monotonic() - started:.2f}s")
+
+    def ensure_built(self):
+        """Build the index on first use, or when it is older than max_age"""
+        if self._is_fresh():
+            self._retry_failed()
+            return
+        # Concurrent callers wait for one build instead of each starting their own
+        with self._build_lock:
+            if not self._is_fresh():
+                self.build()
+
+    def _retry_failed(self):
+        # Agents missing from the last build would otherwise read as "no sources" until max_age
+        with self._lock:
+            failed = list(self.failed)
+        for agent_id in failed:
+            try:
+                self.refresh_agent(agent_id)
+            except Exception as e:
+                logger.warning(f"Could not get sources of agent {agent_id}: {str(e)}")
+
+    def _is_fresh(self):
+        with self._lock:
+            return self.built_at is not None and time.monotonic() - self.built_at < self.max_age
+
+    def agents_for_source(self, source_id):
+        """Agents ({'id', 'name'}) the source is attached to"""
+        self.ensure_built()
+        with self._lock:
+            return [self.agents[agent_id] for agent_id in self.source_agents.get(source_id, ())
+                    if agent_id in self.agents]
+
+    def sources_for_agent(self, agent_id):
+        """Ids of the sources attached to the agent"""
+        self.ensure_built()
+        with self._lock:
+            return set(self.agent_sources.get(agent_id, ()))
+
+    def is_attached(self, source_id, agent_id):
+        return source_id in self.sources_for_agent(agent_id)
+
+    def refresh_agent(self, agent_id):
+        """Re-read one agent's sources from the server; returns their ids"""
+        source_ids = {source['id'] for source in self._get_json(f"agents/{agent_id}/sources")}
+        with self._lock:
+            if self.built_at is not None:
+                for source_id in self.agent_sources.get(agent_id, set()) - source_ids:
+                    self.source_agents.get(source_id, set()).discard(agent_id)
+                for source_id in source_ids:
+                    self.source_agents.setdefault(source_id, set()).add(agent_id)
+                self.agent_sources[agent_id] = set(source_ids)
+                self.failed.discard(agent_id)
+        return source_ids
+
+    # Incremental updates, called after the matching request succeeded.
+    # They are no-ops until the index is built, the build sees the change.
+
+    def record_attach(self, source_id, agent):
+        with self._lock:
+            if self.built_at is None:
+                return
+            self.agents[agent['id']] = {'id': agent['id'], 'name': agent['name']}
+            self.agent_sources.setdefault(agent['id'], set()).add(source_id)
+            self.source_agents.setdefault(source_id, set()).add(agent['id'])
+
+    def record_detach(self, source_id, agent_id):
+        with self._lock:
+            self.agent_sources.get(agent_id, set()).discard(source_id)
+            self.source_agents.get(source_id, set()).discard(agent_id)
+
+    def forget_source(self, source_id):
+        """Call after deleting a source"""
+        with self._lock:
+            for agent_id in self.source_agents.pop(source_id, ()):
+                self.agent_sources.get(agent_id, set()).discard(source_id)
+
+    def forget_agent(self, agent_id):
+        """Call after deleting an agent"""
+        with self._lock:
+            self.agents.pop(agent_id, None)
+            self.failed.discard(agent_id)
+            for source_id in self.agent_sources.pop(agent_id, ()):
+                self.source_agents.get(source_id, set()).discard(agent_id)
+
+    def invalidate(self):
+        """Rebuild from the server on the next lookup"""
+        with self._lock:
+            self.built_at = None
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_source_index(base_url):
+    """Shared SourceIndex for a server, built lazily on first lookup"""
+    with _indexes_lock:
+        if base_url not in _indexes:
+            _indexes[base_url] = SourceIndex(base_url)
+        return _indexes[base_url]
@@ -0,0 +1,295 @@
+"""
+This module is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/source_sync.py
+
+Incremental sync of a local directory tree into a data source.
+
+A manifest per source (.cache/source_sync/<source_id>.json) remembers, for
+every synced file, its size, mtime, content hash and the ids of the files
+it became on the server. A sync then:
+
+1. walks the directory and only re-hashes files whose size or mtime
+   changed; a touched file with the same content is not uploaded again
+2. checks the manifest against GET /v1/sources/{id}/files, so files
+   deleted on the server are uploaded again
+3. uploads new and changed files (source_upload.py), waits for their
+   ingestion jobs (job_tracker.py) and looks up the new file ids
+4. deletes the old versions of changed files, once every part of the new
+   version was ingested and found, and the files that were removed locally
+
+Apart from the directory walk and one file listing, the work done is
+proportional to what changed, not to the size of the tree.
+
+Nested files are stored flattened, "docs/api/intro.md" as
+"docs__api__intro.md", so equal names in different folders stay apart.
+
+Related scripts:
+- manage_data_sources.py: `python manage_data_sources.py sync <dir> <source>`
+- source_upload.py, job_tracker.py
+
+Usage:
+   from source_sync import plan_sync, sync_directory
+   plan = plan_sync(base_url, source_id, "docs/")
+   summary = sync_directory(base_url, source_id, "docs/", on_event=print)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import requests
+
+try:
+    from source_upload import UploadCheckpoint, upload_files
+    from job_tracker import JobTracker
+except ImportError:
+    # Imported from the desktop app as LettaSDKDemos.source_sync
+    from LettaSDKDemos.source_upload import UploadCheckpoint, upload_files
+    from LettaSDKDemos.job_tracker import JobTracker
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'source_sync'
+FILES_PAGE_SIZE = 1000
+HASH_BLOCK_SIZE = 1024 * 1024
+REQUEST_TIMEOUT = 30
+
+def stored_name(relpath):
+    """Server-side file name for a path relative to the synced directory"""
+    return relpath.replace('/', '__')
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def manifest_path(source_id):
+    return MANIFEST_DIR / f"{source_id}.json"
+
+def load_manifest(source_id):
+    try:
+        with open(manifest_path(source_id), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(source_id, manifest):
+    path = manifest_path(source_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+def list_source_files(base_url, source_id):
+    """Every file in the source, following the server's cursor"""
+    files, cursor = [], None
+    while True:
+        params = {'limit': FILES_PAGE_SIZE}
+        if cursor:
+            params['cursor'] = cursor
+        response = requests.get(f"{base_url}/v1/sources/{source_id}/files", params=params, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            raise ValueError(f"Server returned {response.status_code} listing files of {source_id}")
+        page = response.json()
+        files.extend(page)
+        if len(page) < FILES_PAGE_SIZE:
+            return files
+        cursor = page[-1]['id']
+
+def scan_directory(root):
+    """Return {relative path: (absolute path, stat)} for every non-hidden file"""
+    found = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+        for filename in filenames:
+            if filename.startswith('.'):
+                continue
+            path = os.path.join(dirpath, filename)
+            relpath = os.path.relpath(path, root).replace(os.sep, '/')
+            found[relpath] = (path, os.stat(path))
+    return found
+
+def plan_sync(base_url, source_id, root, manifest=None):
+    """
+    Work out what a sync has to do without changing anything.
+
+    Returns {'upload': [relpath], 'delete': [relpath], 'unchanged': [relpath],
+    'hashes': {relpath: sha256}, 'server_ids': set of file ids,
+    'local': {relpath: (path, stat)}}.
+    """
+    manifest = load_manifest(source_id) if manifest is None else manifest
+    server_ids = {file['id'] for file in list_source_files(base_url, source_id)}
+    local = scan_directory(root)
+    plan = {'upload': [], 'delete': [], 'unchanged': [], 'hashes': {}, 'server_ids': server_ids, 'local': local}
+
+    for relpath, (path, stat) in sorted(local.items()):
+        entry = manifest.get(relpath)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            digest = entry['sha256']
+        else:
+            digest = hash_file(path)
+        plan['hashes'][relpath] = digest
+        on_server = entry is not None and entry['file_ids'] and set(entry['file_ids']) <= server_ids
+        if on_server and entry['sha256'] == digest:
+            plan['unchanged'].append(relpath)
+        else:
+            plan['upload'].append(relpath)
+
+    plan['delete'] = sorted(set(manifest) - set(local))
+    return plan
+
+def _delete_server_file(base_url, source_id, file_id):
+    response = requests.delete(f"{base_url}/v1/sources/{source_id}/{file_id}", timeout=REQUEST_TIMEOUT)
+    # Already gone counts as deleted
+    if response.status_code not in (200, 204, 404):
+        raise ValueError(f"Server returned {response.status_code} deleting file {file_id}")
+
+def _match_part(metadata, candidates):
+    """
+    The file an uploaded part became, as (file id, ids of other copies).
+
+    candidates are the unowned server files with the part's name. A file
+    id in the job's metadata settles it; otherwise the newest copy is taken
+    and any older ones are returned so they can be reported.
+    """
+    by_id = {file['id']: file for file in candidates}
+    if metadata.get('file_id') in by_id:
+        return metadata['file_id'], [file_id for file_id in by_id if file_id != metadata['file_id']]
+    if not candidates:
+        return None, []
+    ordered = sorted(candidates, key=lambda file: file.get('created_at') or '')
+    return ordered[-1]['id'], [file['id'] for file in ordered[:-1]]
+
+def sync_directory(base_url, source_id, root, delete=True, dry_run=False, workers=2,
+                   on_event=None, **upload_kwargs):
+    """
+    Make the source match the directory; returns a summary dict.
+
+    on_event(kind, relpath, detail) is called for every file touched, with
+    kind one of 'upload', 'delete', 'error' and 'job' (ingestion progress).
+    """
+    started = time.monotonic()
+    emit = on_event or (lambda kind, relpath, detail=None: None)
+    manifest = load_manifest(source_id)
+    plan = plan_sync(base_url, source_id, root, manifest)
+    summary = {
+        'uploaded': 0, 'deleted': 0, 'unchanged': len(plan['unchanged']), 'failed': 0,
+        'to_upload': list(plan['upload']), 'to_delete': list(plan['delete']) if delete else [],
+    }
+    if dry_run:
+        summary['elapsed'] = time.monotonic() - started
+        return summary
+
+    local = plan['local']
+    paths = {local[relpath][0]: relpath for relpath in plan['upload']}
+
+    # Touched but identical files: remember the new mtime so they aren't hashed again
+    for relpath in plan['unchanged']:
+        stat = local[relpath][1]
+        manifest[relpath].update(size=stat.st_size, mtime=stat.st_mtime)
+
+    # Content may have to go up again even though an earlier upload finished
+    checkpoint = UploadCheckpoint()
+    for path in paths:
+        entry = checkpoint.get(source_id, path)
+        if entry and entry['done']:
+            checkpoint.discard(source_id, path)
+
+    tracker = JobTracker(base_url, on_event=lambda event: emit('job', event['label'], event))
+    uploaded = {}    # relpath -> upload result
+
+    def on_result(result):
+        relpath = paths[result['path']]
+        if 'error' in result:
+            summary['failed'] += 1
+            emit('error', relpath, result['error'])
+            return
+        uploaded[relpath] = result
+        emit('upload', relpath, result)
+        # Ingestion starts while the remaining files are still uploading
+        for index, job_id in enumerate(result['jobs']):
+            if job_id:
+                tracker.track(job_id, label=result['names'][index], upload_seconds=result['elapsed'])
+
+    upload_files(
+        base_url, source_id, list(paths), workers=workers, resume=True, on_result=on_result,
+        names={path: stored_name(relpath) for path, relpath in paths.items()}, **upload_kwargs
+    )
+    tracker.wait()
+
+    # The server only reports job ids; the file ids come from the listing.
+    # Files no manifest entry owns are the parts uploaded under the checkpoint's
+    # jobs, including parts an interrupted earlier run sent before this plan.
+    owned = {file_id for entry in manifest.values() for file_id in entry['file_ids']}
+    files_by_name = {}
+    for file in list_source_files(base_url, source_id):
+        if file['id'] not in owned:
+            files_by_name.setdefault(file['file_name'], []).append(file)
+
+    stale_ids = []
+    for relpath, result in uploaded.items():
+        file_ids, complete = [], True
+        for name, job_id in zip(result['names'], result['jobs']):
+            job = tracker.summary(job_id) if job_id else None
+            file_id, extra_ids = _match_part(job['metadata'] if job else {}, files_by_name.get(name, []))
+            if job is None or job['status'] != 'completed' or file_id is None:
+                complete = False
+            if file_id is not None:
+                file_ids.append(file_id)
+            if extra_ids:
+                # Another copy (an upload by hand, an earlier retry): not ours to delete
+                emit('error', relpath, f"{len(extra_ids)} other file(s) named {name} in the source: "
+                                       f"{', '.join(extra_ids)}")
+        old = manifest.get(relpath)
+        if not complete:
+            # Keep the old version and its hash so the next sync uploads the file again;
+            # the parts that did arrive are recorded so that upload replaces them too
+            summary['failed'] += 1
+            emit('error', relpath, "ingestion did not complete for every part")
+            if old:
+                old['file_ids'] = old['file_ids'] + file_ids
+            elif file_ids:
+                manifest[relpath] = {'size': None, 'mtime': None, 'sha256': None, 'file_ids': file_ids}
+            continue
+        if old:
+            stale_ids.extend(old['file_ids'])
+        path, stat = local[relpath]
+        manifest[relpath] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': plan['hashes'][relpath],
+            'file_ids': file_ids,
+        }
+        summary['uploaded'] += 1
+    # Record the new versions before anything is deleted
+    save_manifest(source_id, manifest)
+
+    def delete_ids(file_ids, label):
+        ok = True
+        for file_id in file_ids:
+            try:
+                _delete_server_file(base_url, source_id, file_id)
+            except Exception as e:
+                ok = False
+                summary['failed'] += 1
+                emit('error', label, str(e))
+        return ok
+
+    delete_ids(stale_ids, 'old versions')
+    for relpath in (plan['delete'] if delete else []):
+        # A file that couldn't be deleted stays in the manifest for the next sync
+        if delete_ids(manifest[relpath]['file_ids'], relpath):
+            del manifest[relpath]
+            summary['deleted'] += 1
+            emit('delete', relpath)
+    save_manifest(source_id, manifest)
+
+    summary['elapsed'] = time.monotonic() - started
+    logger.info(f"Synced {root} into {source_id}: {summary}")
+    return summary
@@ -0,0 +1,528 @@
+"""
+This script is part of the LettaSDKDemos collection.
+Location: LettaSDKDemos/source_upload.py
+
+This script demonstrates how to upload large files to a data source.
+
+Files are streamed from disk straight into the multipart request body, so
+a multi-GB file never has to fit in memory, and progress and throughput
+are reported while the bytes go out.
+
+POST /v1/sources/{id}/upload takes one whole file per request and has no
+byte-range resume. Large line-oriented files (.txt, .md, .jsonl, .log) are
+therefore uploaded as parts of PART_SIZE bytes split on line boundaries,
+each as its own file ("notes.part002of010.txt"); the server splits
+documents into passages anyway. Every finished part is recorded in a
+checkpoint file, so after a dropped connection or a crash only the
+unfinished part is sent again. Uploads are not idempotent: a part whose
+request may have reached the server is only sent again when no job was
+created for it. Other file types can't be split without
+breaking them (a CSV part would lose its header row, a JSON/HTML/XML part
+would not parse, PDFs are binary) and are retried whole.
+
+Several files can be uploaded at once under a global concurrency and
+bandwidth cap.
+
+Related scripts:
+- manage_data_sources.py: Menu option 7 uploads through this engine
+- job_tracker.py: Follows the ingestion jobs the uploads queue (--wait)
+
+Usage:
+   python source_upload.py <source_id> big.txt docs/*.md
+   python source_upload.py <source_id> corpus.jsonl --workers 4 --bandwidth 20 --part-size 64
+   python source_upload.py <source_id> corpus.jsonl --restart     # ignore the checkpoint
+   python source_upload.py <source_id> docs/*.md --wait           # until ingestion finishes
+"""
+
+from colorama import init, Fore, Style
+import argparse
+import json
+import mimetypes
+import os
+import random
+import threading
+import time
+import uuid
+import requests
+from urllib3.exceptions import NewConnectionError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from job_tracker import JobTracker, describe_event
+
+# Initialize colorama
+init(autoreset=True)
+
+CHECKPOINT_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'upload_checkpoint.json'
+
+PART_SIZE = 64 * 1024 * 1024        # bytes per part for splittable files
+READ_SIZE = 256 * 1024              # bytes read from disk at a time
+SPLITTABLE_SUFFIXES = {'.txt', '.md', '.jsonl', '.log'}   # every line stands on its own
+
+DEFAULT_WORKERS = 2
+DEFAULT_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 300                  # waiting for the server once the body is sent
+# The server turned the upload away before storing anything
+RETRY_STATUSES = {429, 503}
+# The server may have stored the file anyway; see _find_upload_job
+AMBIGUOUS_STATUSES = {500, 502, 504}
+CLOCK_SLACK = 5                     # seconds of clock difference tolerated when matching jobs
+
+class BandwidthLimiter:
+    """Token bucket shared by every upload: at most `rate` bytes per second"""
+
+    def __init__(self, rate=None):
+        self.rate = rate
+        self.allowance = rate or 0
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, size):
+        if not self.rate:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.allowance = min(self.allowance + (now - self.last) * self.rate, self.rate)
+            self.last = now
+            self.allowance -= size
+            wait = -self.allowance / self.rate if self.allowance < 0 else 0
+        time.sleep(wait)
+
+class MultipartStream:
+    """
+    A multipart/form-data body for one byte range of a file, read lazily.
+
+    requests streams any object with __iter__ and __len__ without loading
+    it, sending Content-Length instead of chunked encoding.
+    """
+
+    def __init__(self, path, start, end, filename, limiter=None, on_bytes=None):
+        self.boundary = uuid.uuid4().hex
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        self.head = (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode()
+        self.tail = f'\r\n--{self.boundary}--\r\n'.encode()
+        self.path, self.start, self.end = path, start, end
+        self.limiter = limiter
+        self.on_bytes = on_bytes
+        self._pending = [self.head]
+        self._file = None
+        self._remaining = end - start
+        self._done = False
+
+    @property
+    def content_type(self):
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self):
+        return len(self.head) + (self.end - self.start) + len(self.tail)
+
+    def _next_chunk(self):
+        if self._pending:
+            return self._pending.pop(0)
+        if self._done:
+            return b''
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+            self._file.seek(self.start)
+        data = self._file.read(min(READ_SIZE, self._remaining)) if self._remaining else b''
+        if not data:
+            self._file.close()
+            self._done = True
+            return self.tail
+        self._remaining -= len(data)
+        if self.limiter:
+            self.limiter.consume(len(data))
+        if self.on_bytes:
+            self.on_bytes(len(data))
+        return data
+
+    def read(self, size=-1):
+        # http.client asks for fixed-size blocks; handing back one chunk at a
+        # time (never more than asked for) keeps memory flat
+        chunk = self._next_chunk()
+        if size is not None and 0 < size < len(chunk):
+            self._pending.insert(0, chunk[size:])
+            chunk = chunk[:size]
+        return chunk
+
+    def __iter__(self):
+        while True:
+            chunk = self._next_chunk()
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        if self._file and not self._file.closed:
+            self._file.close()
+
+class UploadCheckpoint:
+    """
+    Finished parts per (source, file), persisted after every part.
+
+    An entry only counts while the file's size and mtime are unchanged.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    @staticmethod
+    def key(source_id, file_path):
+        return f"{source_id}:{Path(file_path).resolve()}"
+
+    def get(self, source_id, file_path):
+        """Return the entry for an unchanged file, or None"""
+        stat = os.stat(file_path)
+        with self.lock:
+            entry = self.data.get(self.key(source_id, file_path))
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            return entry
+        return None
+
+    def start(self, source_id, file_path, parts):
+        stat = os.stat(file_path)
+        entry = {'size': stat.st_size, 'mtime': stat.st_mtime, 'parts': parts, 'jobs': {}, 'done': False}
+        with self.lock:
+            self.data[self.key(source_id, file_path)] = entry
+            self._save()
+        return entry
+
+    def record_part(self, source_id, file_path, index, job_id, done=False):
+        with self.lock:
+            entry = self.data[self.key(source_id, file_path)]
+            entry['jobs'][str(index)] = job_id
+            entry['done'] = done
+            self._save()
+
+    def discard(self, source_id, file_path):
+        with self.lock:
+            if self.data.pop(self.key(source_id, file_path), None) is not None:
+                self._save()
+
+    def _save(self):
+        # Caller holds self.lock; write-then-rename so a crash keeps the old copy
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f)
+        os.replace(tmp_path, self.path)
+
+def plan_parts(file_path, part_size=PART_SIZE):
+    """Return [(start, end)] byte ranges, cut after a newline for line-oriented files"""
+    size = os.path.getsize(file_path)
+    if size <= part_size or Path(file_path).suffix.lower() not in SPLITTABLE_SUFFIXES:
+        return [(0, size)]
+    parts, start = [], 0
+    with open(file_path, 'rb') as f:
+        while size - start > part_size:
+            f.seek(start + part_size)
+            f.readline()                  # finish the current line
+            end = f.tell()
+            if end >= size:
+                break
+            parts.append((start, end))
+            start = end
+    parts.append((start, size))
+    return parts
+
+def part_filename(filename, index, count):
+    path = Path(filename)
+    if count == 1:
+        return path.name
+    return f"{path.stem}.part{index + 1:03d}of{count:03d}{path.suffix}"
+
+_local = threading.local()
+
+def _session():
+    # One keep-alive connection per worker thread
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+def _backoff(attempt):
+    return random.uniform(0, min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX))
+
+def _never_sent(error):
+    """True if the request failed before a connection to the server was made"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
+def _parse_time(value):
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    # The server stores UTC, with or without an offset
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+def _find_upload_job(base_url, source_id, filename, posted_at):
+    """The job an upload of filename started at or after posted_at created, or None"""
+    response = _session().get(f"{base_url}/v1/jobs/", params={'source_id': source_id},
+                              timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+    if response.status_code != 200:
+        raise ValueError(f"Server returned {response.status_code} listing jobs")
+    since = posted_at - timedelta(seconds=CLOCK_SLACK)
+    jobs = [
+        job for job in response.json()
+        if (job.get('metadata_') or {}).get('filename') == filename
+        and (job.get('metadata_') or {}).get('source_id') == source_id
+        and job.get('created_at') and _parse_time(job['created_at']) >= since
+    ]
+    return max(jobs, key=lambda job: _parse_time(job['created_at'])) if jobs else None
+
+def _post_part(base_url, source_id, file_path, start, end, filename, retries, limiter, on_bytes):
+    """
+    Upload one byte range as its own file; returns the job.
+
+    Uploads are not idempotent. Failures before the request reached the
+    server (no connection, 429, 503) are retried as they are; after one
+    where the server may have stored the file (read timeout, dropped
+    connection, 500, 502, 504) the source's jobs are checked for this
+    upload first, and it is only sent again if none was created.
+    """
+    for attempt in range(retries + 1):
+        sent = [0]
+        ambiguous = False
+        posted_at = datetime.now(timezone.utc)
+
+        def count(size):
+            sent[0] += size
+            on_bytes(size)
+
+        body = MultipartStream(file_path, start, end, filename, limiter=limiter, on_bytes=count)
+        try:
+            response = _session().post(
+                f"{base_url}/v1/sources/{source_id}/upload",
+                data=body,
+                headers={'Content-Type': body.content_type},
+                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+            )
+            if response.status_code == 200:
+                return response.json()
+            error = ValueError(f"Server returned {response.status_code} - {response.text}")
+            retryable = response.status_code in RETRY_STATUSES
+            ambiguous = response.status_code in AMBIGUOUS_STATUSES
+        except requests.RequestException as e:
+            retryable = _never_sent(e)
+            error, ambiguous = e, not retryable
+        finally:
+            body.close()
+        if ambiguous and attempt < retries:
+            try:
+                job = _find_upload_job(base_url, source_id, filename, posted_at)
+            except (requests.RequestException, ValueError):
+                # Can't tell whether the file was stored, so don't risk storing it twice
+                job = None
+            else:
+                if job is not None:
+                    return job
+                retryable = True
+        # The bytes of a failed attempt don't count towards progress
+        on_bytes(-sent[0])
+        if not retryable or attempt == retries:
+            raise error
+        time.sleep(_backoff(attempt))
+
+def upload_file(base_url, source_id, file_path, checkpoint=None, resume=True, limiter=None,
+                on_progress=None, retries=DEFAULT_RETRIES, part_size=PART_SIZE, filename=None):
+    """
+    Stream one file into a source, resuming from the checkpoint when possible.
+
+    The file is stored under `filename` (default: its own name).
+    on_progress(file_path, sent, total, bytes_per_sec) is called as bytes go
+    out. Returns a result dict with the job ids, bytes sent and throughput.
+    """
+    filename = filename or Path(file_path).name
+    checkpoint = checkpoint or UploadCheckpoint()
+    entry = checkpoint.get(source_id, file_path) if resume else None
+    if entry is None:
+        entry = checkpoint.start(source_id, file_path, plan_parts(file_path, part_size))
+    parts = entry['parts']
+    total = sum(end - start for start, end in parts)
+    finished = {int(index) for index in entry['jobs']}
+    started = time.monotonic()
+    progress = {'sent': sum(parts[index][1] - parts[index][0] for index in finished), 'uploaded': 0}
+    lock = threading.Lock()
+
+    def on_bytes(size):
+        with lock:
+            progress['sent'] += size
+            progress['uploaded'] += size
+            elapsed = time.monotonic() - started
+            rate = progress['uploaded'] / elapsed if elapsed else 0.0
+            sent = progress['sent']
+        if on_progress:
+            on_progress(file_path, sent, total, rate)
+
+    for index, (start, end) in enumerate(parts):
+        if index in finished:
+            continue
+        job = _post_part(
+            base_url, source_id, file_path, start, end,
+            part_filename(filename, index, len(parts)), retries, limiter, on_bytes
+        )
+        finished.add(index)
+        checkpoint.record_part(source_id, file_path, index, job.get('id'), done=len(finished) == len(parts))
+
+    elapsed = time.monotonic() - started
+    jobs = [entry['jobs'].get(str(index)) for index in range(len(parts))]
+    return {
+        'path': str(file_path),
+        'filename': filename,
+        'names': [part_filename(filename, index, len(parts)) for index in range(len(parts))],
+        'jobs': jobs,
+        'parts': len(parts),
+        'bytes': total,
+        'uploaded': progress['uploaded'],
+        'resumed': progress['uploaded'] < total,
+        'elapsed': elapsed,
+        'bytes_per_sec': progress['uploaded'] / elapsed if elapsed else 0.0,
+    }
+
+def upload_files(base_url, source_id, file_paths, workers=DEFAULT_WORKERS, bandwidth=None,
+                 resume=True, on_progress=None, on_result=None, names=None, **kwargs):
+    """
+    Upload several files concurrently: at most `workers` at a time and
+    `bandwidth` bytes/sec in total. names optionally maps a path to the
+    file name to store it under. Returns a list of result dicts; failed
+    files have an 'error' instead of jobs.
+    """
+    names = names or {}
+    checkpoint = UploadCheckpoint()
+    limiter = BandwidthLimiter(bandwidth)
+
+    def upload(file_path):
+        try:
+            return upload_file(base_url, source_id, file_path, checkpoint=checkpoint, resume=resume,
+                               limiter=limiter, on_progress=on_progress,
+                               filename=names.get(file_path), **kwargs)
+        except Exception as e:
+            return {'path': str(file_path), 'error': str(e)}
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(upload, file_path) for file_path in file_paths]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{int(size)} B"
+        size /= 1024
+
+class ProgressPrinter:
+    """on_progress callback printing at most a few lines per second per file"""
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.last = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, file_path, sent, total, rate):
+        now = time.monotonic()
+        with self.lock:
+            if sent < total and now - self.last.get(file_path, 0) < self.interval:
+                return
+            self.last[file_path] = now
+        percent = sent / total * 100 if total else 100.0
+        print(f"{Path(file_path).name}: {percent:5.1f}% "
+              f"({format_bytes(sent)} of {format_bytes(total)}, {format_bytes(rate)}/s)")
+
+def print_result(result):
+    """Print one upload outcome"""
+    if 'error' in result:
+        print(f"{Fore.RED}Failed {result['path']}: {result['error']}{Style.RESET_ALL}")
+        return
+    if result['bytes'] and not result['uploaded']:
+        print(f"{Fore.YELLOW}Skipped {result['path']}: already uploaded{Style.RESET_ALL}")
+        return
+    resumed = " (resumed)" if result['resumed'] else ""
+    print(f"{Fore.GREEN}Uploaded {result['path']}{resumed}: {format_bytes(result['bytes'])} "
+          f"in {result['parts']} part(s), {format_bytes(result['bytes_per_sec'])}/s{Style.RESET_ALL}")
+    for job_id in result['jobs']:
+        print(f"Job ID: {job_id}")
+
+def track_upload_jobs(tracker, result):
+    """Hand a finished upload's ingestion jobs to a JobTracker"""
+    for index, job_id in enumerate(result.get('jobs', [])):
+        if job_id:
+            tracker.track(
+                job_id,
+                label=result['names'][index],
+                upload_seconds=result['elapsed']
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload files to a Letta data source")
+    parser.add_argument("source_id", help="Data source to upload into")
+    parser.add_argument("files", nargs="+", help="Files to upload")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Files uploaded at the same time")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Total upload cap in MB/s")
+    parser.add_argument("--part-size", type=int, default=PART_SIZE // (1024 * 1024), help="Part size in MB")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per part")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and upload everything again")
+    parser.add_argument("--wait", action="store_true", help="Wait until the server has processed the files")
+    args = parser.parse_args()
+
+    base_url = "http://localhost:8283"
+    try:
+        missing = [path for path in args.files if not os.path.isfile(path)]
+        if missing:
+            print(f"{Fore.RED}Error: File(s) not found: {', '.join(missing)}{Style.RESET_ALL}")
+            return
+
+        tracker = JobTracker(base_url, on_event=lambda event: print(describe_event(event))) if args.wait else None
+
+        def on_result(result):
+            print_result(result)
+            # Ingestion of finished files overlaps with the uploads still running
+            if tracker and 'error' not in result and result['uploaded']:
+                track_upload_jobs(tracker, result)
+
+        results = upload_files(
+            base_url,
+            args.source_id,
+            args.files,
+            workers=args.workers,
+            bandwidth=args.bandwidth * 1024 * 1024 if args.bandwidth else None,
+            resume=not args.restart,
+            on_progress=ProgressPrinter(),
+            on_result=on_result,
+            retries=args.retries,
+            part_size=args.part_size * 1024 * 1024
+        )
+
+        failed = [result for result in results if 'error' in result]
+        print(f"\n{Fore.BLUE}Upload Summary:{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}Uploaded: {Style.RESET_ALL}{len(results) - len(failed)}")
+        print(f"{Fore.GREEN}Failed: {Style.RESET_ALL}{len(failed)}")
+        if failed:
+            print("Run the same command again to resume the failed files.")
+        if tracker:
+            print(f"\n{Fore.YELLOW}Waiting for the server to process the files (Ctrl+C to stop waiting)...{Style.RESET_ALL}")
+            tracker.wait()
+
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}Stopped waiting; processing continues on the server{Style.RESET_ALL}")
+    except Exception as e:
+        print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,12 @@ This script is part of the LettaSDKDemos collection.
 Location: LettaSDKDemos/view_colored_messages.py
 
 This script demonstrates how to display agent messages with color coding.
+The latest page is shown first; older pages are loaded on request.
 
 Related scripts:
 - view_messages.py: For basic message viewing
 - get_agent_info.py: For detailed agent information
+- message_model.py: Decodes each message once into a typed record
 
 Color Coding:
 - Blue: User messages
@@ -19,71 +21,60 @@ Color Coding:
 
 from letta import create_client
 from colorama import init, Fore, Style
-import json
 import os
 from pathlib import Path
+from message_history import get_message_page
+from message_model import Role, parse_message
 
 # Initialize colorama and enable ANSI
 init(autoreset=True)
 os.system("")
 
+ROLE_COLORS = {
+    Role.USER: Fore.BLUE,
+    Role.TOOL: Fore.YELLOW,
+    Role.ASSISTANT: Fore.GREEN,
+    Role.SYSTEM: Fore.MAGENTA,
+}
+
 def get_message_color(role):
     """Return color for a given role."""
-    role = role.replace("MessageRole.", "").lower()
-    if role == "user":
-        return Fore.BLUE
-    if role == "tool":
-        return Fore.YELLOW
-    if role == "assistant":
-        return Fore.GREEN
-    if role == "system":
-        return Fore.MAGENTA
-    return Fore.WHITE  # Default color
+    return ROLE_COLORS.get(Role.of(role), Fore.WHITE)  # Default color
+
+def format_content(record):
+    """The text shown for a parsed message (see message_model.py)"""
+    if record.role is Role.USER:
+        if record.payload is None:
+            return record.text
+        return f"{record.payload.get('message', 'No message')} (Time: {record.payload.get('time', 'Unknown')})"
+    if record.role is Role.TOOL:
+        if record.payload is None:
+            return record.text
+        return f"Status: {record.payload.get('status', 'Unknown')}, Message: {record.payload.get('message', 'None')}"
+    if record.role is Role.ASSISTANT:
+        content = record.text
+        if record.reply is not None:
+            content += f"\nResponse: {record.reply}"
+        elif record.reply_call is not None:
+            content += "\n[Tool call parsing failed]"
+        return content
+    if record.role is Role.SYSTEM:
+        return f"{record.text[:100]}..." if len(record.text) > 100 else record.text
+    return record.text
 
 def display_messages(messages):
     """Display messages with color coding."""
     for msg in messages:
         print("\n---")
 
-        # Determine message role and content
         try:
-            role = msg.role.replace("MessageRole.", "")
-            color = get_message_color(msg.role)
-            
-            if "user" in role.lower():
-                try:
-                    data = json.loads(msg.text)
-                    content = f"{data.get('message', 'No message')} (Time: {data.get('time', 'Unknown')})"
-                except:
-                    content = msg.text
-                    
-            elif "tool" in role.lower():
-                try:
-                    data = json.loads(msg.text)
-                    content = f"Status: {data.get('status', 'Unknown')}, Message: {data.get('message', 'None')}"
-                except:
-                    content = msg.text
-                    
-            elif "assistant" in role.lower():
-                content = msg.text
-                if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                    try:
-                        tool_call = msg.tool_calls[0]
-                        if "send_message" in str(tool_call):
-                            args = json.loads(tool_call.function.arguments)
-                            content += f"\nResponse: {args.get('message', '')}"
-                    except:
-                        content += "\n[Tool call parsing failed]"
-                        
-            elif "system" in role.lower():
-                content = f"{msg.text[:100]}..." if len(msg.text) > 100 else msg.text
-                
-            else:
-                content = msg.text
+            # Decoded once per message id; paging back and forth doesn't parse again
+            record = parse_message(msg)
+            color = ROLE_COLORS.get(record.role, Fore.WHITE)
 
             # Print the message with color
-            print(color + f"[{role}] {content}" + Style.RESET_ALL)
-            print(Fore.WHITE + f"Timestamp: {msg.created_at}" + Style.RESET_ALL)
+            print(color + f"[{record.role.value}] {format_content(record)}" + Style.RESET_ALL)
+            print(Fore.WHITE + f"Timestamp: {record.created_at}" + Style.RESET_ALL)
             
         except Exception as e:
             print(Fore.RED + f"Error parsing message: {str(e)}" + Style.RESET_ALL)
@@ -115,15 +106,22 @@ def main():
 
         selected_agent = agents[selection]
 
-        # Get messages
-        messages = client.get_messages(agent_id=selected_agent.id, limit=50)
+        # Get the latest page of messages
+        messages, older = get_message_page(client, selected_agent.id)
         if not messages:
             print("\nNo messages found for this agent.")
             return
 
-        # Display messages
+        # Display messages, walking back through history page by page
         print(f"\nMessage history for {selected_agent.name}:")
-        display_messages(messages)
+        while True:
+            display_messages(messages)
+            if older is None:
+                print(Fore.WHITE + "\nStart of conversation." + Style.RESET_ALL)
+                break
+            if input("\nLoad older messages? (y/n): ").strip().lower() != 'y':
+                break
+            messages, older = get_message_page(client, selected_agent.id, before=older)
 
     except Exception as e:
         print(Fore.RED + f"Error: {str(e)}" + Style.RESET_ALL)
@@ -3,15 +3,19 @@ This script is part of the LettaSDKDemos collection.
 Location: LettaSDKDemos/view_messages.py
 
 This script demonstrates how to retrieve and display agent messages.
+History is paged with cursors, so any amount of it can be browsed.
 
 Related scripts:
 - view_colored_messages.py: For colored message display
 - get_agent_info.py: For detailed agent information
+- message_model.py: Decoded message records used for the listing
 """
 
 from letta import create_client
 from colorama import init, Fore, Style
 from pathlib import Path
+from message_history import get_message_page
+from message_model import parse_messages
 
 # Initialize colorama
 init(autoreset=True)
@@ -54,22 +58,47 @@ def main():
         
         selected_agent = agents[selection]
         
-        # Get messages for the selected agent
-        messages = client.get_messages(agent_id=selected_agent.id, limit=50)
+        # Get the latest page of messages; older pages are fetched on demand
+        cursors = [None]  # `before` cursor of every page visited, newest first
+        messages, older = get_message_page(client, selected_agent.id)
         
         if not messages:
             print("\nNo messages found for this agent.")
             return
-            
-        # Display message list
-        print("\nMessage history:")
-        for i, message in enumerate(messages, 1):
-            print(f"{i}. [{message.role}] {message.text[:50]}...")
         
-        # Let user view individual messages
+        show_page = True
         while True:
+            # Display message list
+            if show_page:
+                print(f"\nMessage history (page {len(cursors)}):")
+                for i, record in enumerate(parse_messages(messages), 1):
+                    print(f"{i}. [{record.role.value}] {record.text[:50]}...")
+                show_page = False
+            
+            # Let user view individual messages or move between pages
+            choice = input(
+                "\nEnter the number of the message to view details, "
+                "'o' for older, 'n' for newer (0 to exit): "
+            ).strip().lower()
+            if choice == 'o':
+                if older is None:
+                    print("This is the start of the conversation.")
+                    continue
+                cursors.append(older)
+                messages, older = get_message_page(client, selected_agent.id, before=older)
+                show_page = True
+                continue
+            if choice == 'n':
+                if len(cursors) == 1:
+                    print("This is the latest page.")
+                    continue
+                cursors.pop()
+                messages, older = get_message_page(client, selected_agent.id, before=cursors[-1])
+                show_page = True
+                continue
+            
             try:
-                msg_selection = int(input("\nEnter the number of the message to view details (0 to exit): ")) - 1
+                msg_selection = int(choice) - 1
                 if msg_selection == -1:
                     break
                 if 0 <= msg_selection < len(messages):
@@ -7,10 +7,11 @@ Confirmed functionality against LettaSDKDemos:
 
 def get_agents_table_html():
     return """
+    <div class="agents-table-container" id="agents-scroll">
     <table class="agents-table">
         <thead>
             <tr>
-                <th class="agent-name">Agent Name</th>
+                <th class="agent-name sortable" data-sort="name">Agent Name</th>
                 <th class="numeric">
                     <svg class="header-icon" viewBox="0 0 16 16">
                         <path d="M0 2.5A1.5 1.5 0 0 1 1.5 1h11A1.5 1.5 0 0 1 14 2.5v10a1.5 1.5 0 0 1-1.5 1.5h-11A1.5 1.5 0 0 1 0 12.5v-10zm1.5-.5a.5.5 0 0 0-.5.5v10a.5.5 0 0 0 .5.5h11a.5.5 0 0 0 .5-.5v-10a.5.5 0 0 0-.5-.5h-11z"/>
@@ -33,19 +34,45 @@ def get_agents_table_html():
                     </svg>
                 </th>
                 <th>Last Run</th>
-                <th>Lifespan</th>
+                <th class="sortable" data-sort="created">Lifespan</th>
                 <th>Actions</th>
             </tr>
         </thead>
         <tbody id="agents-list"></tbody>
     </table>
+    </div>
     """
 
 def get_agents_table_styles():
     return """
+    .agents-table-container {
+        max-height: calc(100vh - 160px);
+        overflow-y: auto;
+    }
+    
     .agents-table {
         width: 100%;
         border-collapse: collapse;
+        table-layout: fixed;
+    }
+    
+    .agents-table thead th {
+        position: sticky;
+        top: 0;
+        background-color: #0D1117;
+        z-index: 1;
+    }
+    
+    .agents-table th.sortable {
+        cursor: pointer;
+    }
+    
+    .agents-table th.sortable.sorted-asc::after {
+        content: ' ▲';
+    }
+    
+    .agents-table th.sortable.sorted-desc::after {
+        content: ' ▼';
     }
     
     .agents-table th {
@@ -61,6 +88,23 @@ def get_agents_table_styles():
         padding: 12px 16px;
         border-bottom: 1px solid #21262d;
         font-size: 14px;
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+    }
+    
+    /* Virtualized rows must all share one fixed height */
+    .agents-table tbody tr {
+        height: 45px;
+    }
+    
+    .agents-table tr.spacer-row td {
+        padding: 0;
+        border: none;
+    }
+    
+    .agents-table tr.placeholder-row td {
+        color: #484f58;
     }
     
     .agents-table th.numeric,
@@ -145,13 +189,11 @@ def get_agents_table_js():
     }
 
     // Utility functions with logging
+    // Called for every rendered row on scroll, so keep it free of logging
     function formatDate(dateString) {
-        console.log('Formatting date:', dateString);
         const date = new Date(dateString);
         const months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
-        const formatted = `${months[date.getMonth()]} ${date.getDate()}, ${date.getFullYear()}`;
-        console.log('Formatted date result:', formatted);
-        return formatted;
+        return `${months[date.getMonth()]} ${date.getDate()}, ${date.getFullYear()}`;
     }
     
     function showLoading() {
@@ -162,6 +204,7 @@ def get_agents_table_js():
             console.error('agents-list element not found in showLoading');
             return;
         }
+        resetRenderedRows(tbody);
         tbody.innerHTML = '<tr><td colspan="8" class="loading">Loading agents...</td></tr>';
         console.log('Loading state displayed');
     }
@@ -174,33 +217,431 @@ def get_agents_table_js():
             console.error('agents-list element not found in showError');
             return;
         }
+        resetRenderedRows(tbody);
         tbody.innerHTML = `<tr><td colspan="8" class="error">Error loading agents: ${error}</td></tr>`;
         console.log('Error state displayed');
     }
 
-    // Safe event listener attachment
-    function attachEventListeners() {
-        console.log('Attempting to attach event listeners...');
-        const tbody = document.getElementById('agents-list');
-        if (!tbody || !window.pywebview) {
-            console.log('Not ready for event listeners yet');
-            return false;
+    // One delegated click handler on the tbody replaces per-button listeners,
+    // so rows can be created and recycled without re-attaching anything.
+    function attachRowClickHandler(tbody) {
+        if (tbody.dataset.clickHandlerAttached) {
+            return;
         }
-        
-        const buttons = tbody.querySelectorAll('.chat-button');
-        console.log(`Found ${buttons.length} chat buttons to attach listeners to`);
-        
-        buttons.forEach((button, index) => {
+        tbody.dataset.clickHandlerAttached = 'true';
+
+        // Hovering a row prefetches its chat config (see AgentPrefetcher in chat_config.py).
+        // The chat page is lazy loaded, so the first hover also pulls in its script.
+        tbody.addEventListener('mouseover', async (event) => {
+            const row = event.target.closest('tr[data-agent-id]');
+            if (!row) {
+                return;
+            }
+            try {
+                await window.componentLoader?.load('chatConfig');
+            } catch (error) {
+                console.error('Error loading chat page:', error);
+                return;
+            }
+            window.agentPrefetcher?.hover(row.dataset.agentId);
+        });
+        tbody.addEventListener('mouseleave', () => {
+            window.agentPrefetcher?.cancelHover();
+        });
+
+        tbody.addEventListener('click', (event) => {
+            const button = event.target.closest('.chat-button');
+            if (!button || !tbody.contains(button)) {
+                return;
+            }
             const agentId = button.dataset.agentId;
-            button.addEventListener('click', () => {
-                console.log(`Chat button clicked for agent: ${agentId}`);
-                window.pageManager.navigateToChat(agentId);
+            console.log(`Chat button clicked for agent: ${agentId}`);
+            window.pageManager.navigateToChat(agentId);
+        });
+        console.log('Delegated click handler attached to agents list');
+    }
+
+    // Virtualized table: only the rows in view (plus a buffer) are in the DOM,
+    // and rows are fetched from the bridge one page at a time.
+    const AGENT_ROW_HEIGHT = 45;      // must match .agents-table tbody tr height
+    const AGENT_PAGE_SIZE = 100;
+    const AGENT_ROW_BUFFER = 10;      // extra rows rendered above/below the viewport
+    const AGENT_MAX_CACHED_PAGES = 20;
+
+    // Stats for visible rows are requested in one batched bridge call
+    const AGENT_STATS_DEBOUNCE_MS = 150;
+    // Visible rows are handed to the idle prefetcher once scrolling settles
+    const AGENT_IDLE_PREFETCH_DELAY_MS = 300;
+
+    const agentsTableState = {
+        total: 0,
+        sort: 'name',
+        query: '',
+        pages: new Map(),     // page index -> array of agent rows
+        pending: new Map(),   // page index -> in-flight request
+        generation: 0,        // bumped on reload so stale responses are dropped
+        renderQueued: false,
+        statsById: new Map(), // agent id -> {messageCount, memoryCount, lastRun}
+        statsQueue: new Set(),
+        statsRequested: new Set(),
+        statsTimer: null,
+        idlePrefetchTimer: null,
+        // Rendered DOM, keyed by agent id (or placeholder-<index>)
+        tbody: null,
+        domRows: new Map(),
+        topSpacer: null,
+        bottomSpacer: null
+    };
+
+    const AGENT_CELL_CLASSES = ['agent-name', 'numeric', 'numeric', 'numeric', 'numeric', '', 'date'];
+
+    function agentCellValues(agent) {
+        const stats = agentsTableState.statsById.get(agent.id) || {};
+        return [
+            agent.name ?? '',
+            String(stats.messageCount ?? '–'),
+            String(agent.toolCount ?? '–'),
+            String(stats.memoryCount ?? '–'),
+            String(agent.toolsEnabled ?? '–'),
+            stats.lastRun ? formatDate(stats.lastRun) : '–',
+            agent.lifespan ? formatDate(agent.lifespan) : '–'
+        ];
+    }
+
+    function createAgentRow(agentId, values) {
+        const row = document.createElement('tr');
+        row.dataset.agentId = agentId;
+        values.forEach((value, i) => {
+            const cell = row.insertCell();
+            if (AGENT_CELL_CLASSES[i]) {
+                cell.className = AGENT_CELL_CLASSES[i];
+            }
+            cell.textContent = value;
+        });
+
+        const actions = row.insertCell();
+        const chatButton = document.createElement('button');
+        chatButton.className = 'chat-button';
+        chatButton.dataset.agentId = agentId;
+        chatButton.textContent = 'Chat';
+        const menuButton = document.createElement('button');
+        menuButton.className = 'actions-menu';
+        menuButton.textContent = '⋮';
+        actions.append(chatButton, menuButton);
+
+        row._values = values;
+        return row;
+    }
+
+    function createPlaceholderRow() {
+        const row = document.createElement('tr');
+        row.className = 'placeholder-row';
+        const cell = row.insertCell();
+        cell.colSpan = 8;
+        cell.textContent = 'Loading...';
+        return row;
+    }
+
+    // Only touch the cells whose text actually changed
+    function patchAgentRow(row, values) {
+        const previous = row._values;
+        for (let i = 0; i < values.length; i++) {
+            if (previous[i] !== values[i]) {
+                row.cells[i].textContent = values[i];
+            }
+        }
+        row._values = values;
+    }
+
+    function createSpacerRow() {
+        const row = document.createElement('tr');
+        row.className = 'spacer-row';
+        row.insertCell().colSpan = 8;
+        return row;
+    }
+
+    // Forget the rendered rows (called whenever tbody content is replaced wholesale)
+    function resetRenderedRows(tbody) {
+        const state = agentsTableState;
+        state.tbody = tbody;
+        state.domRows.clear();
+        state.topSpacer = null;
+        state.bottomSpacer = null;
+    }
+
+    function ensureSpacers(tbody) {
+        const state = agentsTableState;
+        if (state.tbody !== tbody || !state.topSpacer || !tbody.contains(state.topSpacer)) {
+            resetRenderedRows(tbody);
+            tbody.textContent = '';
+            state.topSpacer = createSpacerRow();
+            state.bottomSpacer = createSpacerRow();
+            tbody.append(state.topSpacer, state.bottomSpacer);
+        }
+    }
+
+    // Keyed reconciliation: reuse rows that are still visible, patch their
+    // changed cells, and only create/remove rows entering/leaving the window.
+    function reconcileAgentRows(tbody, desired, topHeight, bottomHeight) {
+        const state = agentsTableState;
+        ensureSpacers(tbody);
+        state.topSpacer.style.height = `${topHeight}px`;
+        state.bottomSpacer.style.height = `${bottomHeight}px`;
+
+        // Remove rows that left the window first so kept rows don't get shuffled
+        const wanted = new Set(desired.map(item => item.key));
+        state.domRows.forEach((row, key) => {
+            if (!wanted.has(key)) {
+                row.remove();
+                state.domRows.delete(key);
+            }
+        });
+
+        let cursor = state.topSpacer.nextSibling;
+        desired.forEach(item => {
+            let row = state.domRows.get(item.key);
+            if (row) {
+                if (item.values) {
+                    patchAgentRow(row, item.values);
+                }
+            } else {
+                row = item.values ? createAgentRow(item.key, item.values) : createPlaceholderRow();
+                state.domRows.set(item.key, row);
+            }
+
+            if (row === cursor) {
+                cursor = cursor.nextSibling;
+            } else {
+                tbody.insertBefore(row, cursor);
+            }
+        });
+    }
+
+    function evictDistantPages(centerPage) {
+        const pages = agentsTableState.pages;
+        if (pages.size <= AGENT_MAX_CACHED_PAGES) {
+            return;
+        }
+        const byDistance = [...pages.keys()].sort(
+            (a, b) => Math.abs(b - centerPage) - Math.abs(a - centerPage)
+        );
+        while (pages.size > AGENT_MAX_CACHED_PAGES) {
+            const pageIndex = byDistance.shift();
+            pages.get(pageIndex).forEach(agent => {
+                agentsTableState.statsById.delete(agent.id);
+                agentsTableState.statsRequested.delete(agent.id);
+            });
+            pages.delete(pageIndex);
+        }
+    }
+
+    async function fetchAgentsPage(pageIndex) {
+        const state = agentsTableState;
+        if (state.pages.has(pageIndex)) {
+            return state.pages.get(pageIndex);
+        }
+        if (state.pending.has(pageIndex)) {
+            return state.pending.get(pageIndex);
+        }
+
+        const generation = state.generation;
+        const request = window.pywebview.api
+            .get_agents(pageIndex * AGENT_PAGE_SIZE, AGENT_PAGE_SIZE, state.sort, state.query)
+            .then(result => {
+                if (!result || result.error) {
+                    throw new Error(result?.error || 'Failed to load agents');
+                }
+                if (generation !== state.generation) {
+                    return null;
+                }
+                state.total = result.total;
+                state.pages.set(pageIndex, result.agents);
+                evictDistantPages(pageIndex);
+                return result.agents;
+            })
+            .finally(() => {
+                if (generation === state.generation) {
+                    state.pending.delete(pageIndex);
+                }
             });
+
+        state.pending.set(pageIndex, request);
+        return request;
+    }
+
+    function renderVisibleAgents() {
+        agentsTableState.renderQueued = false;
+        const container = document.getElementById('agents-scroll');
+        const tbody = document.getElementById('agents-list');
+        if (!container || !tbody) {
+            return;
+        }
+
+        const total = agentsTableState.total;
+        if (total === 0) {
+            resetRenderedRows(tbody);
+            const message = agentsTableState.query ? 'No agents match your search' : 'No agents found';
+            tbody.innerHTML = `<tr><td colspan="8" class="loading">${message}</td></tr>`;
+            return;
+        }
+
+        const visibleCount = Math.ceil(container.clientHeight / AGENT_ROW_HEIGHT);
+        const first = Math.max(0, Math.floor(container.scrollTop / AGENT_ROW_HEIGHT) - AGENT_ROW_BUFFER);
+        const last = Math.min(total, first + visibleCount + AGENT_ROW_BUFFER * 2);
+
+        const desired = [];
+        const visibleIds = [];
+        const missingPages = new Set();
+        for (let i = first; i < last; i++) {
+            const pageIndex = Math.floor(i / AGENT_PAGE_SIZE);
+            const page = agentsTableState.pages.get(pageIndex);
+            const agent = page && page[i % AGENT_PAGE_SIZE];
+            if (agent) {
+                desired.push({ key: agent.id, values: agentCellValues(agent) });
+                visibleIds.push(agent.id);
+                queueAgentStats(agent.id);
+            } else {
+                missingPages.add(pageIndex);
+                desired.push({ key: `placeholder-${i}`, values: null });
+            }
+        }
+
+        reconcileAgentRows(
+            tbody,
+            desired,
+            first * AGENT_ROW_HEIGHT,
+            (total - last) * AGENT_ROW_HEIGHT
+        );
+        attachRowClickHandler(tbody);
+        scheduleIdlePrefetch(visibleIds);
+
+        missingPages.forEach(pageIndex => {
+            fetchAgentsPage(pageIndex)
+                .then(scheduleAgentsRender)
+                .catch(error => console.error(`Error loading agents page ${pageIndex}:`, error));
         });
-        
-        return true;
     }
 
+    function scheduleIdlePrefetch(agentIds) {
+        if (!window.agentPrefetcher) {
+            return;
+        }
+        clearTimeout(agentsTableState.idlePrefetchTimer);
+        agentsTableState.idlePrefetchTimer = setTimeout(
+            () => window.agentPrefetcher.idle(agentIds),
+            AGENT_IDLE_PREFETCH_DELAY_MS
+        );
+    }
+
+    function queueAgentStats(agentId) {
+        const state = agentsTableState;
+        if (state.statsRequested.has(agentId)) {
+            return;
+        }
+        state.statsRequested.add(agentId);
+        state.statsQueue.add(agentId);
+        if (!state.statsTimer) {
+            state.statsTimer = setTimeout(loadAgentStats, AGENT_STATS_DEBOUNCE_MS);
+        }
+    }
+
+    async function loadAgentStats() {
+        const state = agentsTableState;
+        state.statsTimer = null;
+        const ids = [...state.statsQueue];
+        state.statsQueue.clear();
+        if (ids.length === 0) {
+            return;
+        }
+
+        const generation = state.generation;
+        try {
+            console.log(`Requesting stats for ${ids.length} agents`);
+            const stats = await window.pywebview.api.get_agent_stats(ids);
+            if (!stats || stats.error) {
+                throw new Error(stats?.error || 'Failed to load agent stats');
+            }
+            if (generation !== state.generation) {
+                return;
+            }
+
+            stats.ids.forEach((agentId, i) => {
+                state.statsById.set(agentId, {
+                    messageCount: stats.messageCount[i],
+                    memoryCount: stats.memoryCount[i],
+                    lastRun: stats.lastRun[i]
+                });
+            });
+            // Failed counters stay blank until the next loadAgents() rather
+            // than being retried on every render
+            if (Object.keys(stats.errors).length > 0) {
+                console.warn('Some agent stats failed to load:', stats.errors);
+            }
+            scheduleAgentsRender();
+        } catch (error) {
+            console.error('Error loading agent stats:', error);
+        }
+    }
+
+    function scheduleAgentsRender() {
+        if (agentsTableState.renderQueued) {
+            return;
+        }
+        agentsTableState.renderQueued = true;
+        requestAnimationFrame(renderVisibleAgents);
+    }
+
+    function updateSortIndicators() {
+        document.querySelectorAll('.agents-table th.sortable').forEach(th => {
+            const sort = agentsTableState.sort;
+            th.classList.toggle('sorted-asc', sort === th.dataset.sort);
+            th.classList.toggle('sorted-desc', sort === `-${th.dataset.sort}`);
+        });
+    }
+
+    function setAgentsSort(sort) {
+        console.log('Sorting agents by:', sort);
+        agentsTableState.sort = sort;
+        const container = document.getElementById('agents-scroll');
+        if (container) {
+            container.scrollTop = 0;
+        }
+        return loadAgents();
+    }
+
+    // Called by the search box (components/search.py) on every keystroke
+    function setAgentsQuery(query) {
+        query = (query || '').trim();
+        if (query === agentsTableState.query) {
+            return Promise.resolve();
+        }
+        agentsTableState.query = query;
+        const container = document.getElementById('agents-scroll');
+        if (container) {
+            container.scrollTop = 0;
+        }
+        return loadAgents();
+    }
+
+    function attachTableListeners() {
+        const container = document.getElementById('agents-scroll');
+        if (!container || container.dataset.listenersAttached) {
+            return;
+        }
+        container.dataset.listenersAttached = 'true';
+        container.addEventListener('scroll', scheduleAgentsRender, { passive: true });
+
+        container.querySelectorAll('th.sortable').forEach(th => {
+            th.addEventListener('click', () => {
+                const key = th.dataset.sort;
+                const next = agentsTableState.sort === key ? `-${key}` : key;
+                setAgentsSort(next);
+            });
+        });
+    }
+
+    // Also used for periodic refreshes: rows already on screen are kept and
+    // patched in place, so a refresh only costs what actually changed.
     async function loadAgents() {
         console.log('Starting to load agents...');
         const tbody = document.getElementById('agents-list');
@@ -208,39 +649,34 @@ def get_agents_table_js():
             throw new Error('Agents list element not found');
         }
 
-        showLoading();
+        // Drop cached pages from the previous load/sort
+        const state = agentsTableState;
+        const searchBox = document.getElementById('agent-search');
+        if (searchBox) {
+            // The search box is re-rendered on navigation; keep the filter in sync with it
+            state.query = searchBox.value.trim();
+        }
+        state.generation++;
+        state.pages.clear();
+        state.pending.clear();
+        state.statsQueue.clear();
+        state.statsRequested.clear();
+
+        const isRefresh = state.tbody === tbody && state.domRows.size > 0;
+        if (!isRefresh) {
+            state.statsById.clear();
+            showLoading();
+        }
+
         try {
-            const agents = await window.pywebview.api.get_agents();
-            if (!agents || agents.error) {
-                throw new Error(agents?.error || 'Failed to load agents');
-            }
-            
-            tbody.innerHTML = '';
-            agents.forEach(agent => {
-                const row = document.createElement('tr');
-                row.innerHTML = `
-                    <td class="agent-name">${agent.name}</td>
-                    <td class="numeric">${agent.messageCount}</td>
-                    <td class="numeric">${agent.toolCount}</td>
-                    <td class="numeric">${agent.memoryCount}</td>
-                    <td class="numeric">${agent.toolsEnabled}</td>
-                    <td>${agent.lastRun}</td>
-                    <td class="date">${formatDate(agent.lifespan)}</td>
-                    <td>
-                        <button class="chat-button" data-agent-id="${agent.id}">Chat</button>
-                        <button class="actions-menu">⋮</button>
-                    </td>
-                `;
-                tbody.appendChild(row);
-            });
+            const container = document.getElementById('agents-scroll');
+            const firstVisible = container ? Math.floor(container.scrollTop / AGENT_ROW_HEIGHT) : 0;
+            await fetchAgentsPage(Math.floor(firstVisible / AGENT_PAGE_SIZE));
+            console.log(`Agents table has ${state.total} rows`);
 
-            // Wait for next tick before attaching listeners
-            setTimeout(() => {
-                if (!attachEventListeners()) {
-                    console.log('Will retry event listeners in 100ms');
-                    setTimeout(attachEventListeners, 100);
-                }
-            }, 0);
+            attachTableListeners();
+            updateSortIndicators();
+            renderVisibleAgents();
             
         } catch (error) {
             console.error('Error loading agents:', error);
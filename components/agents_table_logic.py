@@ -0,0 +1,267 @@
+"""
+Backend logic for the agents table (components/agents_table.py).
+
+The pywebview bridge method get_agents(offset, limit, sort) delegates to
+get_agents_page() so the webview only ever receives the page of rows it is
+about to draw, instead of the whole agent list.
+
+Passing a query filters the listing through the search index in
+components/search_logic.py before paging.
+
+The per-row counters that are not part of the listing (message count,
+archival memory count, last run) are filled in by get_agent_stats(), which
+fetches them for a batch of agents at once with a bounded worker pool.
+
+Confirmed functionality against LettaSDKDemos:
+- Agent listing format from list_agents.py
+- Message retrieval from view_messages.py
+- Archival memory retrieval from manage_archival_memory.py
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from components.logger import setup_logger
+from components.search_logic import AgentSearchIndex, search_agents
+from LettaSDKDemos import agent_cache
+
+logger = setup_logger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Sort keys accepted from the table header; prefix with '-' for descending
+SORT_KEYS = {
+    'name': lambda row: (row['name'] or '').lower(),
+    'created': lambda row: row['lifespan'] or '',
+}
+
+# Bounded concurrency for stats requests so a large batch can't flood the server
+STATS_MAX_WORKERS = 8
+MAX_STATS_BATCH = 200       # agents whose requests are queued on the pool at once
+STATS_TTL = 60
+
+# Filtered results kept per (sort, query) so paging through them is cheap
+MAX_CACHED_SEARCHES = 16
+
+# Rows derived from the cached listing; rebuilt whenever the cache hands back a new list
+_snapshot = {'agents': None, 'rows': None, 'sorted': {}, 'results': {}, 'indexed': False}
+_snapshot_lock = threading.Lock()
+
+# Outlives snapshots so refreshes only re-index agents that changed
+_search_index = AgentSearchIndex()
+_index_lock = threading.Lock()
+
+_stats_cache = {}  # agent id -> (stats dict, fetched_at)
+_stats_lock = threading.Lock()
+
+def agent_to_row(agent):
+    """Convert an AgentState into the JSON-safe row the table renders"""
+    created_at = getattr(agent, 'created_at', None)
+    return {
+        'id': agent.id,
+        'name': agent.name,
+        'description': agent.description,
+        # Filled in lazily by get_agent_stats()
+        'messageCount': None,
+        'toolCount': len(agent.tools or []),
+        'memoryCount': None,
+        'toolsEnabled': len(agent.tools or []),
+        'lastRun': None,
+        # Datetimes don't serialize across the bridge, send ISO strings
+        'lifespan': created_at.isoformat() if created_at else None,
+    }
+
+def _get_rows(client):
+    """Return the listing snapshot, rebuilt when the shared cache has a newer listing"""
+    # Stale-while-revalidate: this never waits on the server once the listing is cached
+    agents = agent_cache.list_agents(client)
+    with _snapshot_lock:
+        if _snapshot['agents'] is agents:
+            return _snapshot
+
+        logger.debug("Agent listing changed, rebuilding table rows")
+        _snapshot['agents'] = agents
+        _snapshot['rows'] = [agent_to_row(agent) for agent in agents]
+        _snapshot['sorted'] = {}
+        _snapshot['results'] = {}
+        _snapshot['indexed'] = False
+        logger.info(f"Fetched {len(_snapshot['rows'])} agents")
+
+        # Sync the search index in the background so the first keystroke doesn't pay for it
+        threading.Thread(
+            target=_sync_search_index, args=(_snapshot['rows'],), daemon=True
+        ).start()
+        return _snapshot
+
+def _sync_search_index(rows):
+    with _index_lock:
+        if _snapshot['rows'] is rows and not _snapshot['indexed']:
+            _search_index.sync(rows)
+            _snapshot['indexed'] = True
+
+def _sorted_rows(snapshot, sort):
+    """Return the snapshot rows ordered by sort, memoized per sort key"""
+    if sort not in snapshot['sorted']:
+        key = SORT_KEYS[sort.lstrip('-')]
+        snapshot['sorted'][sort] = sorted(
+            snapshot['rows'], key=key, reverse=sort.startswith('-')
+        )
+    return snapshot['sorted'][sort]
+
+def _search_rows(client, snapshot, rows, sort, query):
+    """Return the sorted rows matching query, memoized per (sort, query)"""
+    key = (sort, query)
+    with _snapshot_lock:
+        if key in snapshot['results']:
+            return snapshot['results'][key]
+
+    # Matching can sync the index or ask the server (tag:), so it runs
+    # without _snapshot_lock and other page requests aren't held up
+    _sync_search_index(snapshot['rows'])
+    started = time.monotonic()
+    matches = search_agents(client, _search_index, query, lock=_index_lock)
+    found = [row for row in rows if row['id'] in matches]
+    logger.debug(
+        f"Search '{query}' matched {len(found)} agents in "
+        f"{(time.monotonic() - started) * 1000:.1f}ms"
+    )
+
+    with _snapshot_lock:
+        results = snapshot['results']
+        results[key] = found
+        if len(results) > MAX_CACHED_SEARCHES:
+            results.pop(next(iter(results)))
+    return found
+
+def invalidate_agents():
+    """Drop the cached listing so the next page request hits the server"""
+    agent_cache.invalidate_agents()
+
+def get_agents_page(client, offset=0, limit=DEFAULT_PAGE_SIZE, sort='name', query=None):
+    """Return one page of agent rows (optionally filtered by query) plus the total row count"""
+    try:
+        offset = max(int(offset or 0), 0)
+        limit = min(max(int(limit or DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+        sort = sort or 'name'
+        if sort.lstrip('-') not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+
+        snapshot = _get_rows(client)
+        query = (query or '').strip()
+        with _snapshot_lock:
+            rows = _sorted_rows(snapshot, sort)
+        if query:
+            rows = _search_rows(client, snapshot, rows, sort, query)
+
+        return {
+            'agents': rows[offset:offset + limit],
+            'total': len(rows),
+            'offset': offset,
+            'limit': limit,
+            'sort': sort,
+            'query': query,
+        }
+    except Exception as e:
+        logger.error(f"Error loading agents page: {str(e)}")
+        return {'error': str(e)}
+
+def _fetch_message_count(client, agent_id):
+    return client.get_recall_memory_summary(agent_id).size
+
+def _fetch_memory_count(client, agent_id):
+    return client.get_archival_memory_summary(agent_id).size
+
+def _fetch_last_run(client, agent_id):
+    # Recall is returned newest-first from the cursor, so one row is enough
+    messages = client.get_messages(agent_id=agent_id, limit=1)
+    if not messages:
+        return None
+    return messages[-1].created_at.isoformat()
+
+STAT_FETCHERS = {
+    'messageCount': _fetch_message_count,
+    'memoryCount': _fetch_memory_count,
+    'lastRun': _fetch_last_run,
+}
+
+def _cached_stats(agent_ids, max_age):
+    """Split agent_ids into cached stats and ids that still need fetching"""
+    now = time.monotonic()
+    cached, missing = {}, []
+    with _stats_lock:
+        for agent_id in agent_ids:
+            entry = _stats_cache.get(agent_id)
+            if entry and now - entry[1] < max_age:
+                cached[agent_id] = entry[0]
+            else:
+                missing.append(agent_id)
+    return cached, missing
+
+def invalidate_agent_stats(agent_ids=None):
+    """Forget cached stats for the given agents, or for all agents"""
+    with _stats_lock:
+        if agent_ids is None:
+            _stats_cache.clear()
+        else:
+            for agent_id in agent_ids:
+                _stats_cache.pop(agent_id, None)
+
+def get_agent_stats(client, agent_ids, max_workers=STATS_MAX_WORKERS, max_age=STATS_TTL):
+    """
+    Fetch table counters for many agents at once.
+
+    Every (agent, counter) request runs on one bounded thread pool and the
+    results come back as a single columnar payload:
+        {'ids': [...], 'messageCount': [...], 'memoryCount': [...],
+         'lastRun': [...], 'errors': {agent_id: message}}
+    Counters that failed to load are None. Large batches are fetched
+    MAX_STATS_BATCH agents at a time.
+    """
+    try:
+        agent_ids = list(dict.fromkeys(agent_ids or []))
+        stats, missing = _cached_stats(agent_ids, max_age)
+        errors = {}
+
+        if missing:
+            logger.debug(f"Fetching stats for {len(missing)} agents ({len(stats)} cached)")
+            started = time.monotonic()
+            futures = {}
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for start in range(0, len(missing), MAX_STATS_BATCH):
+                    chunk = {
+                        (agent_id, column): pool.submit(fetch, client, agent_id)
+                        for agent_id in missing[start:start + MAX_STATS_BATCH]
+                        for column, fetch in STAT_FETCHERS.items()
+                    }
+                    wait(chunk.values())
+                    futures.update(chunk)
+
+            fetched = {agent_id: {} for agent_id in missing}
+            for (agent_id, column), future in futures.items():
+                try:
+                    fetched[agent_id][column] = future.result()
+                except Exception as e:
+                    fetched[agent_id][column] = None
+                    errors[agent_id] = str(e)
+
+            now = time.monotonic()
+            with _stats_lock:
+                for agent_id, values in fetched.items():
+                    # Only cache complete results so failures are retried
+                    if agent_id not in errors:
+                        _stats_cache[agent_id] = (values, now)
+            stats.update(fetched)
+            logger.info(
+                f"Fetched {len(futures)} agent stats in "
+                f"{time.monotonic() - started:.2f}s ({len(errors)} agents with errors)"
+            )
+
+        payload = {'ids': agent_ids, 'errors': errors}
+        for column in STAT_FETCHERS:
+            payload[column] = [stats[agent_id].get(column) for agent_id in agent_ids]
+        return payload
+    except Exception as e:
+        logger.error(f"Error loading agent stats: {str(e)}")
+        return {'error': str(e)}
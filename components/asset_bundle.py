@@ -0,0 +1,276 @@
+"""
+Startup asset bundle for the desktop window.
+
+Every component returns its HTML/CSS/JS as Python strings. Instead of
+stitching those together on every launch, build_bundle() collects all of
+them once, drops duplicate CSS rules and JS blocks, strips comments and
+indentation, and the result is written to a content-hashed file in the
+disk cache.
+
+load_bundle() fingerprints the component source files first; when nothing
+changed since the last launch the cached bundle is read straight from disk
+and no component code runs at all.
+
+Bundle layout:
+    {'hash': ..., 'fingerprint': ...,
+     'html': {'navbar': ..., 'header': ..., 'agentsTable': ..., ...},
+     'styles': '<one stylesheet>', 'script': '<one script>',
+     'lazy': {'createAgentModal': {'html', 'styles', 'script', 'mount'}, ...}}
+
+Only what the agents page shows goes into the initial payload. Lazy
+components are handed out one at a time by get_lazy_component(), which
+backs the get_lazy_component bridge call of the component loader
+(components/component_loader.py).
+
+get_components_js() turns bundle['html'] into the window.components map
+the page manager renders pages from.
+"""
+
+import glob
+import hashlib
+import importlib
+import json
+import os
+import re
+import time
+
+from components.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Bump when the bundle layout or minifier changes so old caches are rebuilt
+BUNDLE_FORMAT = 2
+
+COMPONENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_CACHE_DIR = os.path.join(os.path.dirname(COMPONENTS_DIR), '.cache', 'ui_bundle')
+MANIFEST_NAME = 'manifest.json'
+
+# Last bundle handed to the window; lazy components are served from it
+_current_bundle = None
+
+# (window.components key, module, html getter, styles getter, js getter, lazy mount)
+# Order matters: styles cascade and scripts run in this order, and the page
+# manager goes last because it takes over history on load.
+# Lazy components are left out of the initial payload; their mount says
+# whether the markup is appended to <body> or registered as a page template.
+COMPONENTS = [
+    ('navbar', 'components.navbar', 'get_navbar_html', 'get_navbar_styles', None, None),
+    ('header', 'components.header', 'get_header_html', 'get_header_styles', None, None),
+    ('search', 'components.search',
+     'get_search_html', 'get_search_styles', 'get_search_js', None),
+    ('agentsTable', 'components.agents_table',
+     'get_agents_table_html', 'get_agents_table_styles', 'get_agents_table_js', None),
+    ('chatConfig', 'components.chat_config',
+     'get_chat_config_html', 'get_chat_config_styles', 'get_chat_config_js', 'page'),
+    ('createAgentModal', 'components.create_agent',
+     'get_create_agent_modal_html', 'get_create_agent_modal_styles',
+     'get_create_agent_modal_js', 'body'),
+    ('jobStatus', 'components.job_status', None, 'get_job_status_styles', 'get_job_status_js', None),
+    ('componentLoader', 'components.component_loader', None, None, 'get_component_loader_js', None),
+    ('pageManager', 'components.page_manager', None, None, 'get_page_manager_js', None),
+]
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+
+def _split_css(css):
+    """Split a stylesheet into top-level blocks, keeping @media/@keyframes whole"""
+    blocks, depth, start = [], 0, 0
+    for i, char in enumerate(css):
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append(css[start:i + 1].strip())
+                start = i + 1
+    return blocks
+
+def _minify_css_block(block):
+    block = re.sub(r'\s+', ' ', block)
+    block = re.sub(r'\s*([{};,>])\s*', r'\1', block)
+    # Only the space after ':' is safe to drop, 'a :hover' differs from 'a:hover'
+    block = re.sub(r':\s+', ':', block)
+    return block.replace(';}', '}')
+
+def minify_css(stylesheets):
+    """Join stylesheets into one, dropping comments and exact duplicate rules"""
+    blocks = []
+    for css in stylesheets:
+        css = _CSS_COMMENT_RE.sub('', css)
+        blocks.extend(_minify_css_block(block) for block in _split_css(css))
+
+    # Keep the last copy of a duplicated rule: it is the one that wins the
+    # cascade, so dropping the earlier copies can't change any computed style
+    seen, deduped = set(), []
+    for block in reversed(blocks):
+        if block not in seen:
+            seen.add(block)
+            deduped.append(block)
+    return ''.join(reversed(deduped))
+
+def minify_js(source):
+    """
+    Drop full-line comments, blank lines and indentation.
+
+    Only whole lines are touched, and never inside a template literal, so
+    string contents (including the HTML templates) are left exactly as is.
+    """
+    lines, in_template = [], False
+    for line in source.splitlines():
+        stripped = line.strip()
+        if not in_template:
+            if not stripped or stripped.startswith('//'):
+                continue
+            line = stripped
+        lines.append(line)
+        in_template ^= _count_backticks(line) % 2 == 1
+    return '\n'.join(lines)
+
+def _count_backticks(line):
+    # Backticks inside '...' or "..." strings don't open a template literal
+    count, quote, escaped = 0, None, False
+    for char in line:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+        elif char == '`':
+            count += 1
+    return count
+
+def minify_html(html):
+    html = _HTML_COMMENT_RE.sub('', html)
+    return '\n'.join(line.strip() for line in html.splitlines() if line.strip())
+
+def source_fingerprint():
+    """Hash of every component source file that can change the bundle"""
+    digest = hashlib.sha256(f'format:{BUNDLE_FORMAT}'.encode())
+    paths = sorted(glob.glob(os.path.join(COMPONENTS_DIR, '**', '*.py'), recursive=True))
+    for path in paths:
+        # Bridge logic never ends up in the bundle
+        if path.endswith('_logic.py'):
+            continue
+        digest.update(os.path.relpath(path, COMPONENTS_DIR).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def build_bundle(fingerprint=None):
+    """Collect every component's HTML/CSS/JS into one deduped, minified bundle"""
+    started = time.monotonic()
+    html, stylesheets, scripts, lazy = {}, [], [], {}
+    for key, module_name, html_getter, styles_getter, js_getter, mount in COMPONENTS:
+        module = importlib.import_module(module_name)
+        if mount:
+            lazy[key] = {
+                'html': minify_html(getattr(module, html_getter)()),
+                'styles': minify_css([getattr(module, styles_getter)()]),
+                'script': minify_js(getattr(module, js_getter)()),
+                'mount': mount,
+            }
+            continue
+        if html_getter:
+            html[key] = minify_html(getattr(module, html_getter)())
+        if styles_getter:
+            stylesheets.append(getattr(module, styles_getter)())
+        if js_getter:
+            script = minify_js(getattr(module, js_getter)())
+            if script not in scripts:
+                scripts.append(script)
+
+    bundle = {
+        'fingerprint': fingerprint or source_fingerprint(),
+        'html': html,
+        'styles': minify_css(stylesheets),
+        # Each component script ends in a statement, the ';' guards against ASI surprises
+        'script': '\n;\n'.join(scripts),
+        'lazy': lazy,
+    }
+    content = json.dumps(
+        [bundle['html'], bundle['styles'], bundle['script'], bundle['lazy']], sort_keys=True
+    )
+    bundle['hash'] = hashlib.sha256(content.encode()).hexdigest()[:16]
+    logger.info(f"Built UI bundle {bundle['hash']} in {time.monotonic() - started:.3f}s")
+    return bundle
+
+def _write_json(path, data):
+    # Write-then-rename so a crash mid-write never leaves a truncated bundle
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _read_cached_bundle(cache_dir, fingerprint):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('fingerprint') != fingerprint:
+            return None
+        with open(os.path.join(cache_dir, manifest['bundle']), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError, KeyError):
+        return None
+
+def save_bundle(bundle, cache_dir=BUNDLE_CACHE_DIR):
+    """Write bundle-<hash>.json, point the manifest at it and prune old bundles"""
+    os.makedirs(cache_dir, exist_ok=True)
+    bundle_name = f"bundle-{bundle['hash']}.json"
+    _write_json(os.path.join(cache_dir, bundle_name), bundle)
+    _write_json(os.path.join(cache_dir, MANIFEST_NAME), {
+        'fingerprint': bundle['fingerprint'],
+        'bundle': bundle_name,
+    })
+    for path in glob.glob(os.path.join(cache_dir, 'bundle-*.json')):
+        if os.path.basename(path) != bundle_name:
+            os.remove(path)
+
+def load_bundle(cache_dir=BUNDLE_CACHE_DIR, use_cache=True):
+    """Return the UI bundle, from the disk cache when the components are unchanged"""
+    global _current_bundle
+    started = time.monotonic()
+    fingerprint = source_fingerprint()
+    if use_cache:
+        bundle = _read_cached_bundle(cache_dir, fingerprint)
+        if bundle is not None:
+            logger.info(
+                f"Loaded cached UI bundle {bundle['hash']} in "
+                f"{time.monotonic() - started:.3f}s"
+            )
+            _current_bundle = bundle
+            return bundle
+
+    bundle = build_bundle(fingerprint)
+    if use_cache:
+        try:
+            save_bundle(bundle, cache_dir)
+        except OSError as e:
+            # A read-only install still works, it just rebuilds every launch
+            logger.warning(f"Could not write UI bundle cache: {str(e)}")
+    _current_bundle = bundle
+    return bundle
+
+def get_lazy_component(name, bundle=None):
+    """Return one lazy component's markup, styles and script"""
+    global _current_bundle
+    try:
+        if bundle is None:
+            if _current_bundle is None:
+                _current_bundle = load_bundle()
+            bundle = _current_bundle
+        if name not in bundle['lazy']:
+            raise ValueError(f"Unknown lazy component: {name}")
+        logger.debug(f"Serving lazy component {name}")
+        return bundle['lazy'][name]
+    except Exception as e:
+        logger.error(f"Error loading component {name}: {str(e)}")
+        return {'error': str(e)}
+
+def get_components_js(bundle):
+    """Script defining window.components for the page manager"""
+    return f"window.components = {json.dumps(bundle['html'])};"
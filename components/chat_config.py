@@ -45,10 +45,27 @@ def get_chat_config_html():
                     <h3>Human Persona</h3>
                     <div class="persona-content"></div>
                 </div>
+                
+                <div class="agent-tools">
+                    <h3>TOOLS</h3>
+                    <div class="model-name tools-content"></div>
+                </div>
+                
+                <div class="agent-sources">
+                    <h3>DATA SOURCES</h3>
+                    <div class="model-name sources-content"></div>
+                </div>
             </aside>
             
             <main class="chat-area">
-                <!-- Chat interface will go here -->
+                <div class="chat-messages">
+                    <div class="chat-history"></div>
+                    <div class="chat-live"></div>
+                </div>
+                <form class="chat-input-form">
+                    <textarea class="chat-input" rows="2" placeholder="Message the agent..."></textarea>
+                    <button type="submit" class="chat-send-btn">Send</button>
+                </form>
             </main>
         </div>
     </div>
@@ -123,7 +140,9 @@ def get_chat_config_styles():
     .embedding-info,
     .core-memory,
     .agent-persona,
-    .human-persona {
+    .human-persona,
+    .agent-tools,
+    .agent-sources {
         margin-bottom: 24px;
     }
     
@@ -131,33 +150,657 @@ def get_chat_config_styles():
         color: #ffffff;
         font-size: 14px;
     }
+    
+    .chat-area {
+        flex: 1;
+        display: flex;
+        flex-direction: column;
+        min-width: 0;
+    }
+    
+    .chat-messages {
+        flex: 1;
+        overflow-y: auto;
+        padding: 20px;
+        display: flex;
+        flex-direction: column;
+        gap: 8px;
+    }
+    
+    .chat-history,
+    .chat-live,
+    .chat-page {
+        display: flex;
+        flex-direction: column;
+        gap: 8px;
+    }
+    
+    .chat-message {
+        max-width: 75%;
+        padding: 8px 12px;
+        border-radius: 6px;
+        font-size: 14px;
+        white-space: pre-wrap;
+        word-break: break-word;
+    }
+    
+    .chat-message.user {
+        align-self: flex-end;
+        background-color: #238636;
+        color: #ffffff;
+    }
+    
+    .chat-message.assistant {
+        align-self: flex-start;
+        background-color: #21262d;
+        color: #ffffff;
+    }
+    
+    .chat-thought,
+    .chat-tool-call,
+    .chat-tool-return,
+    .chat-system {
+        align-self: flex-start;
+        color: #8b949e;
+        font-size: 12px;
+        white-space: pre-wrap;
+        word-break: break-word;
+    }
+    
+    .chat-thought {
+        font-style: italic;
+    }
+    
+    .chat-system {
+        align-self: center;
+        max-width: 75%;
+    }
+    
+    .chat-tool-call,
+    .chat-tool-return {
+        font-family: monospace;
+    }
+    
+    .chat-tool-return.error,
+    .chat-error {
+        color: #f85149;
+    }
+    
+    .chat-input-form {
+        display: flex;
+        gap: 8px;
+        padding: 16px;
+        border-top: 1px solid #21262d;
+    }
+    
+    .chat-input {
+        flex: 1;
+        background-color: #0D1117;
+        border: 1px solid #30363d;
+        border-radius: 6px;
+        padding: 8px 12px;
+        color: #ffffff;
+        font-size: 14px;
+        resize: none;
+    }
+    
+    .chat-send-btn {
+        background-color: #238636;
+        color: #ffffff;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 6px;
+        cursor: pointer;
+        font-size: 14px;
+    }
+    
+    .chat-send-btn:disabled {
+        opacity: 0.6;
+        cursor: default;
+    }
     """
 
 def get_chat_config_js():
     return """
-    async function loadChatConfig(agentId) {
+    // Predictive prefetch for the chat page. The agents table calls hover()
+    // when the pointer rests on a row and idle() for visible rows when the
+    // browser is idle; loadChatConfig() then picks up the prefetched config
+    // instead of starting a round-trip after the click.
+    const PREFETCH_HOVER_DELAY_MS = 120;
+    const PREFETCH_MAX_CONCURRENT = 2;
+    const PREFETCH_MAX_ENTRIES = 20;     // prefetched agents kept around (LRU)
+    const PREFETCH_IDLE_BUDGET = 5;      // agents prefetched per idle period
+    const PREFETCH_TTL_MS = 30000;
+
+    class AgentPrefetcher {
+        constructor() {
+            this.entries = new Map();    // agent id -> {promise, fetchedAt}, oldest first
+            this.queue = [];             // agent ids waiting for a free slot
+            this.inFlight = 0;
+            this.hoverTimer = null;
+            this.hoverAgentId = null;
+        }
+
+        isFresh(agentId) {
+            const entry = this.entries.get(agentId);
+            return entry && Date.now() - entry.fetchedAt < PREFETCH_TTL_MS;
+        }
+
+        hover(agentId) {
+            if (agentId === this.hoverAgentId) {
+                return;
+            }
+            this.cancelHover();
+            this.hoverAgentId = agentId;
+            this.hoverTimer = setTimeout(() => {
+                this.hoverTimer = null;
+                // Hover intent jumps the idle queue
+                this.enqueue(agentId, true);
+            }, PREFETCH_HOVER_DELAY_MS);
+        }
+
+        cancelHover() {
+            if (this.hoverTimer) {
+                clearTimeout(this.hoverTimer);
+                this.hoverTimer = null;
+            }
+            if (this.hoverAgentId) {
+                this.cancel(this.hoverAgentId);
+            }
+            this.hoverAgentId = null;
+        }
+
+        idle(agentIds) {
+            const schedule = window.requestIdleCallback || ((callback) => setTimeout(callback, 200));
+            schedule(() => {
+                // Rows that scrolled out of view are no longer worth prefetching
+                const visible = new Set(agentIds);
+                this.queue = this.queue.filter(id => visible.has(id) || id === this.hoverAgentId);
+                agentIds
+                    .filter(agentId => !this.isFresh(agentId))
+                    .slice(0, PREFETCH_IDLE_BUDGET)
+                    .forEach(agentId => this.enqueue(agentId, false));
+            });
+        }
+
+        // Drop queued (not yet started) prefetches, e.g. when rows scroll away
+        cancel(agentId) {
+            if (agentId === undefined) {
+                this.queue = [];
+            } else {
+                this.queue = this.queue.filter(id => id !== agentId);
+            }
+        }
+
+        enqueue(agentId, urgent) {
+            if (this.isFresh(agentId) || this.queue.includes(agentId)) {
+                return;
+            }
+            if (urgent) {
+                this.queue.unshift(agentId);
+            } else {
+                this.queue.push(agentId);
+            }
+            this.pump();
+        }
+
+        pump() {
+            while (this.inFlight < PREFETCH_MAX_CONCURRENT && this.queue.length > 0) {
+                this.start(this.queue.shift());
+            }
+        }
+
+        start(agentId) {
+            console.log('Prefetching agent:', agentId);
+            this.inFlight++;
+            const promise = window.pywebview.api.prefetch_agent(agentId)
+                .then(config => {
+                    if (!config || config.error) {
+                        this.entries.delete(agentId);
+                        throw new Error(config?.error || 'Prefetch failed');
+                    }
+                    return config;
+                })
+                .finally(() => {
+                    this.inFlight--;
+                    this.pump();
+                });
+            // Unhandled rejections are fine here; take() callers see the error
+            promise.catch(error => console.warn(`Prefetch of ${agentId} failed:`, error));
+
+            this.entries.delete(agentId);
+            this.entries.set(agentId, { promise, fetchedAt: Date.now() });
+            while (this.entries.size > PREFETCH_MAX_ENTRIES) {
+                this.entries.delete(this.entries.keys().next().value);
+            }
+        }
+
+        // Hand over a fresh prefetched config (or in-flight request), if any
+        take(agentId) {
+            if (!this.isFresh(agentId)) {
+                return null;
+            }
+            return this.entries.get(agentId).promise;
+        }
+    }
+
+    window.agentPrefetcher = new AgentPrefetcher();
+
+    // Fills in the chat page element it was given, not whatever page is
+    // attached when the request returns: the user may navigate meanwhile.
+    // Returns false if the config couldn't be loaded.
+    async function loadChatConfig(agentId, page) {
+        // History pages load alongside the config instead of after it
+        window.chatHistory.open(page.querySelector('.chat-area'), agentId);
         try {
-            const agent = await window.pywebview.api.get_agent_config(agentId);
+            const prefetched = window.agentPrefetcher.take(agentId);
+            const agent = prefetched
+                ? await prefetched.catch(() => window.pywebview.api.get_agent_config(agentId))
+                : await window.pywebview.api.get_agent_config(agentId);
+            if (!agent || agent.error) {
+                throw new Error(agent?.error || 'Failed to load agent config');
+            }
             
-            document.querySelector('.agent-name').textContent = agent.name;
-            document.querySelector('.agent-id').textContent = `Agent ID: ${agent.id}`;
+            page.querySelector('.agent-name').textContent = agent.name;
+            page.querySelector('.model-info .model-name').textContent = agent.model;
+            page.querySelector('.embedding-info .model-name').textContent = agent.embedding_model;
+            page.querySelector('.agent-id').textContent = `Agent ID: ${agent.id}`;
             
             // Load core memory
-            document.querySelector('.core-memory .memory-content').innerHTML = 
+            page.querySelector('.core-memory .memory-content').innerHTML = 
                 `<pre>${agent.core_memory || 'No core memory'}</pre>`;
                 
             // Load personas
-            document.querySelector('.agent-persona .persona-content').innerHTML = 
+            page.querySelector('.agent-persona .persona-content').innerHTML = 
                 `<pre>${agent.agent_persona || 'No agent persona'}</pre>`;
-            document.querySelector('.human-persona .persona-content').innerHTML = 
+            page.querySelector('.human-persona .persona-content').innerHTML = 
                 `<pre>${agent.human_persona || 'No human persona'}</pre>`;
-                
+
+            // Tools and sources are optional parts of the payload
+            const names = (items, empty) => items === null
+                ? 'Failed to load'
+                : items.map(item => item.name).join(', ') || empty;
+            page.querySelector('.agent-tools .tools-content').textContent = names(agent.tools, 'No tools');
+            page.querySelector('.agent-sources .sources-content').textContent = names(agent.sources, 'No data sources');
+
+            console.log('Chat config sub-request timings (ms):', agent.timings);
+            if (Object.keys(agent.errors).length) {
+                console.warn('Chat config loaded with errors:', agent.errors);
+            }
+            return true;
         } catch (error) {
             console.error('Error loading chat config:', error);
+            return false;
+        }
+    }
+    
+    // Streaming chat. send_chat_message starts the reply on the Python side
+    // (see start_chat_stream in chat_config_logic.py), which then pushes
+    // batches of events into receive() as tokens arrive. Deltas that share
+    // an id are appended to the same element, so the reply renders as it is
+    // generated instead of after the whole step.
+    const CHAT_STICK_TO_BOTTOM_PX = 40;
+    const CHAT_EVENT_CLASSES = {
+        thought: 'chat-thought',
+        assistant: 'chat-message assistant',
+        tool_call: 'chat-tool-call',
+        tool_return: 'chat-tool-return',
+        user: 'chat-message user',
+        system: 'chat-system',
+        error: 'chat-error'
+    };
+
+    class ChatStream {
+        constructor() {
+            this.streams = new Map();   // stream id -> {page, nodes, assistantCalls, started}
+            this.early = new Map();     // stream id -> events that beat send() back
+        }
+
+        async send(form) {
+            const input = form.querySelector('.chat-input');
+            const text = input.value.trim();
+            const agentId = window.pageManager.currentAgentId;
+            if (!text || !agentId || form.dataset.streaming) {
+                return;
+            }
+
+            // Keep element references: the page may be detached while streaming
+            const page = form.closest('.chat-area');
+            await window.chatHistory.jumpToLatest(page);
+            this.appendNode(page, 'chat-message user').textContent = text;
+            input.value = '';
+            this.setStreaming(form, true);
+
+            try {
+                const result = await window.pywebview.api.send_chat_message(agentId, text);
+                if (result.error) {
+                    throw new Error(result.error);
+                }
+                this.streams.set(result.stream_id, {
+                    page,
+                    form,
+                    nodes: new Map(),
+                    assistantCalls: new Set(),
+                    started: performance.now(),
+                    firstEventLogged: false
+                });
+                const early = this.early.get(result.stream_id);
+                if (early) {
+                    this.early.delete(result.stream_id);
+                    this.receive(result.stream_id, early);
+                }
+            } catch (error) {
+                console.error('Error sending message:', error);
+                this.appendNode(page, 'chat-error').textContent = `Error: ${error.message}`;
+                this.setStreaming(form, false);
+            }
+        }
+
+        setStreaming(form, streaming) {
+            if (streaming) {
+                form.dataset.streaming = 'true';
+            } else {
+                delete form.dataset.streaming;
+            }
+            form.querySelector('.chat-send-btn').disabled = streaming;
+        }
+
+        appendNode(page, className) {
+            const node = document.createElement('div');
+            node.className = className;
+            page.querySelector('.chat-live').appendChild(node);
+            return node;
+        }
+
+        // One element per (event type, id); later deltas append to its text node
+        streamNode(stream, type, id) {
+            const key = `${type}:${id}`;
+            if (!stream.nodes.has(key)) {
+                const node = this.appendNode(stream.page, CHAT_EVENT_CLASSES[type]);
+                node.appendChild(document.createTextNode(''));
+                stream.nodes.set(key, node);
+            }
+            return stream.nodes.get(key);
+        }
+
+        receive(streamId, events) {
+            const stream = this.streams.get(streamId);
+            if (!stream) {
+                this.early.set(streamId, [...(this.early.get(streamId) || []), ...events]);
+                return;
+            }
+            if (!stream.firstEventLogged) {
+                stream.firstEventLogged = true;
+                console.log(`First chat tokens after ${Math.round(performance.now() - stream.started)}ms`);
+            }
+
+            const messages = stream.page.querySelector('.chat-messages');
+            const atBottom = messages.scrollHeight - messages.scrollTop - messages.clientHeight < CHAT_STICK_TO_BOTTOM_PX;
+
+            events.forEach(event => this.applyEvent(stream, streamId, event));
+
+            if (atBottom) {
+                messages.scrollTop = messages.scrollHeight;
+            }
+        }
+
+        applyEvent(stream, streamId, event) {
+            switch (event.type) {
+                case 'thought':
+                case 'assistant':
+                    if (event.type === 'assistant') {
+                        stream.assistantCalls.add(event.id);
+                    }
+                    this.streamNode(stream, event.type, event.id).firstChild.appendData(event.text);
+                    break;
+                case 'tool_call': {
+                    const node = this.streamNode(stream, 'tool_call', event.id);
+                    node.firstChild.appendData(event.name ? `${event.name} ` : '');
+                    node.firstChild.appendData(event.arguments);
+                    break;
+                }
+                case 'tool_return': {
+                    // send_message returns None; its text is already on screen
+                    if (stream.assistantCalls.has(event.id)) {
+                        break;
+                    }
+                    const node = this.streamNode(stream, 'tool_return', event.id);
+                    node.classList.toggle('error', event.status === 'error');
+                    node.firstChild.appendData(`→ ${event.text}`);
+                    break;
+                }
+                case 'error':
+                    this.appendNode(stream.page, 'chat-error').textContent = `Error: ${event.error}`;
+                    break;
+                case 'usage':
+                    console.log('Chat usage:', event);
+                    break;
+                case 'status':
+                    // 'closed' is always the last event, also after 'cancelled'; dropping
+                    // the stream any earlier would park it in this.early for good
+                    if (event.status === 'cancelled') {
+                        console.log(`Chat stream cancelled after ${Math.round(performance.now() - stream.started)}ms`);
+                    } else if (event.status === 'closed') {
+                        console.log(`Chat stream closed after ${Math.round(performance.now() - stream.started)}ms`);
+                        this.setStreaming(stream.form, false);
+                        this.streams.delete(streamId);
+                        // The server's latest page no longer lines up with the cursors
+                        window.chatHistory.markStale(stream.page);
+                    }
+                    break;
+            }
         }
     }
+
+    window.chatStream = new ChatStream();
+
+    // Chat history is a window over the full conversation. Pages of
+    // CHAT_HISTORY_PAGE_SIZE messages are fetched backward with cursors
+    // (get_message_history in chat_config_logic.py) as the user scrolls up,
+    // and at most CHAT_MAX_LOADED_PAGES stay in the DOM: the page farthest
+    // from the viewport is dropped and re-fetched by its cursor if the user
+    // scrolls back. Page i is always fetched with cursors[i], so only those
+    // id strings grow with the size of the history.
+    const CHAT_HISTORY_PAGE_SIZE = 50;
+    const CHAT_MAX_LOADED_PAGES = 6;
+    const CHAT_LOAD_THRESHOLD_PX = 300;
+
+    function createChatEntryNode(entry) {
+        const node = document.createElement('div');
+        node.className = CHAT_EVENT_CLASSES[entry.type] || 'chat-system';
+        if (entry.type === 'tool_call') {
+            node.textContent = `${entry.name} ${entry.arguments}`;
+        } else if (entry.type === 'tool_return') {
+            node.classList.toggle('error', entry.status === 'error');
+            node.textContent = `→ ${entry.text}`;
+        } else {
+            node.textContent = entry.text;
+        }
+        if (entry.created_at) {
+            node.title = new Date(entry.created_at).toLocaleString();
+        }
+        return node;
+    }
+
+    class ChatHistory {
+        constructor() {
+            this.views = new WeakMap();   // .chat-area element -> history view
+        }
+
+        async open(area, agentId) {
+            const view = {
+                agentId,
+                cursors: [null],     // cursors[i]: `before` cursor of page i, 0 = newest
+                pages: new Map(),    // loaded page index -> element
+                newest: 0,
+                oldest: -1,
+                loading: false,
+                stale: false
+            };
+            this.views.set(area, view);
+            area.querySelector('.chat-history').replaceChildren();
+            area.querySelector('.chat-live').replaceChildren();
+            area.querySelector('.chat-live').hidden = false;
+
+            await this.loadOlder(area, view);
+            const messages = area.querySelector('.chat-messages');
+            messages.scrollTop = messages.scrollHeight;
+            // Short pages don't scroll, so keep going until they do
+            while (view === this.views.get(area) && messages.scrollHeight <= messages.clientHeight
+                   && await this.loadOlder(area, view)) {
+                messages.scrollTop = messages.scrollHeight;
+            }
+        }
+
+        async fetchPage(view, index) {
+            const page = await window.pywebview.api.get_message_history(
+                view.agentId, view.cursors[index], CHAT_HISTORY_PAGE_SIZE
+            );
+            if (page.error) {
+                throw new Error(page.error);
+            }
+            view.cursors[index + 1] = page.older;
+            const element = document.createElement('div');
+            element.className = 'chat-page';
+            element.dataset.page = index;
+            element.append(...page.entries.map(createChatEntryNode));
+            return element;
+        }
+
+        // Returns true when a page was added
+        async loadOlder(area, view) {
+            const index = view.oldest + 1;
+            if (view.loading || (index > 0 && view.cursors[index] === null)) {
+                return false;
+            }
+            view.loading = true;
+            try {
+                const element = await this.fetchPage(view, index);
+                if (this.views.get(area) !== view) {
+                    return false;
+                }
+                const messages = area.querySelector('.chat-messages');
+                const previousHeight = messages.scrollHeight;
+                area.querySelector('.chat-history').prepend(element);
+                // Keep what the user is reading in place
+                messages.scrollTop += messages.scrollHeight - previousHeight;
+                view.pages.set(index, element);
+                view.oldest = index;
+
+                if (view.pages.size > CHAT_MAX_LOADED_PAGES) {
+                    view.pages.get(view.newest).remove();
+                    view.pages.delete(view.newest);
+                    view.newest++;
+                    area.querySelector('.chat-live').hidden = true;
+                }
+                return true;
+            } catch (error) {
+                console.error('Error loading chat history:', error);
+                return false;
+            } finally {
+                view.loading = false;
+            }
+        }
+
+        async loadNewer(area, view) {
+            const index = view.newest - 1;
+            if (view.loading || index < 0) {
+                return;
+            }
+            if (index === 0 && view.stale) {
+                await this.open(area, view.agentId);
+                return;
+            }
+            view.loading = true;
+            try {
+                const element = await this.fetchPage(view, index);
+                if (this.views.get(area) !== view) {
+                    return;
+                }
+                area.querySelector('.chat-history').append(element);
+                view.pages.set(index, element);
+                view.newest = index;
+                if (index === 0) {
+                    area.querySelector('.chat-live').hidden = false;
+                }
+
+                if (view.pages.size > CHAT_MAX_LOADED_PAGES) {
+                    const messages = area.querySelector('.chat-messages');
+                    const dropped = view.pages.get(view.oldest);
+                    const droppedHeight = dropped.offsetHeight;
+                    dropped.remove();
+                    messages.scrollTop -= droppedHeight;
+                    view.pages.delete(view.oldest);
+                    view.oldest--;
+                }
+            } catch (error) {
+                console.error('Error loading chat history:', error);
+            } finally {
+                view.loading = false;
+            }
+        }
+
+        onScroll(messages) {
+            const area = messages.closest('.chat-area');
+            const view = this.views.get(area);
+            if (!view) {
+                return;
+            }
+            if (messages.scrollTop < CHAT_LOAD_THRESHOLD_PX) {
+                this.loadOlder(area, view);
+            } else if (messages.scrollHeight - messages.scrollTop - messages.clientHeight < CHAT_LOAD_THRESHOLD_PX) {
+                this.loadNewer(area, view);
+            }
+        }
+
+        async jumpToLatest(area) {
+            const view = this.views.get(area);
+            if (view && view.newest !== 0) {
+                await this.open(area, view.agentId);
+            }
+            const messages = area.querySelector('.chat-messages');
+            messages.scrollTop = messages.scrollHeight;
+        }
+
+        markStale(area) {
+            const view = this.views.get(area);
+            if (view) {
+                view.stale = true;
+            }
+        }
+    }
+
+    window.chatHistory = new ChatHistory();
+
+    // scroll doesn't bubble, so listen in the capture phase for every chat page
+    document.addEventListener('scroll', (event) => {
+        if (event.target.matches && event.target.matches('.chat-messages')) {
+            window.chatHistory.onScroll(event.target);
+        }
+    }, true);
+
+    // Delegated: chat pages are built (and cached) after this script runs
+    document.addEventListener('submit', (event) => {
+        const form = event.target.closest('.chat-input-form');
+        if (form) {
+            event.preventDefault();
+            window.chatStream.send(form);
+        }
+    });
+
+    // Enter sends, Shift+Enter adds a newline
+    document.addEventListener('keydown', (event) => {
+        if (event.key === 'Enter' && !event.shiftKey && event.target.matches('.chat-input')) {
+            event.preventDefault();
+            window.chatStream.send(event.target.closest('.chat-input-form'));
+        }
+    });
     
-    document.querySelector('.back-button').addEventListener('click', () => {
-        window.pywebview.api.navigate_to_agents();
+    // Delegated: chat pages are built (and cached) after this script runs.
+    // Navigating in JS restores the cached agents page instead of a re-render.
+    document.addEventListener('click', (event) => {
+        if (event.target.closest('.back-button')) {
+            window.pageManager.navigateToAgents();
+        }
     });
     """ 
\ No newline at end of file
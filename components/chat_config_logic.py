@@ -0,0 +1,444 @@
+"""
+Backend logic for the chat configuration page (components/chat_config.py).
+
+get_agent_config() backs the get_agent_config bridge call used by
+loadChatConfig(). The agent, its in-context memory, its tools and its
+data sources are fetched concurrently and merged into one payload, along
+with how long each sub-request took. prefetch_agent() backs the prefetch_agent bridge call
+the agents table fires on row hover / browser idle: it warms the shared
+cache with the agent config and its latest page of history so opening
+the chat afterwards doesn't wait on the server.
+
+get_message_history() backs the get_message_history bridge call: one
+cursor-paginated page of chat history at a time, so an agent with a huge
+history opens as fast as a new one.
+
+start_chat_stream() backs the send_chat_message bridge call. The agent's
+reply is streamed token by token from the Letta server and pushed into the
+page as it arrives (inner thoughts, tool calls, tool returns and the
+send_message text), instead of waiting for the whole step to finish.
+
+Confirmed functionality against LettaSDKDemos:
+- Agent configuration retrieval from get_agent_info.py
+- Memory block structure from update_core_memory.py
+- Message retrieval from view_messages.py
+- Message decoding from message_model.py
+- Message sending from update_system_prompt.py
+- Agent tools endpoint from manage_agent_tools.py
+- Agent sources endpoint from manage_data_sources.py
+"""
+
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from components.agents_table_logic import invalidate_agent_stats
+from components.logger import setup_logger
+from LettaSDKDemos.agent_cache import cache, get_agent
+from LettaSDKDemos.message_history import get_message_page
+from LettaSDKDemos.message_model import Role, parse_message
+
+logger = setup_logger(__name__)
+
+# Chat history is paged backward from the newest message with cursors
+HISTORY_PAGE_SIZE = 50
+MAX_HISTORY_PAGE_SIZE = 200
+SYSTEM_PREVIEW_CHARS = 300
+
+# Stream events are pushed to the page in batches at most this often (seconds);
+# the first event of a stream is always pushed right away
+STREAM_FLUSH_INTERVAL = 0.03
+# The tool whose 'message' argument is the agent's visible reply
+ASSISTANT_MESSAGE_TOOL = 'send_message'
+ASSISTANT_MESSAGE_KWARG = 'message'
+
+_active_streams = {}  # stream id -> threading.Event set to cancel
+_streams_lock = threading.Lock()
+
+def _block_value(memory, label):
+    block = memory.memory.get(label)
+    return block.value if block else None
+
+def _fetch_json(client, path):
+    response = requests.get(f"{client.base_url}/v1/{path}", headers=client.headers)
+    if response.status_code != 200:
+        raise ValueError(f"Server returned {response.status_code} for /v1/{path}")
+    return response.json()
+
+def _fetch_agent(client, agent_id):
+    agent = get_agent(client, agent_id)
+    return {
+        'id': agent.id,
+        'name': agent.name,
+        'model': agent.llm_config.model,
+        'embedding_model': agent.embedding_config.embedding_model,
+    }
+
+def _fetch_memory(client, agent_id):
+    memory = client.get_in_context_memory(agent_id=agent_id)
+    return {
+        'core_memory': memory.compile(),
+        'agent_persona': _block_value(memory, 'persona'),
+        'human_persona': _block_value(memory, 'human'),
+    }
+
+def _fetch_tools(client, agent_id):
+    tools = cache.get(('agent_tools', agent_id), lambda: _fetch_json(client, f"agents/{agent_id}/tools"))
+    return {'tools': [{'id': tool.get('id'), 'name': tool.get('name')} for tool in tools]}
+
+def _fetch_sources(client, agent_id):
+    sources = cache.get(('agent_sources', agent_id), lambda: _fetch_json(client, f"agents/{agent_id}/sources"))
+    return {'sources': [{'id': source.get('id'), 'name': source.get('name')} for source in sources]}
+
+# Sub-requests behind the chat page. Required parts fail the whole load;
+# optional parts come back as None with the error reported.
+CONFIG_PARTS = {
+    'agent': (_fetch_agent, True),
+    'memory': (_fetch_memory, True),
+    'tools': (_fetch_tools, False),
+    'sources': (_fetch_sources, False),
+}
+OPTIONAL_DEFAULTS = {'tools': {'tools': None}, 'sources': {'sources': None}}
+
+def _load_agent_config(client, agent_id):
+    """
+    Fetch every part of the chat page at once and merge them.
+
+    Returns:
+        {'id', 'name', 'model', 'embedding_model',
+         'core_memory', 'agent_persona', 'human_persona',
+         'tools': [{'id', 'name'}] or None, 'sources': [{'id', 'name'}] or None,
+         'timings': {part: ms, ..., 'total': ms}, 'errors': {part: message}}
+    """
+    started = time.monotonic()
+    timings, errors, config = {}, {}, {}
+
+    def timed(name, fetch):
+        part_started = time.monotonic()
+        try:
+            return fetch(client, agent_id)
+        finally:
+            timings[name] = round((time.monotonic() - part_started) * 1000, 1)
+
+    # Wall time is the slowest sub-request instead of their sum
+    with ThreadPoolExecutor(max_workers=len(CONFIG_PARTS)) as pool:
+        futures = {
+            name: pool.submit(timed, name, fetch)
+            for name, (fetch, _required) in CONFIG_PARTS.items()
+        }
+
+    for name, future in futures.items():
+        try:
+            config.update(future.result())
+        except Exception as e:
+            if CONFIG_PARTS[name][1]:
+                raise
+            logger.warning(f"Could not load {name} for {agent_id}: {str(e)}")
+            errors[name] = str(e)
+            config.update(OPTIONAL_DEFAULTS[name])
+
+    timings['total'] = round((time.monotonic() - started) * 1000, 1)
+    config['timings'] = timings
+    config['errors'] = errors
+    logger.debug(f"Loaded config for {agent_id}: {timings}")
+    return config
+
+def message_to_entries(message):
+    """
+    Convert a Message into the entries the chat area renders.
+
+    Entries use the same types as stream events (thought, assistant,
+    tool_call, tool_return) plus user and system, so history and live
+    replies are drawn by the same code. The message is decoded through
+    the memoized message model, so paging through history again doesn't
+    re-parse any JSON.
+    """
+    record = parse_message(message)
+    base = {'message_id': record.id, 'created_at': record.created_at.isoformat() if record.created_at else None}
+
+    if record.role is Role.USER:
+        kind = 'user' if record.user_type in (None, 'user_message') else 'system'
+        return [{**base, 'type': kind, 'id': record.id, 'text': record.user_text or record.text}]
+    if record.role is Role.SYSTEM:
+        text = record.text
+        if len(text) > SYSTEM_PREVIEW_CHARS:
+            text = f"{text[:SYSTEM_PREVIEW_CHARS]}..."
+        return [{**base, 'type': 'system', 'id': record.id, 'text': text}]
+    if record.role is Role.TOOL:
+        # send_message returns None; its text is already shown as the reply
+        if record.name == ASSISTANT_MESSAGE_TOOL:
+            return []
+        return [{
+            **base,
+            'type': 'tool_return',
+            'id': record.tool_call_id or record.id,
+            'status': 'error' if record.tool_failed else 'success',
+            'text': record.tool_message or record.text,
+        }]
+
+    entries = []
+    if record.text:
+        entries.append({**base, 'type': 'thought', 'id': record.id, 'text': record.text})
+    for call in record.tool_calls:
+        if call.name == ASSISTANT_MESSAGE_TOOL:
+            text = call.args.get(ASSISTANT_MESSAGE_KWARG) or ''
+            entries.append({**base, 'type': 'assistant', 'id': call.id, 'text': text})
+        else:
+            entries.append({**base, 'type': 'tool_call', 'id': call.id, 'name': call.name, 'arguments': call.arguments})
+    return entries
+
+def _load_history_page(client, agent_id, before, limit):
+    messages, older = get_message_page(client, agent_id, before=before, limit=limit)
+    return {
+        'entries': [entry for message in messages for entry in message_to_entries(message)],
+        'before': before,
+        'older': older,
+        'count': len(messages),
+    }
+
+def get_agent_config(client, agent_id):
+    """Return the chat page payload for an agent (served from cache when prefetched)"""
+    try:
+        config = cache.get(('agent_config', agent_id), lambda: _load_agent_config(client, agent_id))
+        if config['errors']:
+            # Don't keep serving a partial payload, retry on the next load
+            cache.invalidate(('agent_config', agent_id))
+        return config
+    except Exception as e:
+        logger.error(f"Error loading agent config for {agent_id}: {str(e)}")
+        return {'error': str(e)}
+
+def get_message_history(client, agent_id, before=None, limit=HISTORY_PAGE_SIZE):
+    """
+    Return one page of chat history, oldest first.
+
+    'older' is the cursor for the page before this one (None at the start
+    of the conversation). The latest page is served from the cache when
+    the agent was prefetched.
+    """
+    try:
+        limit = min(max(int(limit or HISTORY_PAGE_SIZE), 1), MAX_HISTORY_PAGE_SIZE)
+        if before is None and limit == HISTORY_PAGE_SIZE:
+            return cache.get(
+                ('recent_messages', agent_id),
+                lambda: _load_history_page(client, agent_id, None, limit)
+            )
+        return _load_history_page(client, agent_id, before, limit)
+    except Exception as e:
+        logger.error(f"Error loading message history for {agent_id}: {str(e)}")
+        return {'error': str(e)}
+
+def prefetch_agent(client, agent_id):
+    """Warm the cache with everything the chat page needs; returns the config"""
+    started = time.monotonic()
+    config = get_agent_config(client, agent_id)
+    get_message_history(client, agent_id)
+    logger.debug(f"Prefetched {agent_id} in {time.monotonic() - started:.2f}s")
+    return config
+
+def _partial_json_string(arguments, key):
+    """Decode as much of arguments[key] as has arrived from a partial JSON object"""
+    start = arguments.find(f'"{key}"')
+    if start == -1:
+        return ''
+    colon = arguments.find(':', start + len(key) + 2)
+    quote = arguments.find('"', colon + 1) if colon != -1 else -1
+    if quote == -1:
+        return ''
+
+    decoded, i = [], quote + 1
+    while i < len(arguments):
+        char = arguments[i]
+        if char == '"':
+            break
+        if char != '\\':
+            decoded.append(char)
+            i += 1
+            continue
+        # Escape sequence: stop at the end of the chunk if it's incomplete
+        width = 6 if arguments[i + 1:i + 2] == 'u' else 2
+        escape = arguments[i:i + width]
+        if len(escape) < width:
+            break
+        try:
+            decoded.append(json.loads(f'"{escape}"'))
+        except ValueError:
+            decoded.append(escape)
+        i += width
+    return ''.join(decoded)
+
+class _StreamAssembler:
+    """Turn Letta streaming chunks into UI events keyed by message id"""
+
+    def __init__(self):
+        self.calls = {}   # function call id -> {'name', 'arguments', 'sent'}
+        self.call_ids = {}  # message id -> function call id it is streaming
+
+    def events(self, chunk):
+        message_type = getattr(chunk, 'message_type', None)
+        if message_type == 'internal_monologue':
+            return [{'type': 'thought', 'id': chunk.id, 'text': chunk.internal_monologue}]
+        if message_type == 'function_call':
+            return self._function_call_events(chunk)
+        if message_type == 'function_return':
+            return [{
+                'type': 'tool_return',
+                'id': chunk.function_call_id,
+                'status': chunk.status,
+                'text': chunk.function_return,
+            }]
+        if hasattr(chunk, 'total_tokens'):
+            return [{
+                'type': 'usage',
+                'completion_tokens': chunk.completion_tokens,
+                'prompt_tokens': chunk.prompt_tokens,
+                'step_count': chunk.step_count,
+            }]
+        # MessageStreamStatus: [DONE_GEN], [DONE_STEP], [DONE]
+        return [{'type': 'status', 'status': str(getattr(chunk, 'value', chunk))}]
+
+    def _function_call_events(self, chunk):
+        delta = chunk.function_call
+        # Token streaming sends the call in pieces; only the first carries the id
+        call_id = delta.function_call_id or self.call_ids.get(chunk.id) or chunk.id
+        self.call_ids[chunk.id] = call_id
+        call = self.calls.setdefault(call_id, {'name': '', 'arguments': '', 'sent': ''})
+        call['name'] += delta.name or ''
+        call['arguments'] += delta.arguments or ''
+
+        if call['name'] == ASSISTANT_MESSAGE_TOOL:
+            text = _partial_json_string(call['arguments'], ASSISTANT_MESSAGE_KWARG)
+            new_text, call['sent'] = text[len(call['sent']):], text
+            if not new_text:
+                return []
+            return [{'type': 'assistant', 'id': call_id, 'text': new_text}]
+        return [{
+            'type': 'tool_call',
+            'id': call_id,
+            'name': delta.name or '',
+            'arguments': delta.arguments or '',
+        }]
+
+class _EventBatcher:
+    """Coalesce events into at most one emit() per flush interval"""
+
+    def __init__(self, emit, interval=STREAM_FLUSH_INTERVAL):
+        self.emit = emit
+        self.interval = interval
+        self.pending = []
+        self.last_flush = 0.0
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def add(self, events):
+        with self.lock:
+            self.pending.extend(events)
+            wait = self.last_flush + self.interval - time.monotonic()
+            if wait <= 0:
+                self._flush()
+            elif self.timer is None:
+                # Tokens buffered now still go out even if the server pauses
+                self.timer = threading.Timer(wait, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.pending:
+            events, self.pending = self.pending, []
+            self.last_flush = time.monotonic()
+            self.emit(events)
+
+def stream_message(client, agent_id, message, emit, cancel=None):
+    """
+    Send a user message and call emit(events) with UI events as the reply streams in.
+
+    Events are dicts with a 'type' of thought, assistant, tool_call,
+    tool_return, usage, status or error. Deltas for the same message share
+    an 'id' and are meant to be appended to each other.
+    """
+    started = time.monotonic()
+    first_event_at = None
+    assembler = _StreamAssembler()
+    batcher = _EventBatcher(emit)
+
+    try:
+        chunks = client.send_message(
+            agent_id=agent_id,
+            message=message,
+            role='user',
+            stream_steps=True,
+            stream_tokens=True,
+        )
+        for chunk in chunks:
+            if cancel is not None and cancel.is_set():
+                # Closing the generator drops the HTTP stream
+                chunks.close()
+                batcher.add([{'type': 'status', 'status': 'cancelled'}])
+                break
+            events = assembler.events(chunk)
+            if not events:
+                continue
+            if first_event_at is None:
+                first_event_at = time.monotonic()
+                logger.debug(f"First stream event for {agent_id} after {first_event_at - started:.2f}s")
+            batcher.add(events)
+    except Exception as e:
+        logger.error(f"Error streaming message to {agent_id}: {str(e)}")
+        batcher.add([{'type': 'error', 'error': str(e)}])
+    finally:
+        # Memory, history and the table counters may all have changed
+        cache.invalidate(('agent_config', agent_id), ('recent_messages', agent_id))
+        invalidate_agent_stats([agent_id])
+
+    batcher.add([{'type': 'status', 'status': 'closed'}])
+    batcher.flush()
+    logger.info(f"Streamed reply from {agent_id} in {time.monotonic() - started:.2f}s")
+
+def js_emitter(window, stream_id, callback='window.chatStream.receive'):
+    """Return an emit() that pushes events into the page through evaluate_js"""
+    def emit(events):
+        window.evaluate_js(f"{callback}({json.dumps(stream_id)}, {json.dumps(events)})")
+    return emit
+
+def start_chat_stream(client, window, agent_id, message):
+    """Start streaming a reply in the background; events arrive via window.chatStream"""
+    try:
+        if not (message or '').strip():
+            raise ValueError("Message is empty")
+        stream_id = uuid.uuid4().hex
+        cancel = threading.Event()
+        with _streams_lock:
+            _active_streams[stream_id] = cancel
+
+        def run():
+            try:
+                stream_message(client, agent_id, message, js_emitter(window, stream_id), cancel)
+            finally:
+                with _streams_lock:
+                    _active_streams.pop(stream_id, None)
+
+        threading.Thread(target=run, name=f'chat-stream-{stream_id[:8]}', daemon=True).start()
+        return {'stream_id': stream_id}
+    except Exception as e:
+        logger.error(f"Error starting chat stream for {agent_id}: {str(e)}")
+        return {'error': str(e)}
+
+def cancel_chat_stream(stream_id):
+    """Stop a running stream after the chunk currently being read"""
+    with _streams_lock:
+        cancel = _active_streams.get(stream_id)
+    if cancel is None:
+        return {'cancelled': False}
+    cancel.set()
+    return {'cancelled': True}
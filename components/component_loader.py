@@ -0,0 +1,88 @@
+def get_component_loader_js():
+    return """
+    // Rarely used components (the create-agent modal, the chat page) are not
+    // part of the initial page. The first time one is needed its markup,
+    // styles and script are fetched over the bridge (see get_lazy_component
+    // in components/asset_bundle.py), injected once and remembered.
+    const COMPONENT_READY_CHECKS = {
+        createAgentModal: () => !!window.createAgentModal,
+        chatConfig: () => typeof loadChatConfig === 'function' && !!window.components?.chatConfig
+    };
+
+    class ComponentLoader {
+        constructor() {
+            this.loading = new Map();   // component name -> promise
+        }
+
+        isLoaded(name) {
+            const check = COMPONENT_READY_CHECKS[name];
+            return !!check && check();
+        }
+
+        load(name) {
+            // Already on the page when the window was built without lazy loading
+            if (this.isLoaded(name)) {
+                return Promise.resolve();
+            }
+            if (!this.loading.has(name)) {
+                const promise = this.fetchComponent(name).catch(error => {
+                    // Let the next attempt retry instead of caching the failure
+                    this.loading.delete(name);
+                    throw error;
+                });
+                this.loading.set(name, promise);
+            }
+            return this.loading.get(name);
+        }
+
+        async fetchComponent(name) {
+            console.log('Lazy loading component:', name);
+            const started = performance.now();
+            const component = await window.pywebview.api.get_lazy_component(name);
+            if (component.error) {
+                throw new Error(component.error);
+            }
+
+            if (component.styles) {
+                const style = document.createElement('style');
+                style.dataset.component = name;
+                style.textContent = component.styles;
+                document.head.appendChild(style);
+            }
+
+            if (component.mount === 'body') {
+                const container = document.createElement('div');
+                container.innerHTML = component.html;
+                document.body.append(...container.childNodes);
+            } else {
+                // Page templates are rendered by the page manager
+                window.components = window.components || {};
+                window.components[name] = component.html;
+            }
+
+            if (component.script) {
+                const script = document.createElement('script');
+                script.dataset.component = name;
+                script.textContent = component.script;
+                document.body.appendChild(script);
+            }
+            console.log(`Loaded component ${name} in ${Math.round(performance.now() - started)}ms`);
+        }
+    }
+
+    window.componentLoader = new ComponentLoader();
+
+    // The modal script isn't on the page until the first click, so that click
+    // has to load it and open it; later clicks are handled by the modal itself
+    document.addEventListener('click', async (event) => {
+        if (!event.target.closest('.create-agent-btn') || window.componentLoader.isLoaded('createAgentModal')) {
+            return;
+        }
+        try {
+            await window.componentLoader.load('createAgentModal');
+            window.createAgentModal.showModal();
+        } catch (error) {
+            console.error('Error loading create agent modal:', error);
+        }
+    });
+    """
@@ -23,8 +23,10 @@ def get_create_agent_modal_js():
     class CreateAgentModal {
         constructor() {
             console.log('=== CreateAgentModal Constructor Start ===');
+            this.catalog = null;
             this.initializeElements();
             this.attachEventListeners();
+            this.loadModelCatalog();
             console.log('=== CreateAgentModal Constructor End ===');
         }
 
@@ -103,6 +105,34 @@ def get_create_agent_modal_js():
             }
         }
 
+        async loadModelCatalog() {
+            // The hardcoded options stay usable until the server's catalog arrives
+            try {
+                const catalog = await window.pywebview.api.get_model_catalog();
+                if (catalog.error) {
+                    throw new Error(catalog.error);
+                }
+                this.catalog = catalog;
+                this.fillSelect(this.form.model, catalog.models, 'model');
+                this.fillSelect(this.form.embedding, catalog.embeddings, 'embedding_model');
+                console.log(`Model catalog: ${catalog.models.length} models, ${catalog.embeddings.length} embeddings`);
+            } catch (error) {
+                console.warn('Using built-in model list:', error);
+            }
+        }
+
+        fillSelect(select, configs, key) {
+            if (!select || !configs?.length) {
+                return;
+            }
+            const selected = select.value;
+            select.replaceChildren(new Option('Select a model', ''));
+            for (const config of configs) {
+                select.add(new Option(config[key], config[key]));
+            }
+            select.value = configs.some(config => config[key] === selected) ? selected : '';
+        }
+
         showModal() {
             console.log('=== Showing Modal ===');
             console.log('Modal element exists:', !!this.modal);
@@ -128,11 +158,11 @@ def get_create_agent_modal_js():
 
         resetForm() {
             console.log('Resetting form fields');
-            this.nameInput.value = '';
-            this.modelSelect.selectedIndex = 0;
-            this.embedSelect.selectedIndex = 0;
-            this.agentPersona.value = '';
-            this.humanPersona.value = '';
+            this.form.name.value = '';
+            this.form.model.selectedIndex = 0;
+            this.form.embedding.selectedIndex = 0;
+            this.form.agentPersona.value = '';
+            this.form.humanPersona.value = '';
         }
 
         validateForm() {
@@ -177,6 +207,8 @@ def get_create_agent_modal_js():
                 name: this.form.name.value.trim(),
                 model: this.form.model.value,
                 embedding: this.form.embedding.value,
+                llm_config: this.getLLMConfig(),
+                embedding_config: this.getEmbeddingConfig(),
                 agentPersona: this.form.agentPersona.value.trim(),
                 humanPersona: this.form.humanPersona.value.trim()
             };
@@ -208,7 +240,11 @@ def get_create_agent_modal_js():
         }
 
         getLLMConfig() {
-            const model = this.modelSelect.value;
+            const model = this.form.model.value;
+            const config = this.catalog?.models.find(entry => entry.model === model);
+            if (config) {
+                return config;
+            }
             switch (model) {
                 case 'gpt-4':
                     return {
@@ -235,7 +271,12 @@ def get_create_agent_modal_js():
         }
 
         getEmbeddingConfig() {
-            return this.embedSelect.value === 'openai' 
+            const embedding = this.form.embedding.value;
+            const config = this.catalog?.embeddings.find(entry => entry.embedding_model === embedding);
+            if (config) {
+                return config;
+            }
+            return embedding === 'openai' 
                 ? {
                     embedding_endpoint_type: 'openai',
                     embedding_endpoint: 'https://api.openai.com/v1',
@@ -259,11 +300,11 @@ def get_create_agent_modal_js():
         console.log('Document loading - waiting for DOMContentLoaded');
         document.addEventListener('DOMContentLoaded', () => {
             console.log('DOMContentLoaded fired - initializing modal');
-            new CreateAgentModal();
+            window.createAgentModal = new CreateAgentModal();
         });
     } else {
         console.log('Document ready - initializing modal immediately');
-        new CreateAgentModal();
+        window.createAgentModal = new CreateAgentModal();
     }
     console.log('=== Create Agent Modal Script End ===');
     """ 
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Backend logic for the create-agent modal (components/create_agent).
+
+get_model_catalog() backs the get_model_catalog bridge call the modal makes
+when it opens: the LLM and embedding configs the server offers, served
+from the shared model catalog (LettaSDKDemos/model_catalog.py), so the
+dropdowns list what the server can actually run instead of a fixed set.
+warm_model_catalog() can be called at startup to load both catalogs in
+the background before the modal is first opened.
+
+Confirmed functionality against LettaSDKDemos:
+- Model listing from create_agent.py / model_catalog.py
+- Embedding listing from manage_embedding_models.py
+"""
+
+import threading
+
+from components.logger import setup_logger
+from LettaSDKDemos.model_catalog import get_embedding_models, get_llm_models
+
+logger = setup_logger(__name__)
+
+def get_model_catalog(client):
+    """Return {'models': [llm configs], 'embeddings': [embedding configs]}"""
+    try:
+        return {
+            'models': get_llm_models(client.base_url),
+            'embeddings': get_embedding_models(client.base_url),
+        }
+    except Exception as e:
+        logger.error(f"Error loading model catalog: {str(e)}")
+        return {'error': str(e)}
+
+def warm_model_catalog(client):
+    """Load both catalogs on a background thread"""
+    thread = threading.Thread(target=get_model_catalog, args=(client,), daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,117 @@
+def get_job_status_html():
+    return """
+    <div id="job-status" class="job-status" hidden>
+        <div class="job-status-title">Processing files</div>
+        <ul class="job-status-list"></ul>
+    </div>
+    """
+
+def get_job_status_styles():
+    return """
+    .job-status {
+        position: fixed;
+        right: 20px;
+        bottom: 20px;
+        width: 320px;
+        background-color: #161b22;
+        border: 1px solid #30363d;
+        border-radius: 6px;
+        padding: 12px;
+        color: #c9d1d9;
+        font-size: 13px;
+        z-index: 900;
+    }
+
+    .job-status-title {
+        font-weight: 600;
+        margin-bottom: 8px;
+    }
+
+    .job-status-list {
+        list-style: none;
+        margin: 0;
+        padding: 0;
+    }
+
+    .job-status-item {
+        padding: 4px 0;
+        border-top: 1px solid #21262d;
+    }
+
+    .job-status-item .job-status-stages {
+        color: #8b949e;
+        font-size: 12px;
+    }
+
+    .job-status-item.completed .job-status-state {
+        color: #3fb950;
+    }
+
+    .job-status-item.failed .job-status-state,
+    .job-status-item.error .job-status-state {
+        color: #f85149;
+    }
+    """
+
+def get_job_status_js():
+    return """
+    // Ingestion jobs followed by the Python-side JobTracker (see
+    // components/job_status_logic.py) push their events here. Finished jobs
+    // stay listed for a while, then the panel hides itself again. The panel
+    // markup is only added to the page when the first event arrives.
+    const JOB_STATUS_LINGER_MS = 10000;
+    const JOB_STATUS_HTML = `""" + get_job_status_html() + """`;
+
+    class JobStatusPanel {
+        constructor() {
+            this.items = new Map();   // job id -> <li>
+        }
+
+        get panel() {
+            return document.getElementById('job-status');
+        }
+
+        ensurePanel() {
+            if (!this.panel) {
+                document.body.insertAdjacentHTML('beforeend', JOB_STATUS_HTML);
+            }
+            return this.panel;
+        }
+
+        receive(event) {
+            const panel = this.ensurePanel();
+            let item = this.items.get(event.job_id);
+            if (!item) {
+                item = document.createElement('li');
+                item.innerHTML = '<span class="job-status-label"></span> '
+                    + '<span class="job-status-state"></span>'
+                    + '<div class="job-status-stages"></div>';
+                panel.querySelector('.job-status-list').appendChild(item);
+                this.items.set(event.job_id, item);
+            }
+            item.className = `job-status-item ${event.type}`;
+            item.querySelector('.job-status-label').textContent = event.label;
+            item.querySelector('.job-status-state').textContent = event.error
+                ? `${event.type === 'failed' ? 'failed' : 'retrying'}: ${event.error}`
+                : event.status;
+            item.querySelector('.job-status-stages').textContent = Object.entries(event.stages)
+                .map(([stage, seconds]) => `${stage} ${seconds.toFixed(1)}s`)
+                .join(' · ');
+            panel.hidden = false;
+
+            if (event.type === 'completed' || event.type === 'failed') {
+                setTimeout(() => this.remove(event.job_id), JOB_STATUS_LINGER_MS);
+            }
+        }
+
+        remove(jobId) {
+            this.items.get(jobId)?.remove();
+            this.items.delete(jobId);
+            if (!this.items.size && this.panel) {
+                this.panel.hidden = true;
+            }
+        }
+    }
+
+    window.jobStatus = new JobStatusPanel();
+    """
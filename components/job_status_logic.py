@@ -0,0 +1,60 @@
+"""
+Backend logic for the job status panel (components/job_status.py).
+
+track_jobs() backs the track_jobs bridge call: after files are uploaded
+to a data source, their ingestion jobs are handed to one shared JobTracker
+(LettaSDKDemos/job_tracker.py) per window, and every status change is
+pushed into the page as window.jobStatus.receive(event).
+
+Confirmed functionality against LettaSDKDemos:
+- Job polling and stage timings from job_tracker.py
+- Upload job ids from source_upload.py / manage_data_sources.py
+"""
+
+import json
+import threading
+
+from components.logger import setup_logger
+from LettaSDKDemos.job_tracker import JobTracker
+
+logger = setup_logger(__name__)
+
+_trackers = {}      # id(window) -> JobTracker
+_trackers_lock = threading.Lock()
+
+def _tracker_for(client, window):
+    with _trackers_lock:
+        tracker = _trackers.get(id(window))
+        if tracker is None:
+            def emit(event):
+                window.evaluate_js(f"window.jobStatus.receive({json.dumps(event)})")
+            tracker = JobTracker(client.base_url, on_event=emit, headers=client.headers)
+            _trackers[id(window)] = tracker
+        return tracker
+
+def track_jobs(client, window, jobs):
+    """
+    Follow ingestion jobs in the background.
+
+    jobs is a list of {'id', 'label', 'upload_seconds'} (label and
+    upload_seconds optional); events arrive via window.jobStatus.
+    """
+    try:
+        tracker = _tracker_for(client, window)
+        for job in jobs:
+            tracker.track(job['id'], label=job.get('label'), upload_seconds=job.get('upload_seconds'))
+        logger.debug(f"Tracking {len(jobs)} job(s)")
+        return {'tracking': [job['id'] for job in jobs]}
+    except Exception as e:
+        logger.error(f"Error tracking jobs: {str(e)}")
+        return {'error': str(e)}
+
+def get_job_summary(client, window, job_id):
+    """Current status and stage timings of a tracked job"""
+    try:
+        return _tracker_for(client, window).summary(job_id)
+    except KeyError:
+        return {'error': f"Job {job_id} is not being tracked"}
+    except Exception as e:
+        logger.error(f"Error reading job {job_id}: {str(e)}")
+        return {'error': str(e)}
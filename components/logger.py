@@ -0,0 +1,31 @@
+import logging
+from logging.handlers import RotatingFileHandler
+
+def setup_logger(name, log_file='app.log'):
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        # Already configured (module imported more than once)
+        return logger
+    logger.setLevel(logging.DEBUG)
+
+    # File handler with rotation
+    file_handler = RotatingFileHandler(
+        log_file, maxBytes=1024*1024, backupCount=5
+    )
+    file_handler.setLevel(logging.DEBUG)
+
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+
+    # Formatting
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+
+    return logger
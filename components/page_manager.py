@@ -1,39 +1,179 @@
 def get_page_manager_js():
     return """
+    // Pages are kept as detached DOM subtrees instead of being rebuilt from
+    // HTML strings on every navigation. Switching pages swaps the cached
+    // subtree back into .main-content and restores its scroll positions, so
+    // back/forward is instant. Chat pages are capped with an LRU.
+    const MAX_CACHED_CHAT_PAGES = 5;
+    const PRESERVED_SCROLL_SELECTORS = ['#agents-scroll', '.config-sidebar', '.chat-area'];
+
     class PageManager {
         constructor() {
             this.currentPage = 'agents';
             this.currentAgentId = null;
+            this.activeKey = null;
+            this.pageCache = new Map();   // page key -> {element, scroll, failed}, oldest first
+
+            window.addEventListener('popstate', (event) => {
+                const state = event.state || { page: 'agents' };
+                console.log('History navigation to:', state);
+                this.currentPage = state.page;
+                this.currentAgentId = state.agentId || null;
+                this.renderCurrentPage();
+            });
         }
-        
+
         async navigateToChat(agentId) {
             this.currentPage = 'chat';
             this.currentAgentId = agentId;
+            history.pushState({ page: 'chat', agentId }, '');
             await this.renderCurrentPage();
         }
-        
+
         async navigateToAgents() {
             this.currentPage = 'agents';
             this.currentAgentId = null;
+            history.pushState({ page: 'agents' }, '');
             await this.renderCurrentPage();
         }
-        
-        async renderCurrentPage() {
-            const mainContent = document.querySelector('.main-content');
-            
+
+        pageKey(page, agentId) {
+            return page === 'chat' ? `chat:${agentId}` : page;
+        }
+
+        saveScroll(element) {
+            const scroll = { page: element.parentElement?.scrollTop || 0 };
+            PRESERVED_SCROLL_SELECTORS.forEach(selector => {
+                const target = element.querySelector(selector);
+                if (target) {
+                    scroll[selector] = target.scrollTop;
+                }
+            });
+            return scroll;
+        }
+
+        restoreScroll(element, scroll) {
+            element.parentElement.scrollTop = scroll.page;
+            PRESERVED_SCROLL_SELECTORS.forEach(selector => {
+                const target = element.querySelector(selector);
+                if (target && scroll[selector] !== undefined) {
+                    target.scrollTop = scroll[selector];
+                }
+            });
+        }
+
+        // Detach whatever is showing and remember it, wrapping content that
+        // was rendered outside the page manager (the initial agents page)
+        detachCurrentPage(mainContent) {
+            const entry = this.activeKey && this.pageCache.get(this.activeKey);
+            if (entry?.failed) {
+                // Never cached with placeholders: it is rebuilt on the next visit
+                entry.element.remove();
+                this.pageCache.delete(this.activeKey);
+                this.activeKey = null;
+                return;
+            }
+            let element = entry?.element;
+            if (!element || element.parentElement !== mainContent) {
+                if (!mainContent.firstChild) {
+                    return;
+                }
+                element = document.createElement('div');
+                element.className = 'page';
+                element.append(...mainContent.childNodes);
+                mainContent.appendChild(element);
+                this.activeKey = this.activeKey || 'agents';
+            }
+
+            const scroll = this.saveScroll(element);
+            element.remove();
+            this.pageCache.set(this.activeKey, { element, scroll });
+            this.activeKey = null;
+        }
+
+        touchPage(key) {
+            const entry = this.pageCache.get(key);
+            this.pageCache.delete(key);
+            this.pageCache.set(key, entry);
+            return entry;
+        }
+
+        evictChatPages() {
+            const chatKeys = [...this.pageCache.keys()].filter(
+                key => key.startsWith('chat:') && key !== this.activeKey
+            );
+            while (chatKeys.length > MAX_CACHED_CHAT_PAGES - 1) {
+                const key = chatKeys.shift();
+                console.log('Evicting cached page:', key);
+                this.pageCache.delete(key);
+            }
+        }
+
+        buildPage() {
+            const element = document.createElement('div');
+            element.className = 'page';
             if (this.currentPage === 'agents') {
-                mainContent.innerHTML = `
+                element.innerHTML = `
                     ${window.components.header}
                     ${window.components.search}
                     ${window.components.agentsTable}
                 `;
-                await loadAgents();
             } else if (this.currentPage === 'chat') {
-                mainContent.innerHTML = window.components.chatConfig;
-                await loadChatConfig(this.currentAgentId);
+                element.innerHTML = window.components.chatConfig;
+            }
+            return element;
+        }
+
+        async renderCurrentPage() {
+            const mainContent = document.querySelector('.main-content');
+            const key = this.pageKey(this.currentPage, this.currentAgentId);
+            if (key === this.activeKey) {
+                return;
+            }
+
+            if (this.currentPage === 'chat') {
+                // Lazy loaded on first use (see component_loader.py); the
+                // current page stays up while the chat page script arrives
+                await window.componentLoader?.load('chatConfig');
+                if (this.pageKey(this.currentPage, this.currentAgentId) !== key) {
+                    return;
+                }
+            }
+
+            this.detachCurrentPage(mainContent);
+            this.activeKey = key;
+
+            if (this.pageCache.has(key)) {
+                console.log('Restoring cached page:', key);
+                const { element, scroll } = this.touchPage(key);
+                mainContent.appendChild(element);
+                this.restoreScroll(element, scroll);
+                if (this.currentPage === 'agents') {
+                    // Patches only the rows that changed since we left
+                    await loadAgents();
+                }
+                return;
+            }
+
+            console.log('Rendering new page:', key);
+            const element = this.buildPage();
+            mainContent.appendChild(element);
+            this.pageCache.set(key, { element, scroll: null });
+            this.evictChatPages();
+
+            if (this.currentPage === 'agents') {
+                await loadAgents();
+            } else if (this.currentPage === 'chat' && !await loadChatConfig(this.currentAgentId, element)) {
+                // Drop the half-loaded page now, or when it is left if it is still showing
+                if (this.activeKey === key) {
+                    this.pageCache.get(key).failed = true;
+                } else if (this.pageCache.get(key)?.element === element) {
+                    this.pageCache.delete(key);
+                }
             }
         }
     }
-    
+
     window.pageManager = new PageManager();
-    """ 
\ No newline at end of file
+    history.replaceState({ page: 'agents' }, '');
+    """
@@ -1,8 +1,9 @@
 def get_search_html():
     return """
     <input type="text" 
+           id="agent-search"
            class="search-box" 
-           placeholder="Search"
+           placeholder="Search (name, description, id, tag:...)"
            aria-label="Search agents">
     """
 
@@ -22,4 +23,43 @@ def get_search_styles():
     .search-box::placeholder {
         color: #8b949e;
     }
-    """ 
\ No newline at end of file
+    """ 
+
+def get_search_js():
+    return """
+    // Search-as-you-type: every keystroke filters the agents table through the
+    // Python-side search index (see components/search_logic.py). Keystrokes that
+    // arrive while a search is in flight are coalesced into one follow-up search.
+    const agentSearchState = {
+        inFlight: false,
+        pendingQuery: null
+    };
+
+    async function runAgentSearch(query) {
+        if (agentSearchState.inFlight) {
+            agentSearchState.pendingQuery = query;
+            return;
+        }
+        agentSearchState.inFlight = true;
+        try {
+            await setAgentsQuery(query);
+        } catch (error) {
+            console.error('Error searching agents:', error);
+        } finally {
+            agentSearchState.inFlight = false;
+        }
+
+        if (agentSearchState.pendingQuery !== null) {
+            const next = agentSearchState.pendingQuery;
+            agentSearchState.pendingQuery = null;
+            runAgentSearch(next);
+        }
+    }
+
+    // Delegated so it survives the page manager re-rendering the search box
+    document.addEventListener('input', (event) => {
+        if (event.target.matches('#agent-search')) {
+            runAgentSearch(event.target.value);
+        }
+    });
+    """
@@ -0,0 +1,163 @@
+"""
+Search index behind the agents search box (components/search.py).
+
+AgentSearchIndex keeps trigram postings over agent names, descriptions
+and ids, so a keystroke only has to intersect a few small sets instead of
+scanning every agent. Every term matches as a substring, whatever its
+length; 1-2 character terms have no trigram and scan the indexed text. The
+index is synced incrementally from the agents table listing: only rows
+that were added, removed or changed are re-indexed.
+
+Terms of the form field:value for the fields in SERVER_FIELDS are answered
+by the server instead, and name:, description: and id: only match in that
+field; other tokens with a colon are searched as typed.
+"""
+
+from contextlib import nullcontext
+import time
+
+from components.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+INDEXED_FIELDS = ('name', 'description', 'id')
+
+# field:value terms that are resolved with a server-side query
+SERVER_FIELDS = {
+    'tag': lambda client, value: {agent.id for agent in client.list_agents(tags=[value])},
+}
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _document_trigrams(document):
+    # Per field, so no trigram spans two fields
+    return set().union(*(_trigrams(value) for value in document))
+
+class AgentSearchIndex:
+    def __init__(self, fields=INDEXED_FIELDS):
+        self.fields = fields
+        self.trigrams = {}    # trigram -> set of agent ids
+        self.documents = {}   # agent id -> lowercased text of each field, in self.fields order
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _document(self, row):
+        return tuple(str(row.get(field) or '').lower() for field in self.fields)
+
+    def _add(self, agent_id, document):
+        self.documents[agent_id] = document
+        for gram in _document_trigrams(document):
+            self.trigrams.setdefault(gram, set()).add(agent_id)
+
+    def _remove(self, agent_id):
+        document = self.documents.pop(agent_id)
+        for gram in _document_trigrams(document):
+            postings = self.trigrams[gram]
+            postings.discard(agent_id)
+            if not postings:
+                del self.trigrams[gram]
+
+    def sync(self, rows):
+        """Bring the index in line with rows, re-indexing only what changed"""
+        started = time.monotonic()
+        current = {row['id']: self._document(row) for row in rows}
+
+        removed = [agent_id for agent_id in self.documents if agent_id not in current]
+        changed = [
+            agent_id for agent_id, document in current.items()
+            if self.documents.get(agent_id) != document
+        ]
+        for agent_id in removed:
+            self._remove(agent_id)
+        for agent_id in changed:
+            if agent_id in self.documents:
+                self._remove(agent_id)
+            self._add(agent_id, current[agent_id])
+
+        if removed or changed:
+            logger.debug(
+                f"Search index synced in {time.monotonic() - started:.3f}s "
+                f"({len(changed)} added/changed, {len(removed)} removed)"
+            )
+
+    def _match_term(self, term):
+        field, text = term
+        if len(text) < 3:
+            # No trigram to look up: scan the indexed text
+            return {agent_id for agent_id in self.documents if self._contains(agent_id, term)}
+
+        candidates = None
+        for gram in sorted(_trigrams(text), key=lambda g: len(self.trigrams.get(g, ()))):
+            postings = self.trigrams.get(gram)
+            if not postings:
+                return set()
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return candidates
+        # Trigram hits can be false positives or in another field, confirm the actual substring
+        return {agent_id for agent_id in candidates if self._contains(agent_id, term)}
+
+    def _estimate(self, term):
+        """Upper bound on how many agents a term can match"""
+        text = term[1]
+        if len(text) < 3:
+            return len(self.documents)
+        return min(len(self.trigrams.get(gram, ())) for gram in _trigrams(text))
+
+    def _contains(self, agent_id, term):
+        field, text = term
+        document = self.documents[agent_id]
+        if field in self.fields:
+            return text in document[self.fields.index(field)]
+        return any(text in value for value in document)
+
+    def search(self, terms):
+        """
+        Return the ids of agents matching every term.
+
+        A term is (field, text): text must be a substring of that field, or
+        of any indexed field when field is None.
+        """
+        if not terms:
+            return set(self.documents)
+
+        # Resolve the most selective term through the postings, then only
+        # check the surviving candidates against the remaining terms
+        terms = sorted(terms, key=self._estimate)
+        matches = self._match_term(terms[0])
+        for term in terms[1:]:
+            if not matches:
+                break
+            matches = {agent_id for agent_id in matches if self._contains(agent_id, term)}
+        return matches
+
+def parse_query(query):
+    """Split a query into (field or None, text) index terms and (field, value) server terms"""
+    terms, server_terms = [], []
+    for token in (query or '').lower().split():
+        field, sep, value = token.partition(':')
+        if sep and value and field in SERVER_FIELDS:
+            server_terms.append((field, value))
+        elif sep and value and field in INDEXED_FIELDS:
+            terms.append((field, value))
+        else:
+            # Not a known field (e.g. "10:30" or a URL): search for the text as typed
+            terms.append((None, token))
+    return terms, server_terms
+
+def search_agents(client, index, query, lock=None):
+    """
+    Return the set of agent ids matching query.
+
+    lock, if given, guards the index; it is held for the index lookup
+    only, not for the server requests of field:value terms.
+    """
+    terms, server_terms = parse_query(query)
+    with lock or nullcontext():
+        matches = index.search(terms)
+    for field, value in server_terms:
+        logger.debug(f"Falling back to server query for {field}:{value}")
+        matches &= SERVER_FIELDS[field](client, value)
+    return matches